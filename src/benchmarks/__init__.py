@@ -0,0 +1 @@
+"""Microbenchmarks for the solvers, the bandit operations and the simulator loop."""
@@ -0,0 +1,56 @@
+"""
+Command line entry point of the benchmark suite.
+
+Run it from the `src` directory:
+
+    python -m benchmarks --arms 10 1000 100000 --output results.json
+    python -m benchmarks --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import find_regressions, get_metadata, run_suite
+
+
+def main() -> int:
+    """Runs the suite, stores the results and compares them with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arms", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="numbers of arms (K) to benchmark")
+    parser.add_argument("--number", type=int, default=200,
+                        help="calls of each operation per repeat")
+    parser.add_argument("--iterations", type=int, default=1000,
+                        help="steps (T) of the simulator benchmarks")
+    parser.add_argument("--output", help="JSON file where the results are stored")
+    parser.add_argument("--baseline", help="JSON file with the results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown tolerated before failing")
+    args = parser.parse_args()
+
+    results = {name: result.to_dict()
+               for name, result in run_suite(args.arms, args.number, args.iterations).items()}
+    for name, measures in results.items():
+        print(f"{name:<55} {measures['seconds_per_op'] * 1e6:>12.2f} us/op "
+              f"{measures['ops_per_second']:>14.0f} op/s "
+              f"{measures['peak_bytes'] / 1024:>10.1f} KiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"metadata": get_metadata(), "results": results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than the baseline")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Module defining the benchmark suite.
+
+Every benchmark is timed with `timeit`, keeping the best of several repeats, and
+reports its latency, its throughput and the peak memory allocated while it runs.
+"""
+import platform
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import Solver
+from mab.simulator.simulator import Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import IncrementalUCB1Solver, UCB1Solver
+
+SOLVER_FACTORIES: Dict[str, Callable[[Bandit], Solver]] = {
+    "EpsilonGreedy": lambda bandit: EpsilonGreedySolver(bandit, epsilon=0.1),
+    "UCB1": lambda bandit: UCB1Solver(bandit, exploration_parameter=1.0),
+    "IncrementalUCB1": lambda bandit: IncrementalUCB1Solver(bandit, exploration_parameter=1.0),
+    "ThomsonSampling": ThomsonSamplingSolver,
+}
+
+
+class BenchmarkResult:
+    """Helper class to store the measures of a benchmark."""
+
+    def __init__(self, seconds_per_op: float, peak_bytes: int):
+        self.seconds_per_op = seconds_per_op
+        self.ops_per_second = 1 / seconds_per_op if seconds_per_op > 0 else float("inf")
+        self.peak_bytes = peak_bytes
+
+    def to_dict(self) -> Dict[str, float]:
+        """Returns the JSON serialisable measures."""
+        return {"seconds_per_op": self.seconds_per_op,
+                "ops_per_second": self.ops_per_second,
+                "peak_bytes": self.peak_bytes}
+
+
+def measure(operation: Callable[[], None], number: int, repeat: int = 5) -> BenchmarkResult:
+    """
+    Times an operation and the memory it allocates.
+
+    Args:
+        operation (Callable): The operation to benchmark.
+        number (int): The number of calls per repeat.
+        repeat (int): The number of repeats. The fastest one is kept.
+    """
+    seconds = min(timeit.repeat(operation, number=number, repeat=repeat)) / number
+
+    tracemalloc.start()
+    for _ in range(number):
+        operation()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return BenchmarkResult(seconds, peak_bytes)
+
+
+def make_bandit(num_arms: int, seed: int = 0) -> Bandit:
+    """Creates a Bernoulli bandit where every arm has already been pulled once. Every
+    arm draws from its own stream spawned from the seed, so the global random module is
+    neither used nor reseeded."""
+    streams = RandomStream(seed).spawn(num_arms)
+    bandit = Bandit([BernoulliArm(random_stream=stream) for stream in streams])
+    for arm in bandit.get_arms():
+        bandit.pull_arm(arm)
+    return bandit
+
+
+def benchmark_solvers(num_arms: int, number: int) -> Dict[str, BenchmarkResult]:
+    """Benchmarks the decision latency and the decision/update loop of every solver."""
+    results = {}
+    for name, factory in SOLVER_FACTORIES.items():
+        bandit = make_bandit(num_arms)
+        solver = factory(bandit)
+        results[f"select_arm/{name}/K={num_arms}"] = measure(solver.select_arm_index, number)
+
+        def step(solver=solver, bandit=bandit):
+            arm_index = solver.select_arm_index()
+            reward = bandit.pull_arm_by_index(arm_index)
+            solver.update_state(bandit.get_arm(arm_index), reward)
+
+        results[f"step/{name}/K={num_arms}"] = measure(step, number)
+    return results
+
+
+def benchmark_bandit(num_arms: int, number: int) -> Dict[str, BenchmarkResult]:
+    """Benchmarks the bandit and arm operations."""
+    bandit = make_bandit(num_arms)
+    arm = bandit.get_arm(num_arms - 1)
+    return {
+        f"pull_arm/K={num_arms}": measure(lambda: bandit.pull_arm(arm), number),
+        f"pull_arm_by_index/K={num_arms}": measure(
+            lambda: bandit.pull_arm_by_index(num_arms - 1), number),
+        f"update_cumulative_reward/K={num_arms}": measure(
+            lambda: arm.update_cumulative_reward(1), number),
+    }
+
+
+def benchmark_simulator(num_arms: int, num_iterations: int) -> Dict[str, BenchmarkResult]:
+    """Benchmarks Simulator.run for every solver. The operation is one simulation step."""
+    results = {}
+    for name, factory in SOLVER_FACTORIES.items():
+        bandit = make_bandit(num_arms)
+        solver = factory(bandit)
+        simulator = Simulator(bandit, [solver])
+        run = measure(lambda simulator=simulator: simulator.run(num_iterations), 1, repeat=3)
+        results[f"simulator/{name}/K={num_arms}/T={num_iterations}"] = BenchmarkResult(
+            run.seconds_per_op / num_iterations, run.peak_bytes)
+    return results
+
+
+def run_suite(arm_sizes: List[int], number: int,
+              num_iterations: int) -> Dict[str, BenchmarkResult]:
+    """
+    Runs every benchmark for every number of arms.
+
+    Args:
+        arm_sizes (List[int]): The numbers of arms (K) to benchmark.
+        number (int): The number of calls of each operation per repeat.
+        num_iterations (int): The number of steps of the simulator benchmarks (T).
+    """
+    results = {}
+    for num_arms in arm_sizes:
+        results.update(benchmark_solvers(num_arms, number))
+        results.update(benchmark_bandit(num_arms, number))
+        results.update(benchmark_simulator(num_arms, num_iterations))
+    return results
+
+
+def get_metadata() -> Dict[str, str]:
+    """Returns a description of the environment of the benchmarks."""
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor()}
+
+
+def find_regressions(results: Dict[str, Dict[str, float]],
+                     baseline: Dict[str, Dict[str, float]],
+                     threshold: float) -> List[Tuple[str, float]]:
+    """
+    Compares the latency of every benchmark with a baseline.
+
+    Args:
+        results (Dict): The current measures, by benchmark name.
+        baseline (Dict): The baseline measures, by benchmark name.
+        threshold (float): The relative slowdown tolerated, e.g. 0.2 for 20%.
+
+    Returns:
+        The benchmarks slower than the threshold, with their slowdown ratio.
+    """
+    regressions = []
+    for name, measures in results.items():
+        if name not in baseline:
+            continue
+        ratio = measures["seconds_per_op"] / baseline[name]["seconds_per_op"]
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
@@ -1,33 +1,115 @@
 """Module for the BernoulliArm class."""
 import random
 from typing import Union
+import numpy as np
 from mab.domain.arm import Arm
+from mab.domain.random_stream import RandomStream
 
 
 class BernoulliArm(Arm):
 
-    """Implementation of the BernoulliArm class for multi-armed bandit problems."""
+    """
+    Implementation of the BernoulliArm class for multi-armed bandit problems.
 
-    def __init__(self, success_probability: float = None) -> None:
+    The arm keeps the exact number of successes in its reward sum, and its cumulative
+    reward is the mean reward derived from it, so the mean does not drift however many
+    times the arm is pulled.
+    """
+
+    def __init__(self, success_probability: float = None,
+                 random_stream: RandomStream = None) -> None:
+        """
+        Args:
+            success_probability (float): The probability of a reward of 1. Drawn at random
+                when it is not given.
+            random_stream (RandomStream): The random stream of the arm. When it is not
+                given, it is created on the first draw from the random module.
+        """
         super().__init__()
+        self._random_stream = random_stream
         self.success_probability = success_probability
         if success_probability is None:
-            self.success_probability = random.random()
+            self.success_probability = (random.random() if random_stream is None
+                                        else random_stream.random())
+
+    def get_random_stream(self) -> RandomStream:
+        """Returns the random stream of the arm, creating it if needed."""
+        if self._random_stream is None:
+            self._random_stream = RandomStream()
+        return self._random_stream
 
-    def pull(self) -> Union[int, float]:
-        """Pull the arm based on the success probability and return the reward."""
-        super().pull()
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """Sets the random stream the arm draws its rewards from."""
+        self._random_stream = random_stream
 
-        if random.random() <= self.success_probability:
+    def sample(self) -> Union[int, float]:
+        """Draw a reward based on the success probability."""
+        random_stream = self._random_stream or self.get_random_stream()
+        if random_stream.random() <= self.success_probability:
             return 1
 
         return 0
 
+    def pull_many(self, pulls: int) -> int:
+        """
+        Pulls the arm several times at once with a single binomial draw.
+
+        The statistics of the arm are updated in O(1), whatever the number of pulls.
+
+        Args:
+            pulls (int): The number of pulls.
+
+        Returns:
+            The number of successes, which is the sum of the rewards.
+        """
+        successes = int(self.get_random_stream().generator.binomial(
+            pulls, self.success_probability))
+        self.record_pulls(pulls, successes)
+        return successes
+
+    def sample_many(self, pulls: int) -> np.ndarray:
+        """
+        Draws the rewards of several pulls at once without updating the statistics.
+
+        Args:
+            pulls (int): The number of pulls.
+
+        Returns:
+            The reward of each pull.
+        """
+        uniforms = self.get_random_stream().uniforms(pulls)
+        return (uniforms <= self.success_probability).astype(np.int64)
+
+    def record_pulls(self, pulls: int, successes: int) -> None:
+        """
+        Records several pulls in the statistics of the arm in O(1).
+
+        Args:
+            pulls (int): The number of pulls.
+            successes (int): The number of pulls with a reward of 1.
+        """
+        self._pull_counts += pulls
+        self.set_reward_sum(self.get_reward_sum() + successes)
+        self.set_squared_reward_sum(self.get_squared_reward_sum() + successes)
+        self.update_cumulative_reward(successes)
+
     def update_cumulative_reward(self, reward: Union[int, float]) -> None:
-        """ We update the cumulative reward of the arm based on the pull count 
-        and the reward obtained from pulling the arm."""
-        self._cumulative_reward = (self._cumulative_reward * (self._pull_counts - 1)
-                                   + reward) / self._pull_counts
+        """ We update the cumulative reward of the arm, which is its mean reward,
+        from the exact reward sum and pull count."""
+        self._cumulative_reward = self.get_mean()
+
+    def get_mean(self) -> float:
+        """Returns the mean reward of the arm, 0 if it was never pulled."""
+        return self.get_reward_sum() / max(1, self._pull_counts)
+
+    def __clone__(self) -> 'BernoulliArm':
+        """Creates a new BernoulliArm with the same success probability and statistics."""
+        cloned_arm = self.__class__(self.success_probability)
+        cloned_arm.set_pull_counts(self._pull_counts)
+        cloned_arm.set_cumulative_reward(self._cumulative_reward)
+        cloned_arm.set_reward_sum(self.get_reward_sum())
+        cloned_arm.set_squared_reward_sum(self.get_squared_reward_sum())
+        return cloned_arm
 
     def __str__(self):
         return f"BernoulliArm p={self.success_probability}"
@@ -0,0 +1,125 @@
+"""Module for the Bernoulli arms whose success probability drifts over time."""
+from math import sqrt
+from typing import List, Union
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.random_stream import RandomStream
+
+
+class PiecewiseStationaryArm(BernoulliArm):
+    """
+    Bernoulli arm whose success probability changes abruptly every fixed number of steps.
+
+    The time is the number of steps of the bandit the arm belongs to (see
+    `BanditState.steps`), so the arms of a bandit change together, removing an arm does
+    not move the schedule and the schedule restarts when the bandit is reset. The
+    success probabilities are repeated cyclically, e.g. for daily traffic patterns.
+    """
+
+    # The success probability changes over time
+    stationary: bool = False
+
+    def __init__(self, success_probabilities: List[float], change_every: int,
+                 random_stream: RandomStream = None) -> None:
+        """
+        Args:
+            success_probabilities (List[float]): The success probability of each period.
+            change_every (int): The number of steps of each period.
+            random_stream (RandomStream): The random stream of the arm.
+
+        Raises:
+            ValueError: If there is no success probability or the period is not positive.
+        """
+        if not success_probabilities or change_every < 1:
+            raise ValueError("A piecewise stationary arm needs success probabilities "
+                             "and a positive number of steps per period.")
+
+        super().__init__(success_probabilities[0], random_stream)
+        self.success_probabilities = list(success_probabilities)
+        self.change_every = change_every
+
+    def sample(self) -> Union[int, float]:
+        """Draw a reward based on the success probability of the current period."""
+        period = self._state.steps // self.change_every
+        self.success_probability = self.success_probabilities[
+            period % len(self.success_probabilities)]
+        return super().sample()
+
+    def __clone__(self) -> 'PiecewiseStationaryArm':
+        """Creates a new arm with the same schedule and statistics."""
+        cloned_arm = self.__class__(self.success_probabilities, self.change_every)
+        cloned_arm.set_pull_counts(self._pull_counts)
+        cloned_arm.set_cumulative_reward(self._cumulative_reward)
+        cloned_arm.set_reward_sum(self.get_reward_sum())
+        cloned_arm.set_squared_reward_sum(self.get_squared_reward_sum())
+        return cloned_arm
+
+    def __str__(self):
+        return f"PiecewiseStationaryArm p={self.success_probabilities}"
+
+
+class RandomWalkArm(BernoulliArm):
+    """
+    Bernoulli arm whose success probability follows a Gaussian random walk reflected
+    at 0 and 1.
+
+    The walk only advances when the arm is sampled, by all the steps elapsed since its
+    last sample at once: the sum of n Gaussian steps is a single Gaussian draw, and
+    folding the free walk into [0, 1] is the same as reflecting it at every step. Each
+    sample is O(1) however long the arm was not pulled.
+    """
+
+    # The success probability changes over time
+    stationary: bool = False
+
+    def __init__(self, success_probability: float = None, step_size: float = 0.01,
+                 random_stream: RandomStream = None) -> None:
+        """
+        Args:
+            success_probability (float): The initial success probability. Drawn at random
+                when it is not given.
+            step_size (float): The standard deviation of the walk at each step.
+            random_stream (RandomStream): The random stream of the arm.
+        """
+        super().__init__(success_probability, random_stream)
+        self.initial_probability = self.success_probability
+        self.step_size = step_size
+        # The free walk, before folding, and the time it was last advanced to
+        self._position = self.success_probability
+        self._time = 0
+
+    def sample(self) -> Union[int, float]:
+        """Draw a reward based on the success probability at the current time."""
+        time = self._state.steps
+        if time < self._time:
+            # The bandit was reset, so the walk restarts
+            self._position, self._time = self.initial_probability, 0
+        if time > self._time:
+            self._position += self.get_random_stream().generator.normal(
+                0.0, self.step_size * sqrt(time - self._time))
+            self._time = time
+            self.success_probability = self._fold(self._position)
+        return super().sample()
+
+    @staticmethod
+    def _fold(position: float) -> float:
+        """Reflects a position of the free walk into [0, 1]."""
+        position = position % 2.0
+        return 2.0 - position if position > 1.0 else position
+
+    def reset(self) -> None:
+        """Resets the statistics of the arm and restarts the walk."""
+        super().reset()
+        self._position, self._time = self.initial_probability, 0
+        self.success_probability = self.initial_probability
+
+    def __clone__(self) -> 'RandomWalkArm':
+        """Creates a new arm with the same walk and statistics."""
+        cloned_arm = self.__class__(self.initial_probability, self.step_size)
+        cloned_arm.set_pull_counts(self._pull_counts)
+        cloned_arm.set_cumulative_reward(self._cumulative_reward)
+        cloned_arm.set_reward_sum(self.get_reward_sum())
+        cloned_arm.set_squared_reward_sum(self.get_squared_reward_sum())
+        return cloned_arm
+
+    def __str__(self):
+        return f"RandomWalkArm p0={self.initial_probability} step={self.step_size}"
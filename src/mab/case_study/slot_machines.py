@@ -1,8 +1,10 @@
 """Module for the Slot Machines case study."""
+import numpy as np
 from mab.case_study.bernoulli_arm import BernoulliArm
 from mab.domain.bandit import Bandit
+from mab.simulator.metrics import realised_regret_at
 from mab.simulator.plotter import PlotConfig, Plotter
-from mab.simulator.simulator import Simulator
+from mab.simulator.simulator import RecordingMode, Simulator
 from mab.solvers.epsilon_greedy import EpsilonGreedySolver
 from mab.solvers.thomson_sampling import ThomsonSamplingSolver
 from mab.solvers.ucb import UCB1Solver
@@ -58,29 +60,35 @@ class BernoulliSlotMachines():
         rewards = {}
         regrets = {}
         arm_cummulative = {}
+        true_prob = max(arm.success_probability for arm in self.arms)
         for solver in self.solvers:
             arm_fractions[str(
                 solver)] = benchmark_results[solver].usage_fractions.values()
-            rewards[str(solver)] = benchmark_results[solver].rewards
-
-            arm_cummulative[str(solver)] = benchmark_results[solver].cummulatives
+            results = benchmark_results[solver]
+            if results.mode == RecordingMode.AGGREGATES:
+                # Only the totals of the run are known
+                steps = np.array([results.num_steps - 1])
+                cumulative_rewards = np.array([results.total_reward])
+            else:
+                # The recorded steps may be one out of every N
+                steps = results.steps
+                cumulative_rewards = results.cumulative_rewards
+            rewards[str(solver)] = (steps, cumulative_rewards)
+
+            arm_cummulative[str(solver)] = results.cummulatives
 
             # Calculate the cumulative regret
-            regret_history = []
-            for estimated_prob in rewards[str(solver)]:
-                true_prob = max(arm.success_probability for arm in self.arms)
-                regret_history.append(true_prob - estimated_prob)
-
-            regrets[str(solver)] = regret_history
+            regrets[str(solver)] = (steps, realised_regret_at(steps, cumulative_rewards,
+                                                              true_prob))
 
         # Plot the results
         Plotter.plot_arm_selection_fractions(arm_fractions, solvers_names)
         Plotter.show_plot()
 
-        Plotter.plot_cumulative(rewards)
+        Plotter.plot_cumulative_series(rewards)
         Plotter.show_plot()
 
-        Plotter.plot_cumulative(
+        Plotter.plot_cumulative_series(
             regrets,
             PlotConfig(x_label="#Iterations",
                        y_label="Cumulative Regret",
@@ -0,0 +1,147 @@
+'''
+Module: action_history.py
+Compact, optionally bounded history of the decisions of a solver.
+'''
+from typing import Optional
+import numpy as np
+
+
+class ActionHistory:
+    """
+    Class storing the decisions of a solver as an arm index (int32), an action code
+    (int8, see SolverAction.code) and the generation of the slot of the arm (int32, see
+    BanditState.generations) per decision, so the decisions of an arm that was removed
+    are not mistaken for decisions of the next arm taking its slot.
+
+    The arrays grow by doubling. With a capacity, they stop growing at the capacity and
+    become a ring buffer keeping only the most recent decisions, so the memory of a
+    long-running solver stays flat.
+    """
+
+    _INITIAL_SIZE: int = 16
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        """
+        Args:
+            capacity (Optional[int]): The maximum number of decisions kept. None keeps
+                every decision and 0 keeps none.
+
+        Raises:
+            ValueError: If the capacity is negative.
+        """
+        if capacity is not None and capacity < 0:
+            raise ValueError("The capacity of the history cannot be negative.")
+
+        self.capacity = capacity
+        self._arm_indices = np.zeros(0, dtype=np.int32)
+        self._action_codes = np.zeros(0, dtype=np.int8)
+        self._generations = np.zeros(0, dtype=np.int32)
+        # Slot of the oldest decision, only moved once the ring buffer is full
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def arm_indices(self) -> np.ndarray:
+        """The index of the selected arm of each kept decision, oldest first."""
+        return self._ordered(self._arm_indices)
+
+    @property
+    def action_codes(self) -> np.ndarray:
+        """The code of the action of each kept decision, oldest first."""
+        return self._ordered(self._action_codes)
+
+    @property
+    def generations(self) -> np.ndarray:
+        """The generation of the slot of the selected arm of each kept decision."""
+        return self._ordered(self._generations)
+
+    def _ordered(self, values: np.ndarray) -> np.ndarray:
+        if self._start == 0:
+            return values[:self._size].copy()
+        return np.concatenate((values[self._start:], values[:self._start]))
+
+    def _reserve(self, size: int) -> None:
+        """Grows the arrays to hold `size` decisions, up to the capacity."""
+        if self.capacity is not None:
+            size = min(size, self.capacity)
+        if size > len(self._arm_indices):
+            # The ring buffer only wraps once it reaches the capacity, so it is not wrapped
+            new_size = max(size, self._INITIAL_SIZE, 2 * len(self._arm_indices))
+            if self.capacity is not None:
+                new_size = min(new_size, self.capacity)
+            self._arm_indices = np.resize(self._arm_indices, new_size)
+            self._action_codes = np.resize(self._action_codes, new_size)
+            self._generations = np.resize(self._generations, new_size)
+
+    def append(self, arm_index: int, action_code: int, repeats: int = 1,
+               generation: int = 0) -> None:
+        """
+        Appends a decision, repeated for a number of consecutive steps.
+
+        Args:
+            arm_index (int): The index of the selected arm.
+            action_code (int): The code of the action.
+            repeats (int): The number of consecutive steps of the decision.
+            generation (int): The generation of the slot of the selected arm.
+        """
+        if repeats != 1:
+            self.extend(np.full(repeats, arm_index), np.full(repeats, action_code),
+                        np.full(repeats, generation))
+            return
+
+        if self._size == len(self._arm_indices):
+            self._reserve(self._size + 1)
+        buffer_size = len(self._arm_indices)
+        if buffer_size == 0:
+            return
+        slot = (self._start + self._size) % buffer_size
+        self._arm_indices[slot] = arm_index
+        self._action_codes[slot] = action_code
+        self._generations[slot] = generation
+        if self._size == buffer_size:
+            self._start = (self._start + 1) % buffer_size
+        else:
+            self._size += 1
+
+    def extend(self, arm_indices: np.ndarray, action_codes: np.ndarray,
+               generations: np.ndarray = None) -> None:
+        """
+        Appends the decisions of several consecutive steps.
+
+        Args:
+            arm_indices (np.ndarray): The index of the selected arm of each step.
+            action_codes (np.ndarray): The code of the action of each step.
+            generations (np.ndarray): The generation of the slot of the selected arm of
+                each step, 0 when not given.
+        """
+        num_decisions = len(arm_indices)
+        if generations is None:
+            generations = np.zeros(num_decisions, dtype=np.int32)
+        if self.capacity is not None and num_decisions >= self.capacity:
+            # Only the most recent decisions of the block are kept
+            self._arm_indices = np.array(arm_indices[num_decisions - self.capacity:],
+                                         dtype=np.int32)
+            self._action_codes = np.array(action_codes[num_decisions - self.capacity:],
+                                          dtype=np.int8)
+            self._generations = np.array(generations[num_decisions - self.capacity:],
+                                         dtype=np.int32)
+            self._start, self._size = 0, self.capacity
+            return
+
+        self._reserve(self._size + num_decisions)
+        buffer_size = len(self._arm_indices)
+        slots = (self._start + self._size + np.arange(num_decisions)) % buffer_size
+        self._arm_indices[slots] = arm_indices
+        self._action_codes[slots] = action_codes
+        self._generations[slots] = generations
+        overflow = max(0, self._size + num_decisions - buffer_size)
+        self._start = (self._start + overflow) % buffer_size
+        self._size = min(buffer_size, self._size + num_decisions)
+
+    def clear(self) -> None:
+        """Forgets every decision."""
+        self._start = 0
+        self._size = 0
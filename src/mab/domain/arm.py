@@ -10,40 +10,125 @@
 from abc import ABC, abstractmethod
 from typing import Union
 
+from mab.domain.bandit_state import BanditState
+from mab.domain.random_stream import RandomStream
+
 
 class Arm(ABC):
     """
     Abstract base class representing an arm in a multi-armed bandit problem.
 
+    The statistics of the arm live in a slot of a `BanditState`. A standalone arm owns
+    a single-slot state; once added to a bandit, the arm becomes a view over the slot
+    of the shared bandit state.
+
     Attributes:
         _pull_counts (int): The number of times the arm has been pulled.
         _cumulative_reward (Union[int, float]): The cumulative reward obtained from pulling the arm.
     """
 
+    # Whether the reward distribution of the arm does not change over time
+    stationary: bool = True
+
     def __init__(self) -> None:
         """
         Initializes the arm object.
 
         Initializes the pull_counts and cumulative_reward variables.
         """
-        # number of times the arm has been pulled
-        self._pull_counts: int = 0
+        # state holding the statistics of the arm and the slot of the arm in it
+        self._state: BanditState = BanditState(1)
+        self._slot: int = 0
 
-        # cumulative reward obtained from pulling the arm
-        self._cumulative_reward: Union[int, float] = 0
+    @property
+    def _pull_counts(self) -> int:
+        """The number of times the arm has been pulled."""
+        return self._state.get_pull_counts(self._slot)
 
-    @abstractmethod
-    def pull(self) -> Union[int, float]:
+    @_pull_counts.setter
+    def _pull_counts(self, pull_counts: int) -> None:
+        self._state.set_pull_counts(self._slot, pull_counts)
+
+    @property
+    def _cumulative_reward(self) -> Union[int, float]:
+        """The cumulative reward obtained from pulling the arm."""
+        return self._state.get_cumulative_reward(self._slot)
+
+    @_cumulative_reward.setter
+    def _cumulative_reward(self, cumulative_reward: Union[int, float]) -> None:
+        self._state.set_cumulative_reward(self._slot, cumulative_reward)
+
+    def attach(self, state: BanditState, slot: int, copy_stats: bool = True) -> None:
         """
-        Abstract method representing pulling the arm.
+        Makes the arm a view over a slot of a bandit state.
 
-        Subclasses must implement this method with their specific implementation details. 
-        Do not forget to call super().pull() in the subclass implementation.
+        Args:
+            state (BanditState): The state that will hold the statistics of the arm.
+            slot (int): The slot of the arm in the state.
+            copy_stats (bool): Whether the current statistics of the arm are copied
+                into the slot. Use False when the slot already holds them.
+        """
+        if copy_stats:
+            state.set_pull_counts(slot, self._pull_counts)
+            state.set_cumulative_reward(slot, self._cumulative_reward)
+            state.set_reward_sum(slot, self.get_reward_sum())
+            state.set_squared_reward_sum(slot, self.get_squared_reward_sum())
+        self._state = state
+        self._slot = slot
+
+    def detach(self) -> None:
+        """
+        Moves the statistics of the arm from the bandit state into a standalone state.
+        """
+        self.attach(BanditState(1), 0)
+
+    def pull(self) -> Union[int, float]:
+        """
+        Pulls the arm: draws a reward and counts the pull.
 
         Returns:
             The reward obtained from pulling the arm.
         """
+        reward = self.sample()
         self._pull_counts += 1
+        return reward
+
+    @abstractmethod
+    def sample(self) -> Union[int, float]:
+        """
+        Abstract method drawing a reward from the arm without updating its statistics.
+
+        Subclasses must implement this method with their specific reward distribution.
+
+        Returns:
+            The drawn reward.
+        """
+        raise NotImplementedError(
+            "sample method must be implemented...")
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """
+        Sets the random stream the arm draws its rewards from.
+
+        Arms whose rewards are not random do not need to override this method.
+
+        Args:
+            random_stream (RandomStream): The random stream of the arm.
+        """
+
+    def record_reward(self, reward: Union[int, float]) -> None:
+        """
+        Records the reward of a pull in the statistics of the arm.
+
+        The reward sums are updated before the cumulative reward, so arm
+        implementations can derive their cumulative reward from them.
+
+        Args:
+            reward (Union[int, float]): The reward obtained by pulling the arm.
+        """
+        self.set_reward_sum(self.get_reward_sum() + reward)
+        self.set_squared_reward_sum(self.get_squared_reward_sum() + reward * reward)
+        self.update_cumulative_reward(reward)
 
     @abstractmethod
     def update_cumulative_reward(self, reward: Union[int, float]) -> None:
@@ -64,10 +149,12 @@ class Arm(ABC):
         """
         Resets the arm's state.
 
-        Resets the pull_counts and cumulative_reward attributes to their initial values.
+        Resets the pull_counts, cumulative_reward and reward sums to their initial values.
         """
         self._pull_counts = 0
         self._cumulative_reward = 0
+        self.set_reward_sum(0)
+        self.set_squared_reward_sum(0)
 
     def get_pull_counts(self) -> int:
         """
@@ -106,6 +193,47 @@ class Arm(ABC):
         """
         self._cumulative_reward = cumulative_reward
 
+    def get_reward_sum(self) -> Union[int, float]:
+        """
+        Returns the raw sum of the rewards obtained from pulling the arm.
+
+        Unlike the cumulative reward, whose meaning is defined by each arm implementation,
+        the reward sum is maintained by the bandit every time the arm is pulled.
+
+        Returns:
+            The raw sum of the rewards obtained from pulling the arm.
+        """
+        return self._state.get_reward_sum(self._slot)
+
+    def set_reward_sum(self, reward_sum: Union[int, float]) -> None:
+        """
+        Sets the raw sum of the rewards obtained from pulling the arm.
+
+        Args:
+            reward_sum (Union[int, float]): The raw sum of the rewards.
+        """
+        self._state.set_reward_sum(self._slot, reward_sum)
+
+    def get_squared_reward_sum(self) -> Union[int, float]:
+        """
+        Returns the sum of the squared rewards obtained from pulling the arm.
+
+        Like the reward sum, it is maintained by the bandit every time the arm is pulled.
+
+        Returns:
+            The sum of the squared rewards obtained from pulling the arm.
+        """
+        return self._state.get_squared_reward_sum(self._slot)
+
+    def set_squared_reward_sum(self, squared_reward_sum: Union[int, float]) -> None:
+        """
+        Sets the sum of the squared rewards obtained from pulling the arm.
+
+        Args:
+            squared_reward_sum (Union[int, float]): The sum of the squared rewards.
+        """
+        self._state.set_squared_reward_sum(self._slot, squared_reward_sum)
+
     def __clone__(self) -> 'Arm':
         """
         Creates a new instance of the Arm class with the same attribute values.
@@ -116,4 +244,6 @@ class Arm(ABC):
         cloned_arm = self.__class__()
         cloned_arm.set_pull_counts(self._pull_counts)
         cloned_arm.set_cumulative_reward(self._cumulative_reward)
+        cloned_arm.set_reward_sum(self.get_reward_sum())
+        cloned_arm.set_squared_reward_sum(self.get_squared_reward_sum())
         return cloned_arm
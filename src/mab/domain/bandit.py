@@ -2,8 +2,9 @@
 Module: bandit.py
 Base class representing a multi-armed bandit problem.
 '''
-from typing import Dict, List
+from typing import Dict, List, Optional
 from mab.domain.arm import Arm
+from mab.domain.bandit_state import BanditState
 
 
 class Bandit:
@@ -13,8 +14,23 @@ class Bandit:
     This class represents a bandit consisting of a set of arms, 
     each representing a possible action or choice that can be taken, 
     and the goal is to find the arm that maximizes the cumulative reward.
+
+    The statistics of the arms are stored in a shared `BanditState`, where the
+    slot of each arm matches its index in the bandit. An arm to index dictionary
+    makes membership checks and index lookups O(1).
+
+    The index of an arm is a stable id: removing an arm frees its slot, which is left
+    empty until the next added arm takes it, so the other arms keep their index and
+    adding or removing an arm is O(1) under live traffic. The solvers skip the free
+    slots and reset the state of a slot given to a new arm. `get_arms` and
+    `get_arms_number` only see the arms, while `get_slots` and `get_slots_number` see
+    the slots, free ones included, for the code indexing arrays by arm index.
     """
 
+    # Whether the statistics of the arms may be updated without going through the
+    # bandit, as the fused kernels and the fast forward mode of the simulator do
+    bulk_updates: bool = True
+
     def __init__(self, arms: List[Arm] = None) -> None:
         """
         Initializes the bandit object.
@@ -22,36 +38,81 @@ class Bandit:
         Initializes the arms variable with the provided list of arms.
         If no list is provided, it initializes it as an empty list.
         """
-        self._arms: List[Arm] = arms or []
+        self._arms: List[Optional[Arm]] = []
+        self._arm_indices: Dict[Arm, int] = {}
+        self._state: BanditState = BanditState()
+        self.set_arms(arms or [])
 
     def get_arms(self) -> List[Arm]:
         """
         Returns:
-            A list of arms representing the possible actions or choices.
+            A list of arms representing the possible actions or choices, in the order
+            of their index.
+        """
+        if self._state.num_free == 0:
+            return self._arms
+        return [arm for arm in self._arms if arm is not None]
+
+    def get_slots(self) -> List[Optional[Arm]]:
+        """
+        Returns:
+            The arm of each slot, indexed by arm index, with None for the free slots.
         """
         return self._arms
 
-    def add_arm(self, arm: Arm) -> None:
+    def get_state(self) -> BanditState:
+        """
+        Returns:
+            The state holding the statistics of the arms, indexed by arm index.
+        """
+        return self._state
+
+    def add_arm(self, arm: Arm) -> int:
         """
-        Adds an arm to the bandit.
+        Adds an arm to the bandit, in a free slot if there is one.
+
+        The statistics the arm already has are kept, which warm starts the solvers
+        reading the statistics of the bandit.
 
         Args:
             arm: The arm to be added to the bandit.
+
+        Returns:
+            The index of the arm in the bandit.
+
+        Raises:
+            ValueError: If the arm is already in the bandit.
         """
-        self._arms.append(arm)
+        if arm in self._arm_indices:
+            raise ValueError("The same arm cannot be added twice to the bandit.")
+
+        slot = self._state.add_slot()
+        arm.attach(self._state, slot)
+        self._arm_indices[arm] = slot
+        if slot == len(self._arms):
+            self._arms.append(arm)
+        else:
+            self._arms[slot] = arm
+        return slot
 
     def remove_arm(self, arm: Arm) -> None:
         """
-        Removes an arm from the bandit.
+        Removes an arm from the bandit, freeing its slot for the next added arm.
+
+        The other arms keep their index.
 
         Args:
             arm: The arm to be removed from the bandit.
         """
-        self._arms.remove(arm)
+        index = self.get_arm_index(arm)
+        arm.detach()
+        del self._arm_indices[arm]
+        self._arms[index] = None
+        self._state.free_slot(index)
 
-    def get_arm(self, index: int) -> Arm:
+    def get_arm(self, index: int) -> Optional[Arm]:
         """
-        Returns the arm at the specified index.
+        Returns the arm at the specified index, or None if the slot is free.
         Args: The index of the arm to be returned.
         """
         return self._arms[index]
@@ -62,8 +123,21 @@ class Bandit:
 
         Returns:
             The index of the arm in the bandit.
+
+        Raises:
+            ValueError: If the arm is not in the bandit.
+        """
+        index = self._arm_indices.get(arm)
+        if index is None:
+            raise ValueError("The arm is not in the bandit.")
+        return index
+
+    def has_arm(self, arm: Arm) -> bool:
+        """
+        Returns:
+            Whether the arm is in the bandit.
         """
-        return self._arms.index(arm)
+        return arm in self._arm_indices
 
     def get_arms_number(self) -> int:
         """
@@ -72,6 +146,14 @@ class Bandit:
         Returns:
             The total number of arms in the bandit.
         """
+        return len(self._arm_indices)
+
+    def get_slots_number(self) -> int:
+        """
+        Returns:
+            The number of slots, free ones included, which is the size of the arrays
+            indexed by arm index.
+        """
         return len(self._arms)
 
     def calculate_cumulative_reward(self) -> float:
@@ -81,7 +163,7 @@ class Bandit:
         Returns:
             The cumulative reward obtained from all the arms in the bandit.
         """
-        return sum(arm.get_cumulative_reward() for arm in self._arms)
+        return float(self._state.cumulative_rewards.sum())
 
     def reset(self) -> None:
         """
@@ -90,7 +172,8 @@ class Bandit:
         Resets the state of all arms in the bandit.
         """
         for arm in self._arms:
-            arm.reset()
+            if arm is not None:
+                arm.reset()
 
     def pull_arm(self, arm: Arm) -> float:
         """
@@ -102,22 +185,75 @@ class Bandit:
         Returns:
             The reward obtained from pulling the arm.
         """
+        return self.pull_arm_by_index(self.get_arm_index(arm))
+
+    def pull_arm_by_index(self, index: int) -> float:
+        """
+        Pulls the arm at the specified index.
 
-        if arm in self._arms:
-            reward = arm.pull()
-            arm.update_cumulative_reward(reward)
-            return reward
+        Args:
+            index: The index of the arm to be pulled.
+
+        Returns:
+            The reward obtained from pulling the arm.
+
+        Raises:
+            ValueError: If there is no arm at the index.
+        """
+        if not 0 <= index < len(self._arms) or self._arms[index] is None:
+            raise ValueError("The arm is not in the bandit.")
 
-        raise ValueError("The arm is not in the bandit.")
+        arm = self._arms[index]
+        reward = arm.pull()
+        arm.record_reward(reward)
+        return reward
 
-    def set_arms(self, arms: List[Arm]) -> None:
+    def record_reward_by_index(self, index: int, reward: float) -> None:
+        """
+        Records a reward observed outside of the bandit for the arm at the specified index.
+
+        The statistics of the arm are updated as if the arm had been pulled and had
+        returned the reward, which is how rewards reported by a live system are applied.
+
+        Args:
+            index: The index of the arm that obtained the reward.
+            reward: The observed reward.
+
+        Raises:
+            ValueError: If there is no arm at the index.
+        """
+        if not 0 <= index < len(self._arms) or self._arms[index] is None:
+            raise ValueError("The arm is not in the bandit.")
+
+        arm = self._arms[index]
+        arm.set_pull_counts(arm.get_pull_counts() + 1)
+        arm.record_reward(reward)
+
+    def set_arms(self, arms: List[Optional[Arm]]) -> None:
         """
         Sets the arms of the bandit.
 
         Args:
-            arms: The arms to be set.
+            arms: The arms to be set. None leaves the slot free.
+
+        Raises:
+            ValueError: If the same arm appears more than once.
         """
-        self._arms = arms
+        arm_indices = {arm: index for index, arm in enumerate(arms) if arm is not None}
+        if len(arm_indices) != sum(arm is not None for arm in arms):
+            raise ValueError("The same arm cannot be added twice to the bandit.")
+
+        for arm in self._arms:
+            if arm is not None:
+                arm.detach()
+        self._state = BanditState(len(arms))
+        for slot, arm in enumerate(arms):
+            if arm is None:
+                self._state.free_slot(slot)
+            else:
+                arm.attach(self._state, slot)
+        self._arms = list(arms)
+        self._arm_indices = arm_indices
 
     def __clone__(self):
         """
@@ -127,7 +263,8 @@ class Bandit:
             A new instance of the bandit with the same arms.
         """
         cloned_bandit = self.__class__()
-        cloned_bandit.set_arms([arm.__clone__() for arm in self._arms])
+        cloned_bandit.set_arms([None if arm is None else arm.__clone__()
+                                for arm in self._arms])
         return cloned_bandit
 
     def calculate_arm_fractions(self) -> Dict[Arm, float]:
@@ -137,16 +274,19 @@ class Bandit:
             A dictionary with the fraction of pulls 
             for each arm in the bandit. {arm: fraction, ...}
         """
-        arm_counts = {arm: arm.get_pull_counts() for arm in self.get_arms()}
-        total_pulls = sum(arm_counts.values())
-        arm_fractions = {arm: count / total_pulls
-                         if total_pulls > 0 else 0.0 for arm, count in arm_counts.items()}
+        total_pulls = self._state.total_pulls
+        fractions = (self._state.pull_counts / total_pulls if total_pulls > 0
+                     else [0.0] * self.get_slots_number())
+        arm_fractions = {arm: float(fraction)
+                         for arm, fraction in zip(self._arms, fractions) if arm is not None}
         return arm_fractions
 
     def get_cumulative_by_arms(self) -> List:
         """
         Returns the cumulative reward by arm.
         Returns:
-            A list of cumulative rewards by arm.
+            A list of cumulative rewards by arm, in the order of `get_arms`.
         """
-        return [arm.get_cumulative_reward() for arm in self.get_arms()]
+        if self._state.num_free == 0:
+            return self._state.cumulative_rewards.tolist()
+        return self._state.cumulative_rewards[self._state.active].tolist()
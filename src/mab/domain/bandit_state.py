@@ -0,0 +1,303 @@
+'''
+Module: bandit_state.py
+Contiguous storage for the per-arm statistics of a multi-armed bandit problem.
+'''
+from typing import List
+import numpy as np
+
+
+class BanditState:
+    """
+    Class storing the statistics of every arm of a bandit in contiguous NumPy arrays.
+
+    Each arm owns a slot (its arm id) in the arrays, so solvers can compute their
+    selection criteria with vectorised operations instead of walking the arm objects.
+
+    The slot of a removed arm is freed rather than removed, so the slots of the other
+    arms never move, and it is given to the next added arm. Every freed or assigned
+    slot bumps the catalogue version, which lets the solvers notice the slots given to
+    new arms since they last looked (see `get_added_slots`). The generation of a slot
+    counts the times it was freed, so a slot and its generation identify an arm for
+    good, e.g. in the action history of a solver.
+
+    Attributes:
+        total_pulls (int): The running number of pulls over all the arms. The pulls of
+            a removed arm are subtracted when its slot is freed.
+        version (int): The number of slots assigned or freed so far.
+    """
+
+    _INITIAL_CAPACITY: int = 8
+
+    def __init__(self, num_arms: int = 0) -> None:
+        """
+        Initializes the state with `num_arms` zeroed slots.
+
+        Args:
+            num_arms (int): The number of slots to allocate.
+        """
+        capacity = max(num_arms, self._INITIAL_CAPACITY)
+        self._pull_counts = np.zeros(capacity, dtype=np.int64)
+        self._cumulative_rewards = np.zeros(capacity, dtype=np.float64)
+        self._reward_sums = np.zeros(capacity, dtype=np.float64)
+        self._squared_reward_sums = np.zeros(capacity, dtype=np.float64)
+        # Whether each slot holds an arm, and the catalogue version it got it at
+        self._active = np.zeros(capacity, dtype=bool)
+        self._active[:num_arms] = True
+        self._added_versions = np.zeros(capacity, dtype=np.int64)
+        self._generations = np.zeros(capacity, dtype=np.int32)
+        self._free_slots: List[int] = []
+        self._size: int = num_arms
+        # Pulls of the arms removed since the last reset, kept out of total_pulls
+        self._removed_pulls: int = 0
+        self.total_pulls: int = 0
+        self.version: int = 0
+
+    @property
+    def steps(self) -> int:
+        """The number of pulls since the last reset, including the pulls of the removed
+        arms, so it never goes backwards when an arm is removed (e.g. the clock of the
+        drifting arms)."""
+        return self.total_pulls + self._removed_pulls
+
+    @property
+    def pull_counts(self) -> np.ndarray:
+        """The number of times each arm has been pulled."""
+        return self._pull_counts[:self._size]
+
+    @property
+    def cumulative_rewards(self) -> np.ndarray:
+        """The cumulative reward of each arm, as defined by the arm implementation."""
+        return self._cumulative_rewards[:self._size]
+
+    @property
+    def reward_sums(self) -> np.ndarray:
+        """The raw sum of the rewards obtained from each arm."""
+        return self._reward_sums[:self._size]
+
+    @property
+    def squared_reward_sums(self) -> np.ndarray:
+        """The sum of the squared rewards obtained from each arm."""
+        return self._squared_reward_sums[:self._size]
+
+    @property
+    def active(self) -> np.ndarray:
+        """Whether each slot holds an arm, rather than being free."""
+        return self._active[:self._size]
+
+    @property
+    def generations(self) -> np.ndarray:
+        """The number of times each slot was freed, which tells apart its arms."""
+        return self._generations[:self._size]
+
+    @property
+    def num_free(self) -> int:
+        """The number of free slots."""
+        return len(self._free_slots)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_added_slots(self, version: int) -> np.ndarray:
+        """
+        Returns the slots given to an arm after a catalogue version, in O(K).
+
+        Args:
+            version (int): The catalogue version.
+
+        Returns:
+            The indices of the slots, which may be beyond the ones known at the version.
+        """
+        return np.flatnonzero(self._added_versions[:self._size] > version)
+
+    def add_slot(self) -> int:
+        """
+        Gives a zeroed slot to a new arm, recycling a free slot if there is one, or
+        appending it and growing the arrays geometrically when they are full.
+
+        Returns:
+            The index of the slot.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == len(self._pull_counts):
+                capacity = 2 * len(self._pull_counts)
+                self._pull_counts = np.resize(self._pull_counts, capacity)
+                self._cumulative_rewards = np.resize(self._cumulative_rewards, capacity)
+                self._reward_sums = np.resize(self._reward_sums, capacity)
+                self._squared_reward_sums = np.resize(self._squared_reward_sums, capacity)
+                self._active = np.resize(self._active, capacity)
+                self._added_versions = np.resize(self._added_versions, capacity)
+                self._generations = np.resize(self._generations, capacity)
+                self._generations[self._size:] = 0
+            slot = self._size
+            self._size += 1
+
+        self._pull_counts[slot] = 0
+        self._cumulative_rewards[slot] = 0
+        self._reward_sums[slot] = 0
+        self._squared_reward_sums[slot] = 0
+        self.version += 1
+        self._active[slot] = True
+        self._added_versions[slot] = self.version
+        return slot
+
+    def free_slot(self, slot: int) -> None:
+        """
+        Frees a slot, zeroing its statistics, so it can be given to the next new arm.
+
+        Args:
+            slot (int): The index of the slot to be freed.
+
+        Raises:
+            IndexError: If the slot is not an active slot of the state.
+        """
+        if not 0 <= slot < self._size or not self._active[slot]:
+            raise IndexError("The slot is not in the state.")
+
+        self.total_pulls -= int(self._pull_counts[slot])
+        self._removed_pulls += int(self._pull_counts[slot])
+        self._pull_counts[slot] = 0
+        self._cumulative_rewards[slot] = 0
+        self._reward_sums[slot] = 0
+        self._squared_reward_sums[slot] = 0
+        self._active[slot] = False
+        self._generations[slot] += 1
+        self._free_slots.append(slot)
+        self.version += 1
+
+    def get_pull_counts(self, slot: int) -> int:
+        """Returns the number of pulls stored in a slot."""
+        return int(self._pull_counts[slot])
+
+    def set_pull_counts(self, slot: int, pull_counts: int) -> None:
+        """Sets the number of pulls of a slot, keeping the running total consistent."""
+        self.total_pulls += pull_counts - int(self._pull_counts[slot])
+        self._pull_counts[slot] = pull_counts
+
+    def get_cumulative_reward(self, slot: int) -> float:
+        """Returns the cumulative reward stored in a slot."""
+        return float(self._cumulative_rewards[slot])
+
+    def set_cumulative_reward(self, slot: int, cumulative_reward: float) -> None:
+        """Sets the cumulative reward of a slot."""
+        self._cumulative_rewards[slot] = cumulative_reward
+
+    def get_reward_sum(self, slot: int) -> float:
+        """Returns the raw sum of rewards stored in a slot."""
+        return float(self._reward_sums[slot])
+
+    def set_reward_sum(self, slot: int, reward_sum: float) -> None:
+        """Sets the raw sum of rewards of a slot."""
+        self._reward_sums[slot] = reward_sum
+
+    def get_squared_reward_sum(self, slot: int) -> float:
+        """Returns the sum of the squared rewards stored in a slot."""
+        return float(self._squared_reward_sums[slot])
+
+    def set_squared_reward_sum(self, slot: int, squared_reward_sum: float) -> None:
+        """Sets the sum of the squared rewards of a slot."""
+        self._squared_reward_sums[slot] = squared_reward_sum
+
+    def set_statistics(self, pull_counts: np.ndarray, cumulative_rewards: np.ndarray,
+                       reward_sums: np.ndarray, squared_reward_sums: np.ndarray = None) -> None:
+        """
+        Replaces the statistics of every slot at once.
+
+        Args:
+            pull_counts (np.ndarray): The number of pulls of each slot.
+            cumulative_rewards (np.ndarray): The cumulative reward of each slot.
+            reward_sums (np.ndarray): The raw sum of rewards of each slot.
+            squared_reward_sums (np.ndarray): The sum of the squared rewards of each slot.
+                Left unchanged when not given.
+        """
+        self.pull_counts[:] = pull_counts
+        self.cumulative_rewards[:] = cumulative_rewards
+        self.reward_sums[:] = reward_sums
+        if squared_reward_sums is not None:
+            self.squared_reward_sums[:] = squared_reward_sums
+        self.total_pulls = int(self.pull_counts.sum())
+
+    def reset(self) -> None:
+        """Resets the statistics of every slot to zero."""
+        self._pull_counts[:] = 0
+        self._cumulative_rewards[:] = 0
+        self._reward_sums[:] = 0
+        self._squared_reward_sums[:] = 0
+        self._removed_pulls = 0
+        self.total_pulls = 0
+
+    def __clone__(self) -> 'BanditState':
+        """
+        Creates a new state with a copy of the statistics.
+
+        Returns:
+            A new instance of the BanditState class with the same statistics.
+        """
+        cloned_state = self.__class__(self._size)
+        cloned_state.pull_counts[:] = self.pull_counts
+        cloned_state.cumulative_rewards[:] = self.cumulative_rewards
+        cloned_state.reward_sums[:] = self.reward_sums
+        cloned_state.squared_reward_sums[:] = self.squared_reward_sums
+        cloned_state.active[:] = self.active
+        cloned_state._added_versions[:self._size] = self._added_versions[:self._size]
+        cloned_state.generations[:] = self.generations
+        cloned_state._free_slots = list(self._free_slots)
+        cloned_state._removed_pulls = self._removed_pulls
+        cloned_state.total_pulls = self.total_pulls
+        cloned_state.version = self.version
+        return cloned_state
+
+
+class BatchBanditState:
+    """
+    Class storing the statistics of R independent replications of a bandit as (R, K) arrays.
+
+    Every replication pulls exactly one arm per step, so the total number of pulls is
+    shared by all the replications.
+
+    Attributes:
+        pull_counts (np.ndarray): The number of pulls of each arm in each replication.
+        reward_sums (np.ndarray): The sum of the rewards of each arm in each replication.
+        total_pulls (int): The number of pulls performed by each replication.
+    """
+
+    def __init__(self, replications: int, num_arms: int) -> None:
+        """
+        Initializes a zeroed state.
+
+        Args:
+            replications (int): The number of independent replications (R).
+            num_arms (int): The number of arms of the bandit (K).
+        """
+        self.pull_counts = np.zeros((replications, num_arms), dtype=np.int64)
+        self.reward_sums = np.zeros((replications, num_arms), dtype=np.float64)
+        self.total_pulls: int = 0
+        self._rows = np.arange(replications)
+
+    @property
+    def replications(self) -> int:
+        """The number of independent replications (R)."""
+        return self.pull_counts.shape[0]
+
+    @property
+    def num_arms(self) -> int:
+        """The number of arms of the bandit (K)."""
+        return self.pull_counts.shape[1]
+
+    @property
+    def means(self) -> np.ndarray:
+        """The empirical mean reward of each arm in each replication."""
+        return self.reward_sums / np.maximum(1, self.pull_counts)
+
+    def record(self, arm_indices: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Records the arm pulled and the reward obtained by every replication in one step.
+
+        Args:
+            arm_indices (np.ndarray): The index of the arm pulled by each replication.
+            rewards (np.ndarray): The reward obtained by each replication.
+        """
+        self.pull_counts[self._rows, arm_indices] += 1
+        self.reward_sums[self._rows, arm_indices] += rewards
+        self.total_pulls += 1
@@ -0,0 +1,367 @@
+'''
+Module: clustered_bandit.py
+Multi-armed bandit whose arms are grouped into clusters, for hierarchical solvers.
+'''
+from typing import List, Tuple, Union
+import numpy as np
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+
+
+class ClusterArm(Arm):
+    """
+    Arm standing for a cluster in the bandit of the clusters of a ClusteredBandit.
+
+    Its statistics aggregate the ones of the arms of the cluster, and its cumulative
+    reward is their mean reward. It is never pulled, the arms of its cluster are.
+    """
+
+    def sample(self) -> Union[int, float]:
+        """Cluster arms are not pulled, the arms of their cluster are."""
+        raise NotImplementedError("A cluster arm is not pulled, the arms of its cluster are.")
+
+    def update_cumulative_reward(self, reward: Union[int, float]) -> None:
+        """Sets the cumulative reward to the mean reward of the arms of the cluster."""
+        pull_counts = self.get_pull_counts()
+        self.set_cumulative_reward(self.get_reward_sum() / pull_counts if pull_counts else 0.0)
+
+    def __str__(self):
+        return "ClusterArm"
+
+
+class ClusterState:
+    """
+    View over the slots of the arms of a cluster in the state of a clustered bandit.
+
+    The arrays are slices of the arrays of the bandit state, so they are not copied,
+    and the total number of pulls is the number of pulls of the cluster.
+    """
+
+    def __init__(self, bandit: 'ClusteredBandit', cluster_index: int) -> None:
+        """
+        Args:
+            bandit (ClusteredBandit): The bandit the cluster belongs to.
+            cluster_index (int): The index of the cluster.
+        """
+        self._bandit = bandit
+        self._cluster_arm = bandit.get_cluster_bandit().get_arm(cluster_index)
+        self.start, self.stop = bandit.get_cluster_bounds(cluster_index)
+
+    @property
+    def pull_counts(self) -> np.ndarray:
+        """The number of times each arm of the cluster has been pulled."""
+        return self._bandit.get_state().pull_counts[self.start:self.stop]
+
+    @property
+    def cumulative_rewards(self) -> np.ndarray:
+        """The cumulative reward of each arm of the cluster."""
+        return self._bandit.get_state().cumulative_rewards[self.start:self.stop]
+
+    @property
+    def reward_sums(self) -> np.ndarray:
+        """The raw sum of the rewards obtained from each arm of the cluster."""
+        return self._bandit.get_state().reward_sums[self.start:self.stop]
+
+    @property
+    def squared_reward_sums(self) -> np.ndarray:
+        """The sum of the squared rewards obtained from each arm of the cluster."""
+        return self._bandit.get_state().squared_reward_sums[self.start:self.stop]
+
+    @property
+    def active(self) -> np.ndarray:
+        """Whether each slot of the cluster holds an arm, which they all do."""
+        return self._bandit.get_state().active[self.start:self.stop]
+
+    @property
+    def generations(self) -> np.ndarray:
+        """The number of times each slot of the cluster was freed."""
+        return self._bandit.get_state().generations[self.start:self.stop]
+
+    @property
+    def num_free(self) -> int:
+        """The number of free slots, none as the arms of a cluster are not removed."""
+        return 0
+
+    @property
+    def total_pulls(self) -> int:
+        """The number of pulls of the arms of the cluster."""
+        return self._cluster_arm.get_pull_counts()
+
+    @property
+    def version(self) -> int:
+        """The catalogue version of the bandit."""
+        return self._bandit.get_state().version
+
+    def get_added_slots(self, version: int) -> np.ndarray:
+        """Returns the slots of the cluster given to an arm after a catalogue version."""
+        added_slots = self._bandit.get_state().get_added_slots(version)
+        added_slots = added_slots[(added_slots >= self.start) & (added_slots < self.stop)]
+        return added_slots - self.start
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+
+class BanditCluster:
+    """
+    View over the arms of a cluster of a clustered bandit, with the interface of a
+    Bandit the solvers read, so any solver can pick the arm within a cluster.
+
+    The arms are indexed from 0 within the cluster.
+    """
+
+    def __init__(self, bandit: 'ClusteredBandit', cluster_index: int) -> None:
+        """
+        Args:
+            bandit (ClusteredBandit): The bandit the cluster belongs to.
+            cluster_index (int): The index of the cluster.
+        """
+        self._bandit = bandit
+        self._state = ClusterState(bandit, cluster_index)
+        self.start, self.stop = self._state.start, self._state.stop
+
+    def get_arms(self) -> List[Arm]:
+        """Returns the arms of the cluster."""
+        return self._bandit.get_slots()[self.start:self.stop]
+
+    def get_slots(self) -> List[Arm]:
+        """Returns the arm of each slot of the cluster, which are never free."""
+        return self.get_arms()
+
+    def get_state(self) -> ClusterState:
+        """Returns the view over the statistics of the arms of the cluster."""
+        return self._state
+
+    def get_arm(self, index: int) -> Arm:
+        """Returns the arm at the specified index of the cluster."""
+        return self._bandit.get_arm(self.start + index)
+
+    def get_arm_index(self, arm: Arm) -> int:
+        """
+        Returns the index of the arm in the cluster.
+
+        Raises:
+            ValueError: If the arm is not in the cluster.
+        """
+        index = self._bandit.get_arm_index(arm)
+        if not self.start <= index < self.stop:
+            raise ValueError("The arm is not in the cluster.")
+        return index - self.start
+
+    def has_arm(self, arm: Arm) -> bool:
+        """Returns whether the arm is in the cluster."""
+        return (self._bandit.has_arm(arm)
+                and self.start <= self._bandit.get_arm_index(arm) < self.stop)
+
+    def get_arms_number(self) -> int:
+        """Returns the number of arms of the cluster."""
+        return self.stop - self.start
+
+    def get_slots_number(self) -> int:
+        """Returns the number of slots of the cluster, one per arm."""
+        return self.stop - self.start
+
+    def pull_arm_by_index(self, index: int) -> float:
+        """Pulls the arm at the specified index of the cluster through the bandit."""
+        if not 0 <= index < self.stop - self.start:
+            raise ValueError("The arm is not in the cluster.")
+        return self._bandit.pull_arm_by_index(self.start + index)
+
+
+class ClusteredBandit(Bandit):
+    """
+    Multi-armed bandit whose arms are grouped into clusters of consecutive indices.
+
+    The statistics of each cluster (pulls and reward sums of its arms) are the ones of
+    a ClusterArm in a separate bandit of the clusters, updated in O(1) by every pull
+    made through the bandit, so a solver can pick a cluster over C arms and another
+    solver an arm over a view of the cluster (see BanditCluster) instead of deciding
+    over the K arms.
+
+    The arms are changed with `set_arms`, which makes a single cluster, and grouped
+    with `set_clusters`. Statistics updated behind the back of the bandit, e.g. with
+    `BanditState.set_statistics`, are aggregated again with `sync_clusters`.
+
+    Unlike a Bandit, arms are not added or removed one at a time and the bandit never
+    has free slots: the clusters are ranges of consecutive indices whose statistics are
+    aggregated, so a changing catalogue is regrouped with `set_arms` and `set_clusters`.
+    """
+
+    # The statistics of the clusters are only updated by the pulls through the bandit
+    bulk_updates: bool = False
+
+    def __init__(self, arms: List[Arm] = None, cluster_sizes: List[int] = None) -> None:
+        """
+        Args:
+            arms (List[Arm]): The arms of the bandit, ordered by cluster.
+            cluster_sizes (List[int]): The number of arms of each cluster. The arms
+                make a single cluster when it is not given.
+        """
+        self._cluster_bandit = Bandit()
+        self._cluster_starts = np.zeros(1, dtype=np.int64)
+        self._clusters: List[BanditCluster] = []
+        super().__init__(arms)
+        if cluster_sizes is not None:
+            self.set_clusters(cluster_sizes)
+
+    def set_arms(self, arms: List[Arm]) -> None:
+        """
+        Sets the arms of the bandit, as a single cluster.
+
+        Args:
+            arms: The arms to be set.
+
+        Raises:
+            ValueError: If an arm is None, a clustered bandit has no free slots.
+        """
+        if any(arm is None for arm in arms):
+            raise ValueError("A clustered bandit has no free slots.")
+        super().set_arms(arms)
+        self.set_clusters([len(arms)] if arms else [])
+
+    def add_arm(self, arm: Arm) -> None:
+        """
+        Raises:
+            ValueError: Always, the arms are changed with `set_arms` and regrouped with
+                `set_clusters`, as the clusters are ranges of consecutive indices.
+        """
+        raise ValueError("The arms of a clustered bandit are changed with set_arms.")
+
+    def remove_arm(self, arm: Arm) -> None:
+        """
+        Raises:
+            ValueError: Always, the arms are changed with `set_arms` and regrouped with
+                `set_clusters`, as the clusters are ranges of consecutive indices.
+        """
+        raise ValueError("The arms of a clustered bandit are changed with set_arms.")
+
+    def set_clusters(self, cluster_sizes: List[int]) -> None:
+        """
+        Groups the arms into clusters of consecutive indices.
+
+        Args:
+            cluster_sizes (List[int]): The number of arms of each cluster, in the order
+                of the arms.
+
+        Raises:
+            ValueError: If a size is not positive or the sizes do not add up to the
+                number of arms.
+        """
+        if (any(size < 1 for size in cluster_sizes)
+                or sum(cluster_sizes) != self.get_slots_number()):
+            raise ValueError("The cluster sizes must be positive and add up to the "
+                             "number of arms.")
+
+        self._cluster_starts = np.concatenate(
+            ([0], np.cumsum(cluster_sizes, dtype=np.int64)))
+        self._cluster_bandit = Bandit([ClusterArm() for _ in cluster_sizes])
+        self._clusters = [BanditCluster(self, cluster_index)
+                          for cluster_index in range(len(cluster_sizes))]
+        self.sync_clusters()
+
+    def sync_clusters(self) -> None:
+        """Aggregates the statistics of the clusters from the ones of the arms, in O(K)."""
+        if not self._clusters:
+            return
+
+        starts = self._cluster_starts[:-1]
+        pull_counts = np.add.reduceat(self._state.pull_counts, starts)
+        reward_sums = np.add.reduceat(self._state.reward_sums, starts)
+        squared_reward_sums = np.add.reduceat(self._state.squared_reward_sums, starts)
+        self._cluster_bandit.get_state().set_statistics(
+            pull_counts, reward_sums / np.maximum(1, pull_counts),
+            reward_sums, squared_reward_sums)
+
+    def get_cluster_bandit(self) -> Bandit:
+        """
+        Returns:
+            The bandit of the clusters, with a ClusterArm per cluster.
+        """
+        return self._cluster_bandit
+
+    def get_clusters_number(self) -> int:
+        """
+        Returns:
+            The number of clusters.
+        """
+        return len(self._clusters)
+
+    def get_cluster(self, cluster_index: int) -> BanditCluster:
+        """
+        Returns:
+            The view over the arms of the cluster at the specified index.
+        """
+        return self._clusters[cluster_index]
+
+    def get_cluster_bounds(self, cluster_index: int) -> Tuple[int, int]:
+        """
+        Returns:
+            The index of the first arm of the cluster and the index after its last arm.
+        """
+        return (int(self._cluster_starts[cluster_index]),
+                int(self._cluster_starts[cluster_index + 1]))
+
+    def get_cluster_sizes(self) -> List[int]:
+        """
+        Returns:
+            The number of arms of each cluster.
+        """
+        return np.diff(self._cluster_starts).tolist()
+
+    def get_cluster_index(self, arm_index: int) -> int:
+        """
+        Returns the index of the cluster of the arm at the specified index, in O(log C).
+
+        Raises:
+            ValueError: If there is no arm at the index.
+        """
+        if not 0 <= arm_index < self.get_slots_number():
+            raise ValueError("The arm is not in the bandit.")
+        return int(np.searchsorted(self._cluster_starts, arm_index, side='right')) - 1
+
+    def pull_arm_by_index(self, index: int) -> float:
+        """
+        Pulls the arm at the specified index and updates the statistics of its cluster.
+
+        Args:
+            index: The index of the arm to be pulled.
+
+        Returns:
+            The reward obtained from pulling the arm.
+        """
+        reward = super().pull_arm_by_index(index)
+        self._record_cluster_reward(index, reward)
+        return reward
+
+    def record_reward_by_index(self, index: int, reward: float) -> None:
+        """
+        Records a reward observed outside of the bandit for the arm at the specified
+        index and for its cluster.
+
+        Args:
+            index: The index of the arm that obtained the reward.
+            reward: The observed reward.
+        """
+        super().record_reward_by_index(index, reward)
+        self._record_cluster_reward(index, reward)
+
+    def _record_cluster_reward(self, index: int, reward: float) -> None:
+        cluster_arm = self._cluster_bandit.get_arm(self.get_cluster_index(index))
+        cluster_arm.set_pull_counts(cluster_arm.get_pull_counts() + 1)
+        cluster_arm.record_reward(reward)
+
+    def reset(self) -> None:
+        """Resets the state of all the arms and clusters."""
+        super().reset()
+        self._cluster_bandit.reset()
+
+    def __clone__(self):
+        """
+        Creates a new instance of the bandit with the same arms and clusters.
+
+        Returns:
+            A new instance of the bandit with the same arms and clusters.
+        """
+        cloned_bandit = super().__clone__()
+        cloned_bandit.set_clusters(self.get_cluster_sizes())
+        return cloned_bandit
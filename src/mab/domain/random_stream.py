@@ -0,0 +1,95 @@
+'''
+Module: random_stream.py
+Seeded, splittable random streams for the arms, the solvers and the simulations.
+'''
+import random
+from typing import List, Union
+import numpy as np
+
+
+class RandomStream:
+    """
+    Class giving a reproducible stream of random numbers to an arm, a solver or a run.
+
+    The stream wraps a NumPy generator created from a `SeedSequence`, so it can be split
+    into independent child streams with `spawn`: each replication, solver and arm gets
+    its own stream and the draws do not depend on the order the components are used in.
+
+    The uniforms and the integers of the scalar hot paths are generated by blocks and
+    handed out from buffers by cursor, so a draw costs a list index instead of a call
+    into NumPy. Each buffer starts small and doubles at every refill, so streams that
+    are rarely used (e.g. the arms of a large bandit) stay small. The integers are only
+    buffered for the last upper bound: a draw with another bound discards the buffer
+    and starts a small one, so a bound that keeps changing (e.g. the number of arms of
+    a changing catalogue) does not keep buffers around.
+
+    Attributes:
+        generator (np.random.Generator): The generator of the stream, for vectorised draws.
+    """
+
+    _INITIAL_BUFFER_SIZE: int = 16
+
+    def __init__(self, seed: Union[int, np.random.SeedSequence] = None,
+                 max_buffer_size: int = 4096) -> None:
+        """
+        Args:
+            seed (Union[int, np.random.SeedSequence]): The seed of the stream. When it is
+                not given, the seed is drawn from the random module, so `random.seed` still
+                makes the runs reproducible.
+            max_buffer_size (int): The maximum number of uniforms generated at once.
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(random.getrandbits(128) if seed is None else seed)
+        self._seed_sequence = seed
+        self._max_buffer_size = max_buffer_size
+        self.generator = np.random.Generator(np.random.PCG64(seed))
+        self._uniforms: List[float] = []
+        self._cursor = 0
+        # buffered integers of the last upper bound and their cursor
+        self._integers: List[int] = []
+        self._integer_cursor = 0
+        self._integer_stop: int = None
+
+    def spawn(self, num_streams: int) -> List['RandomStream']:
+        """
+        Splits the stream into independent child streams.
+
+        Args:
+            num_streams (int): The number of child streams.
+
+        Returns:
+            The child streams. Successive calls return different streams.
+        """
+        return [RandomStream(child, self._max_buffer_size)
+                for child in self._seed_sequence.spawn(num_streams)]
+
+    def _next_buffer_size(self, buffer: List) -> int:
+        return min(self._max_buffer_size, max(self._INITIAL_BUFFER_SIZE, 2 * len(buffer)))
+
+    def random(self) -> float:
+        """Returns a uniform float in [0, 1) taken from the buffer."""
+        cursor = self._cursor
+        if cursor == len(self._uniforms):
+            self._uniforms = self.generator.random(
+                self._next_buffer_size(self._uniforms)).tolist()
+            cursor = 0
+        self._cursor = cursor + 1
+        return self._uniforms[cursor]
+
+    def randrange(self, stop: int) -> int:
+        """Returns a uniform integer in [0, stop) taken from the buffer of that bound."""
+        integers = self._integers
+        cursor = self._integer_cursor
+        if stop != self._integer_stop or cursor == len(integers):
+            previous = integers if stop == self._integer_stop else []
+            integers = self.generator.integers(
+                stop, size=self._next_buffer_size(previous)).tolist()
+            self._integers = integers
+            self._integer_stop = stop
+            cursor = 0
+        self._integer_cursor = cursor + 1
+        return integers[cursor]
+
+    def uniforms(self, size: int) -> np.ndarray:
+        """Returns a block of uniform floats in [0, 1) for vectorised consumers."""
+        return self.generator.random(size)
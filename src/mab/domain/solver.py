@@ -4,10 +4,15 @@ This module contains the abstract base class representing a solver for a multi-a
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
+from mab.domain.action_history import ActionHistory
 from mab.domain.arm import Arm
 
 from mab.domain.bandit import Bandit
+from mab.domain.bandit_state import BatchBanditState
+from mab.domain.random_stream import RandomStream
+from mab.domain.statistics import SolverStatistics
 
 
 class SolverAction(Enum):
@@ -17,10 +22,89 @@ class SolverAction(Enum):
     EXPLORE = "Explore"
     EXPLOIT = "Exploit"
 
+    @property
+    def code(self) -> int:
+        """The compact integer code of the action, used to store it in arrays."""
+        return _ACTION_CODES[self]
+
+    @staticmethod
+    def from_code(code: int) -> 'SolverAction':
+        """Returns the action of a compact integer code, or None for NO_ACTION_CODE."""
+        return None if code == NO_ACTION_CODE else list(SolverAction)[code]
+
+
+# Code used when the solver did not report any action for a decision
+NO_ACTION_CODE: int = -1
+_ACTION_CODES = {action: code for code, action in enumerate(SolverAction)}
+
+
+# Number of scores per block of the partial selection of top_k
+_TOP_K_BLOCK_SIZE: int = 128
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the indices of the k highest scores, highest first, equal scores being
+    ranked by index as np.argmax does.
+
+    The k-th highest score is found with a partial selection instead of a sort. When
+    k is small compared with K, the scores are first split into blocks: the k highest
+    scores lie in the k blocks with the highest maxima, so the partial selection and
+    the search of the selected scores only run over at most 2k blocks, and a slate
+    costs about the same as a single argmax.
+
+    Args:
+        scores (np.ndarray): The score of each arm.
+        k (int): The number of indices.
+
+    Raises:
+        ValueError: If k is not between 1 and the number of scores.
+    """
+    num_scores = len(scores)
+    if not 1 <= k <= num_scores:
+        raise ValueError("The slate size must be between 1 and the number of arms.")
+
+    if num_scores > 4 * k * _TOP_K_BLOCK_SIZE:
+        maxima = np.maximum.reduceat(scores, np.arange(0, num_scores, _TOP_K_BLOCK_SIZE))
+        indices = _get_block_indices(np.argpartition(maxima, len(maxima) - k)[len(maxima) - k:],
+                                     num_scores)
+        threshold = np.partition(scores[indices], len(indices) - k)[len(indices) - k]
+        # The scores above the threshold are in the (less than k) blocks with a higher
+        # maximum, and the first equal scores in them or the first k blocks with an
+        # equal maximum, as each of these blocks has at least one equal score
+        blocks = np.union1d(np.flatnonzero(maxima > threshold),
+                            np.flatnonzero(maxima == threshold)[:k])
+        indices = _get_block_indices(blocks, num_scores)
+    else:
+        threshold = np.partition(scores, num_scores - k)[num_scores - k]
+        indices = np.arange(num_scores)
+
+    candidates = scores[indices]
+    selected = indices[candidates > threshold]
+    ties = indices[candidates == threshold][:k - len(selected)]
+    selected = np.concatenate((selected, ties))
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+def _get_block_indices(blocks: np.ndarray, num_scores: int) -> np.ndarray:
+    """Returns the indices of the scores of the given blocks of top_k."""
+    indices = (blocks[:, np.newaxis] * _TOP_K_BLOCK_SIZE + np.arange(_TOP_K_BLOCK_SIZE)).ravel()
+    return indices[indices < num_scores]
+
 
 class Solver(ABC):
     '''Abstract base class representing a solver for a multi-armed bandit problem'''
 
+    # Whether the solver implements `select_arm_index_lock_free`, so decisions can be
+    # made concurrently with each other and with the updates (see ConcurrentSolver).
+    # Solvers recording their actions or drawing from a RandomStream buffer do not.
+    lock_free_select: bool = False
+
+    # Whether the solver learns from the lifetime statistics of the bandit, so
+    # `sync_state` rebuilds its state from them. The solvers of non-stationary bandits
+    # forget old rewards, which the lifetime statistics cannot tell apart
+    stationary: bool = True
+
     def __init__(self, bandit: Bandit) -> None:
         """ 
         Initializes the solver with a bandit problem.
@@ -29,36 +113,325 @@ class Solver(ABC):
             bandit (Bandit): The multi-armed bandit problem to solve.
         """
         self._bandit = bandit
-        self._action_history: List[Tuple[Arm, SolverAction]] = []
+        self._action_history = ActionHistory()
+        # Number of decisions of each action, kept whatever the history capacity
+        self._action_counts = np.zeros(len(SolverAction), dtype=np.int64)
+        self._last_action: SolverAction = None
+        # Catalogue version of the bandit the state of the solver is up to date with
+        self._catalogue_version: int = bandit.get_state().version
 
     @abstractmethod
-    def select_arm(self) -> int:
+    def select_arm(self) -> Arm:
         """
         Selects an arm from the bandit to pull.
 
         Returns:
-            The index of the selected arm.
+            The selected arm.
         """
 
         raise NotImplementedError("select_arm method must be implemented...")
 
-    def update_solver_history(self, arm: Arm, action: SolverAction) -> None:
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit to pull and returns its index.
+
+        Solvers that compute their decision over arm indices should override this
+        method to skip the arm to index lookup.
+
+        Returns:
+            The index of the selected arm.
+        """
+        return self._bandit.get_arm_index(self.select_arm())
+
+    def select_arm_index_lock_free(self) -> int:
+        """
+        Selects an arm without writing to the state of the solver, so other threads may
+        update it meanwhile under a lock.
+
+        Unlike `select_arm_index`, it does not bring the solver up to date with the arms
+        added to or removed from the bandit: the code changing the arms calls
+        `sync_catalogue` under its lock. Solvers setting `lock_free_select` must
+        implement this method, and replace the arrays the decisions read in a single
+        assignment.
+
+        Returns:
+            The index of the selected arm.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support lock free decisions...")
+
+    def select_arm_streak(self, max_steps: int) -> Tuple[int, int]:
+        """
+        Selects an arm and the number of consecutive steps the solver commits to it.
+
+        The solver commits to an arm for a streak of steps only when it would select that
+        arm at every step of the streak whatever the rewards obtained, so the simulator
+        can pull the arm for the whole streak at once without changing the decisions.
+        The solver must not need `update_state` within a streak, it is only called for
+        streaks of a single step. By default, the solver commits to a single step.
+
+        Args:
+            max_steps (int): The maximum length of the streak.
+
+        Returns:
+            The index of the selected arm and the length of the streak.
+        """
+        return self.select_arm_index(), 1
+
+    def select_slate(self, slate_size: int) -> List[Arm]:
+        """
+        Selects a ranked slate of distinct arms from the bandit.
+
+        Args:
+            slate_size (int): The number of arms of the slate (k).
+
+        Returns:
+            The selected arms, best ranked first.
+        """
+        return [self._bandit.get_arm(index)
+                for index in self.select_slate_indices(slate_size).tolist()]
+
+    def select_slate_indices(self, slate_size: int) -> np.ndarray:
+        """
+        Selects a ranked slate of distinct arms and returns their indices.
+
+        Solvers supporting slates must implement this method with a partial selection
+        over the scores of the arms (see top_k) rather than repeated selections.
+
+        Args:
+            slate_size (int): The number of arms of the slate (k).
+
+        Returns:
+            The indices of the selected arms, best ranked first.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support slates...")
+
+    def select_arms_batch(self, state: BatchBanditState,
+                          rng: np.random.Generator) -> np.ndarray:
+        """
+        Selects one arm for every replication of a batch simulation.
+
+        Solvers supporting the batch engine of the simulator must implement this method
+        using only the statistics of the batch state, vectorised over the replications.
+
+        Args:
+            state (BatchBanditState): The (R, K) statistics of the replications.
+            rng (np.random.Generator): The random generator of the batch simulation.
+
+        Returns:
+            An array with the index of the selected arm for each replication.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support batch simulations...")
+
+    def update_state(self, arm: Arm, reward: float) -> None:
+        """
+        Updates the internal state of the solver after pulling an arm.
+
+        Solvers that only read the statistics stored in the bandit do not need to
+        override this method.
+
+        Args:
+            arm (Arm): The arm that was pulled.
+            reward (float): The reward obtained from pulling the arm.
+        """
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """
+        Sets the random stream the solver draws its decisions from.
+
+        Deterministic solvers do not need to override this method.
+
+        Args:
+            random_stream (RandomStream): The random stream of the solver.
+        """
+
+    def sync_state(self) -> None:
+        """
+        Rebuilds the internal state of the solver from the statistics of the bandit.
+
+        Called after the statistics of the bandit were replaced at once, for instance
+        by the statistics learned by other workers. Solvers that only read the
+        statistics stored in the bandit do not need to override this method.
+        """
+
+    def sync_catalogue(self) -> None:
+        """
+        Brings the state the solver keeps for each arm up to date with the arms added
+        to and removed from the bandit, resetting the slots given to new arms.
+
+        The solvers call it lazily, whenever the arms of the bandit changed since their
+        last decision or update. Code changing the arms while other threads make lock
+        free decisions calls it under its lock, since `select_arm_index_lock_free` never
+        does.
+        Solvers that only read the statistics stored in the bandit do not need to
+        override this method.
+        """
+
+    def get_statistics(self) -> SolverStatistics:
+        """
+        Returns a copy of the statistics learned by the solver.
+
+        The statistics can be serialised and merged with the statistics learned by
+        other solvers of the same arms.
+        """
+        return SolverStatistics.from_state(self._bandit.get_state())
+
+    def load_statistics(self, statistics: SolverStatistics) -> None:
+        """
+        Replaces the statistics of the bandit and rebuilds the state of the solver.
+
+        The cumulative reward of each arm is set to its mean reward, which is the
+        convention of the BernoulliArm and what the solvers read.
+
+        Args:
+            statistics (SolverStatistics): The statistics to load, e.g. merged ones.
+
+        Raises:
+            ValueError: If the statistics do not have one value for each slot of the bandit.
+        """
+        if len(statistics) != self._bandit.get_slots_number():
+            raise ValueError("The statistics must have one value for each slot of the bandit.")
+
+        self._bandit.get_state().set_statistics(
+            statistics.pull_counts, statistics.means,
+            statistics.reward_sums, statistics.squared_reward_sums)
+        self.sync_state()
+
+    def update_solver_history(self, arm: Arm, action: SolverAction, repeats: int = 1) -> None:
         """
         Updates the solver's history with the arm, action, and reward.
 
         Args:
             arm (Arm): The arm that was pulled.
             action (SolverAction): The action that was taken.
+            repeats (int): The number of consecutive steps with this arm and action.
+        """
+        self.update_solver_history_by_index(self._bandit.get_arm_index(arm), action, repeats)
+
+    def update_solver_history_by_index(self, arm_index: int, action: SolverAction,
+                                       repeats: int = 1) -> None:
+        """
+        Updates the solver's history with the index of the selected arm and the action.
+
+        Args:
+            arm_index (int): The index of the selected arm.
+            action (SolverAction): The action that was taken.
+            repeats (int): The number of consecutive steps with this arm and action.
         """
+        code = action.code
+        self._action_counts[code] += repeats
+        self._action_history.append(arm_index, code, repeats,
+                                    int(self._bandit.get_state().generations[arm_index]))
+        self._last_action = action
 
-        self._action_history.append((arm, action))
+    def update_solver_history_many(self, arm_indices: np.ndarray,
+                                   action_codes: np.ndarray) -> None:
+        """
+        Updates the solver's history with the decisions of several steps at once.
+
+        Args:
+            arm_indices (np.ndarray): The index of the arm selected at each step.
+            action_codes (np.ndarray): The code of the action of each step (see
+                SolverAction.code). The steps with NO_ACTION_CODE are not recorded.
+        """
+        reported = action_codes != NO_ACTION_CODE
+        if not reported.any():
+            return
+
+        action_codes = action_codes[reported]
+        arm_indices = arm_indices[reported]
+        self._action_counts += np.bincount(action_codes, minlength=len(self._action_counts))
+        self._action_history.extend(arm_indices, action_codes,
+                                    self._bandit.get_state().generations[arm_indices])
+        self._last_action = SolverAction.from_code(int(action_codes[-1]))
 
     def get_action_history(self) -> List[Tuple[Arm, SolverAction]]:
         """
-        Returns the solver's history.
+        Returns the solver's history, decoded from its compact encoding on demand.
+
+        The arms are looked up by the index they had when they were selected, and only
+        while the generation of their slot is the same (see BanditState.generations):
+        the decisions of an arm removed since then have None as their arm, and are never
+        given to the next arm taking its slot.
 
         Returns:
-            The solver's history.
+            The solver's history, oldest decision first. With a history capacity, only
+            the most recent decisions are returned.
         """
+        slots = self._bandit.get_slots()
+        generations = self._bandit.get_state().generations.tolist()
+        actions = list(SolverAction)
+        return [(slots[arm_index] if generations[arm_index] == generation else None,
+                 actions[code])
+                for arm_index, code, generation in zip(
+                    self._action_history.arm_indices.tolist(),
+                    self._action_history.action_codes.tolist(),
+                    self._action_history.generations.tolist())]
 
+    def get_encoded_action_history(self) -> ActionHistory:
+        """
+        Returns the solver's history as arm indices and action codes (see SolverAction.code).
+        """
         return self._action_history
+
+    def set_history_capacity(self, capacity: Optional[int]) -> None:
+        """
+        Bounds the number of decisions kept in the solver's history.
+
+        The action counts are not affected, they always count every decision.
+
+        Args:
+            capacity (Optional[int]): The maximum number of decisions kept. None keeps
+                every decision and 0 disables the history.
+        """
+        history = ActionHistory(capacity)
+        history.extend(self._action_history.arm_indices, self._action_history.action_codes,
+                       self._action_history.generations)
+        self._action_history = history
+
+    def get_action_counts(self) -> np.ndarray:
+        """
+        Returns:
+            The number of decisions of each action, indexed by SolverAction.code.
+        """
+        return self._action_counts.copy()
+
+    def _get_added_slots(self) -> Optional[np.ndarray]:
+        """
+        Returns the slots given to new arms since the last call, so solvers keeping a
+        state per arm can resize it and reset the recycled slots.
+
+        Returns:
+            The indices of the slots, or None when the arms of the bandit did not
+            change, which is checked in O(1).
+        """
+        state = self._bandit.get_state()
+        if state.version == self._catalogue_version:
+            return None
+        added_slots = state.get_added_slots(self._catalogue_version)
+        self._catalogue_version = state.version
+        return added_slots
+
+    def _mask_free_slots(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Returns the scores of the arms, indexed by arm index along the last axis, with
+        -inf for the free slots of the bandit so they are never selected.
+        """
+        state = self._bandit.get_state()
+        if state.num_free == 0:
+            return scores
+        # The bandit may have grown since the scores were computed
+        return np.where(state.active[:scores.shape[-1]], scores, -np.inf)
+
+    def pop_last_action(self) -> SolverAction:
+        """
+        Returns the action of the last decision and forgets it, so a decision for
+        which the solver reports no action is not mistaken for the previous one.
+
+        Returns:
+            The action of the last decision, or None if no action was reported.
+        """
+        last_action, self._last_action = self._last_action, None
+        return last_action
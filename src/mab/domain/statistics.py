@@ -0,0 +1,122 @@
+'''
+Module: statistics.py
+Mergeable sufficient statistics of the arms of a bandit.
+'''
+from functools import reduce
+from typing import Any, Dict, Iterable, Tuple
+import numpy as np
+
+from mab.domain.bandit_state import BanditState
+
+
+class SolverStatistics:
+    """
+    Class holding the sufficient statistics learned about each arm of a bandit.
+
+    The statistics are the number of pulls, the sum of the rewards and the sum of the
+    squared rewards of each arm. They are plain sums, so two statistics learned from
+    disjoint rewards (by sharded workers or by chunks of a simulation) are combined
+    with `merge`, which is associative and commutative. The means, the variances and
+    the Beta posteriors are derived from them on demand, so the priors of the solvers
+    are never counted twice when merging.
+
+    Attributes:
+        pull_counts (np.ndarray): The number of pulls of each arm.
+        reward_sums (np.ndarray): The sum of the rewards of each arm.
+        squared_reward_sums (np.ndarray): The sum of the squared rewards of each arm.
+    """
+
+    def __init__(self, pull_counts: np.ndarray, reward_sums: np.ndarray,
+                 squared_reward_sums: np.ndarray) -> None:
+        self.pull_counts = np.array(pull_counts, dtype=np.int64)
+        self.reward_sums = np.array(reward_sums, dtype=np.float64)
+        self.squared_reward_sums = np.array(squared_reward_sums, dtype=np.float64)
+        if not len(self.pull_counts) == len(self.reward_sums) == len(self.squared_reward_sums):
+            raise ValueError("The statistics must have one value for each arm.")
+
+    @classmethod
+    def zeros(cls, num_arms: int) -> 'SolverStatistics':
+        """Returns the statistics of a bandit whose arms were never pulled."""
+        return cls(np.zeros(num_arms), np.zeros(num_arms), np.zeros(num_arms))
+
+    @classmethod
+    def from_state(cls, state: BanditState) -> 'SolverStatistics':
+        """Returns a copy of the statistics stored in a bandit state."""
+        return cls(state.pull_counts, state.reward_sums, state.squared_reward_sums)
+
+    @classmethod
+    def merge_all(cls, statistics: Iterable['SolverStatistics']) -> 'SolverStatistics':
+        """
+        Reduces several statistics into one.
+
+        Raises:
+            ValueError: If no statistics are given.
+        """
+        statistics = list(statistics)
+        if not statistics:
+            raise ValueError("At least one statistics object is needed to merge.")
+        return reduce(cls.merge, statistics)
+
+    def __len__(self) -> int:
+        return len(self.pull_counts)
+
+    @property
+    def means(self) -> np.ndarray:
+        """The mean reward of each arm, 0 for the arms never pulled."""
+        return self.reward_sums / np.maximum(1, self.pull_counts)
+
+    @property
+    def variances(self) -> np.ndarray:
+        """The (biased) variance of the rewards of each arm, 0 for the arms never pulled."""
+        second_moments = self.squared_reward_sums / np.maximum(1, self.pull_counts)
+        return np.maximum(0.0, second_moments - self.means ** 2)
+
+    def merge(self, other: 'SolverStatistics') -> 'SolverStatistics':
+        """
+        Combines the statistics with the statistics learned from other rewards.
+
+        Args:
+            other (SolverStatistics): The statistics of the same arms learned from
+                disjoint rewards.
+
+        Returns:
+            The statistics of the union of the rewards.
+
+        Raises:
+            ValueError: If the statistics do not have the same number of arms.
+        """
+        if len(self) != len(other):
+            raise ValueError("Only the statistics of the same arms can be merged.")
+        return SolverStatistics(self.pull_counts + other.pull_counts,
+                                self.reward_sums + other.reward_sums,
+                                self.squared_reward_sums + other.squared_reward_sums)
+
+    def get_beta_parameters(self, init_a: float = 1,
+                            init_b: float = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the parameters of the Beta posterior of each arm for rewards in [0, 1].
+
+        Args:
+            init_a (float): The alpha parameter of the Beta prior.
+            init_b (float): The beta parameter of the Beta prior.
+        """
+        return (init_a + self.reward_sums,
+                init_b + self.pull_counts - self.reward_sums)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON serialisable representation of the statistics."""
+        return {"pull_counts": self.pull_counts.tolist(),
+                "reward_sums": self.reward_sums.tolist(),
+                "squared_reward_sums": self.squared_reward_sums.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SolverStatistics':
+        """Creates the statistics from their representation returned by `to_dict`."""
+        return cls(data["pull_counts"], data["reward_sums"], data["squared_reward_sums"])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SolverStatistics):
+            return NotImplemented
+        return (np.array_equal(self.pull_counts, other.pull_counts)
+                and np.array_equal(self.reward_sums, other.reward_sums)
+                and np.array_equal(self.squared_reward_sums, other.squared_reward_sums))
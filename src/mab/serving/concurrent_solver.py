@@ -0,0 +1,146 @@
+"""
+Module for sharing a solver between several threads.
+
+The solvers and the arms update their statistics without any synchronisation, so
+reporting rewards from several threads at once would lose updates. `ConcurrentSolver`
+makes each thread accumulate its rewards locally and merges the accumulators into the
+bandit and the solver under a lock. The decisions of the solvers that only read their
+state are made without taking the lock.
+"""
+from collections import deque
+import threading
+from typing import Deque, List, Tuple
+
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import Solver
+
+
+class ConcurrentSolver:
+    """
+    Class wrapping a solver so several threads can select arms and report rewards.
+
+    Each thread buffers its rewards in its own accumulator, which is merged once it
+    holds `merge_every` rewards, so the lock is taken once every `merge_every` rewards
+    instead of once per reward. Decisions are made under the lock too, since most
+    solvers record their actions and advance their random stream when selecting, except
+    for the solvers that can decide without writing to their state (see
+    `Solver.lock_free_select`). Either way, they may miss up to `merge_every - 1`
+    rewards of each thread. The lock free ones may also miss the merge or the arm
+    change in progress. `flush` merges every accumulator.
+
+    The accumulators are kept for the lifetime of the wrapper, so it is meant to be
+    used from a fixed pool of threads. Arms are added and removed through the wrapper
+    (see `add_arm`) while the threads keep deciding.
+    """
+
+    def __init__(self, solver: Solver, bandit: Bandit, merge_every: int = 64) -> None:
+        """
+        Args:
+            solver (Solver): The solver shared by the threads.
+            bandit (Bandit): The bandit of the solver, holding the statistics of the arms.
+            merge_every (int): The number of rewards a thread accumulates before merging.
+        """
+        self._solver = solver
+        self._bandit = bandit
+        self._merge_every = merge_every
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._accumulators: List[Deque[Tuple[Arm, float]]] = []
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm with the solver.
+
+        Returns:
+            The index of the selected arm.
+        """
+        if self._solver.lock_free_select:
+            return self._solver.select_arm_index_lock_free()
+        with self._lock:
+            return self._solver.select_arm_index()
+
+    def select_arm(self) -> Arm:
+        """
+        Selects an arm with the solver.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def report_reward(self, arm: Arm, reward: float) -> None:
+        """
+        Accumulates the reward of an arm in the accumulator of the calling thread.
+
+        The reward is dropped when it is merged if the arm was removed meanwhile, even
+        if a new arm took its slot.
+
+        Args:
+            arm (Arm): The arm that obtained the reward.
+            reward (float): The observed reward.
+        """
+        accumulator = self._get_accumulator()
+        accumulator.append((arm, reward))
+        if len(accumulator) >= self._merge_every:
+            with self._lock:
+                self._merge(accumulator)
+
+    def add_arm(self, arm: Arm) -> int:
+        """
+        Adds an arm to the bandit and brings the solver up to date under the lock, so
+        the lock free decisions do not have to.
+
+        Args:
+            arm (Arm): The arm to be added.
+
+        Returns:
+            The index of the arm in the bandit.
+        """
+        with self._lock:
+            arm_index = self._bandit.add_arm(arm)
+            self._solver.sync_catalogue()
+        return arm_index
+
+    def remove_arm(self, arm: Arm) -> None:
+        """
+        Removes an arm from the bandit once the accumulated rewards are merged. The
+        rewards reported for the arm after its removal are dropped.
+
+        Args:
+            arm (Arm): The arm to be removed.
+        """
+        with self._lock:
+            for accumulator in self._accumulators:
+                self._merge(accumulator)
+            self._bandit.remove_arm(arm)
+            self._solver.sync_catalogue()
+
+    def flush(self) -> None:
+        """Merges the accumulators of every thread into the bandit and the solver."""
+        with self._lock:
+            for accumulator in self._accumulators:
+                self._merge(accumulator)
+
+    def get_pending_count(self) -> int:
+        """Returns the number of accumulated rewards that have not been merged yet."""
+        return sum(len(accumulator) for accumulator in self._accumulators)
+
+    def _get_accumulator(self) -> Deque[Tuple[Arm, float]]:
+        accumulator = getattr(self._local, "accumulator", None)
+        if accumulator is None:
+            accumulator = deque()
+            self._local.accumulator = accumulator
+            with self._lock:
+                self._accumulators.append(accumulator)
+        return accumulator
+
+    def _merge(self, accumulator: Deque[Tuple[Arm, float]]) -> None:
+        # The owner thread may append while merging, only the rewards present are taken
+        for _ in range(len(accumulator)):
+            arm, reward = accumulator.popleft()
+            if not self._bandit.has_arm(arm):
+                # The arm was removed after the reward was reported
+                continue
+            self._bandit.record_reward_by_index(self._bandit.get_arm_index(arm), reward)
+            self._solver.update_state(arm, reward)
@@ -0,0 +1,173 @@
+"""
+Module for serving the decisions of a solver to a live system.
+
+In a live system the reward of a decision (a click, a conversion) arrives long after
+the decision and in any order. The `DecisionService` decouples both: decisions are
+handed out immediately with an id, rewards are reported later with that id, and a
+background asyncio task applies the buffered rewards to the bandit and the solver in
+batches, so reporting a reward never blocks the decisions.
+"""
+import asyncio
+from itertools import count
+from typing import Dict, List, NamedTuple, Tuple
+
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import Solver, SolverAction
+
+
+class Decision(NamedTuple):
+    """A decision handed out by the service."""
+    decision_id: int
+    arm_index: int
+    action: SolverAction
+
+
+class DecisionService:
+    """
+    Class serving the decisions of a solver with delayed reward feedback.
+
+    The service keeps the arm of every decision waiting for its reward. That memory is
+    bounded: when `max_pending` decisions are pending, the oldest one expires and its
+    reward, if it ever arrives, is ignored. Rewards of expired or unknown decisions are
+    counted in `num_unknown`.
+
+    All the methods must be called from the thread running the event loop of the
+    service, so the solver state is only modified between two decisions. Arms can be
+    added to and removed from the bandit between two decisions; the rewards of the
+    pending decisions of a removed arm are ignored, even if its slot was recycled.
+
+    Attributes:
+        num_decisions (int): The number of decisions handed out.
+        num_applied (int): The number of rewards applied to the solver.
+        num_expired (int): The number of decisions evicted before their reward arrived.
+        num_unknown (int): The number of rewards ignored because their decision was
+            unknown, expired or already rewarded.
+    """
+
+    def __init__(self, solver: Solver, bandit: Bandit, max_pending: int = 100_000,
+                 batch_size: int = 1024, flush_interval: float = 0.01) -> None:
+        """
+        Args:
+            solver (Solver): The solver making the decisions.
+            bandit (Bandit): The bandit of the solver, holding the statistics of the arms.
+            max_pending (int): The maximum number of decisions waiting for their reward,
+                which is also the maximum number of buffered rewards.
+            batch_size (int): The number of buffered rewards that wakes up the
+                background task before its flush interval.
+            flush_interval (float): The maximum delay, in seconds, before a reported
+                reward is applied while the service is running.
+        """
+        self._solver = solver
+        self._bandit = bandit
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        self._decision_ids = count()
+        # arm of the decisions waiting for their reward, oldest first
+        self._pending: Dict[int, Arm] = {}
+        self._rewards: List[Tuple[int, float]] = []
+        self._rewards_ready: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+        self.num_decisions = 0
+        self.num_applied = 0
+        self.num_expired = 0
+        self.num_unknown = 0
+
+    def decide(self) -> Decision:
+        """
+        Selects an arm with the solver and registers the decision as pending.
+
+        Returns:
+            The decision, whose id must be used to report its reward.
+        """
+        arm_index = self._solver.select_arm_index()
+        action = self._solver.pop_last_action()
+        decision_id = next(self._decision_ids)
+
+        if len(self._pending) >= self._max_pending:
+            del self._pending[next(iter(self._pending))]
+            self.num_expired += 1
+        self._pending[decision_id] = self._bandit.get_arm(arm_index)
+        self.num_decisions += 1
+        return Decision(decision_id, arm_index, action)
+
+    def report_reward(self, decision_id: int, reward: float) -> None:
+        """
+        Buffers the reward of a decision. It is applied by the next batch.
+
+        Args:
+            decision_id (int): The id of the rewarded decision.
+            reward (float): The observed reward.
+        """
+        self._rewards.append((decision_id, reward))
+        if len(self._rewards) >= self._max_pending:
+            self.apply_rewards()
+        elif len(self._rewards) >= self._batch_size and self._rewards_ready is not None:
+            self._rewards_ready.set()
+
+    def apply_rewards(self) -> int:
+        """
+        Applies the buffered rewards to the bandit and the solver.
+
+        Returns:
+            The number of rewards applied.
+        """
+        rewards, self._rewards = self._rewards, []
+        applied = 0
+        for decision_id, reward in rewards:
+            arm = self._pending.pop(decision_id, None)
+            if arm is None or not self._bandit.has_arm(arm):
+                continue
+            self._bandit.record_reward_by_index(self._bandit.get_arm_index(arm), reward)
+            self._solver.update_state(arm, reward)
+            applied += 1
+
+        self.num_applied += applied
+        self.num_unknown += len(rewards) - applied
+        return applied
+
+    def get_pending_count(self) -> int:
+        """Returns the number of decisions waiting for their reward."""
+        return len(self._pending)
+
+    def is_running(self) -> bool:
+        """Returns whether the background task applying the rewards is running."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Starts the background task applying the rewards in the running event loop."""
+        if self._task is None:
+            self._rewards_ready = asyncio.Event()
+            self._task = asyncio.create_task(self._apply_periodically())
+
+    async def stop(self) -> None:
+        """Stops the background task and applies the remaining rewards."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self._rewards_ready = None
+        self.apply_rewards()
+
+    async def _apply_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._rewards_ready.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._rewards_ready.clear()
+            if self._rewards:
+                self.apply_rewards()
+
+    async def __aenter__(self) -> 'DecisionService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
@@ -0,0 +1,213 @@
+"""
+Module for sharing the statistics of a bandit between worker processes.
+
+The statistics live in a `multiprocessing.shared_memory` block mapped by every
+process. Each worker owns a row of the block where it publishes the totals of the
+rewards it observed, so there is a single writer per row and no cross-process lock.
+The global statistics are the sums of the rows.
+"""
+from multiprocessing import shared_memory
+from typing import Tuple
+import numpy as np
+
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import Solver
+
+# num_workers, num_arms
+_HEADER_SIZE: int = 2 * np.dtype(np.int64).itemsize
+
+
+class SharedBanditState:
+    """
+    Class holding the pull counts, reward sums and squared reward sums published by
+    every worker.
+
+    The block stores a (workers, arms) matrix of each of them. A worker only writes
+    its own row, and every 8 bytes value is written at once, so a reader sees each
+    value either before or after an update. A reader may see a row in the middle of a
+    publication (the new pull counts with the old sums), which only makes its view
+    stale by that publication.
+
+    The worker processes should be started from the process creating the block (e.g.
+    forked by the master of the web tier), so they share its resource tracker and the
+    block is only destroyed when the creator unlinks it.
+    """
+
+    def __init__(self, num_arms: int = None, num_workers: int = None,
+                 name: str = None) -> None:
+        """
+        Creates a new shared block, or attaches to an existing one when a name is given.
+
+        Args:
+            num_arms (int): The number of arms of the bandit, to create a block.
+            num_workers (int): The number of workers sharing the block, to create a block.
+            name (str): The name of an existing block to attach to.
+        """
+        if name is None:
+            size = _HEADER_SIZE + 3 * num_workers * num_arms * np.dtype(np.float64).itemsize
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+            np.ndarray(2, dtype=np.int64, buffer=self._memory.buf)[:] = num_workers, num_arms
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            num_workers, num_arms = np.ndarray(2, dtype=np.int64, buffer=self._memory.buf)
+
+        self.num_workers = int(num_workers)
+        self.num_arms = int(num_arms)
+        shape = (self.num_workers, self.num_arms)
+        matrix_size = self.num_workers * self.num_arms * np.dtype(np.float64).itemsize
+        self._pull_counts = np.ndarray(shape, dtype=np.int64, buffer=self._memory.buf,
+                                       offset=_HEADER_SIZE)
+        self._reward_sums = np.ndarray(shape, dtype=np.float64, buffer=self._memory.buf,
+                                       offset=_HEADER_SIZE + matrix_size)
+        self._squared_reward_sums = np.ndarray(shape, dtype=np.float64,
+                                               buffer=self._memory.buf,
+                                               offset=_HEADER_SIZE + 2 * matrix_size)
+
+    @property
+    def name(self) -> str:
+        """The name other processes use to attach to the block."""
+        return self._memory.name
+
+    def publish(self, worker: int, pull_counts: np.ndarray, reward_sums: np.ndarray,
+                squared_reward_sums: np.ndarray) -> None:
+        """
+        Publishes the totals of the rewards observed by a worker.
+
+        Args:
+            worker (int): The index of the worker, which owns the row it writes.
+            pull_counts (np.ndarray): The number of rewards of each arm observed by the worker.
+            reward_sums (np.ndarray): The sum of the rewards of each arm observed by the worker.
+            squared_reward_sums (np.ndarray): The sum of the squared rewards of each arm
+                observed by the worker.
+        """
+        # The pull counts are written before and read after the sums, so a torn read
+        # never sees more reward than pulls
+        self._pull_counts[worker] = pull_counts
+        self._reward_sums[worker] = reward_sums
+        self._squared_reward_sums[worker] = squared_reward_sums
+
+    def get_totals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            The pull counts, the reward sums and the squared reward sums of each arm
+            over all the workers.
+        """
+        squared_reward_sums = self._squared_reward_sums.sum(axis=0)
+        reward_sums = self._reward_sums.sum(axis=0)
+        return self._pull_counts.sum(axis=0), reward_sums, squared_reward_sums
+
+    def close(self) -> None:
+        """Unmaps the block from the current process."""
+        self._pull_counts = self._reward_sums = self._squared_reward_sums = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Destroys the block. Only the process that created it should call it."""
+        self._memory.unlink()
+
+    def __enter__(self) -> 'SharedBanditState':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedSolverWorker:
+    """
+    Class making the solver of a worker process learn from the rewards of every worker.
+
+    The rewards observed by the worker are applied to its local bandit and solver at
+    once, and published to the shared state every `sync_every` rewards. Each
+    synchronisation also replaces the local statistics with the global ones.
+
+    Staleness bound: after a synchronisation, the view of a worker misses at most
+    `sync_every - 1` unpublished rewards of each other worker. Until the next one, it
+    also misses what the other workers publish meanwhile, which is bounded by the
+    time the worker takes to observe `sync_every` rewards; call `sync` periodically to
+    bound it in time as well.
+
+    The local cumulative reward of each arm is set to its mean reward, which is the
+    convention of the BernoulliArm and what the solvers read.
+
+    The state of the solver is rebuilt from the global statistics at each
+    synchronisation (see `Solver.sync_state`), except for the non-stationary solvers
+    (see `Solver.stationary`): their state forgets old rewards, so it cannot be rebuilt
+    from the lifetime statistics, and they only learn from the rewards of the worker.
+    """
+
+    def __init__(self, bandit: Bandit, solver: Solver, shared_state: SharedBanditState,
+                 worker: int, sync_every: int = 100) -> None:
+        """
+        Args:
+            bandit (Bandit): The local bandit of the worker.
+            solver (Solver): The local solver of the worker.
+            shared_state (SharedBanditState): The state shared by the workers.
+            worker (int): The index of the worker, between 0 and the number of workers.
+            sync_every (int): The number of rewards between two synchronisations.
+        """
+        if not 0 <= worker < shared_state.num_workers:
+            raise ValueError("The worker index is out of the shared state.")
+        if shared_state.num_arms != bandit.get_slots_number():
+            raise ValueError("The shared state and the bandit have different arms.")
+
+        self._bandit = bandit
+        self._solver = solver
+        self._shared_state = shared_state
+        self._worker = worker
+        self._sync_every = sync_every
+        self._pull_counts = np.zeros(shared_state.num_arms, dtype=np.int64)
+        self._reward_sums = np.zeros(shared_state.num_arms, dtype=np.float64)
+        self._squared_reward_sums = np.zeros(shared_state.num_arms, dtype=np.float64)
+        self._unsynced = 0
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm with the local solver.
+
+        Returns:
+            The index of the selected arm.
+        """
+        return self._solver.select_arm_index()
+
+    def select_arm(self) -> Arm:
+        """
+        Selects an arm with the local solver.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self._solver.select_arm_index())
+
+    def report_reward(self, arm: Arm, reward: float) -> None:
+        """
+        Applies a reward observed by the worker and synchronises when it is due. The
+        reward is dropped if the arm was removed from the local bandit meanwhile.
+
+        Args:
+            arm (Arm): The arm that obtained the reward.
+            reward (float): The observed reward.
+        """
+        if not self._bandit.has_arm(arm):
+            return
+        arm_index = self._bandit.get_arm_index(arm)
+        self._bandit.record_reward_by_index(arm_index, reward)
+        self._solver.update_state(arm, reward)
+        self._pull_counts[arm_index] += 1
+        self._reward_sums[arm_index] += reward
+        self._squared_reward_sums[arm_index] += reward * reward
+        self._unsynced += 1
+        if self._unsynced >= self._sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Publishes the rewards of the worker and loads the statistics of every worker."""
+        self._shared_state.publish(self._worker, self._pull_counts, self._reward_sums,
+                                   self._squared_reward_sums)
+        pull_counts, reward_sums, squared_reward_sums = self._shared_state.get_totals()
+        means = reward_sums / np.maximum(1, pull_counts)
+        self._bandit.get_state().set_statistics(pull_counts, means, reward_sums,
+                                                squared_reward_sums)
+        if self._solver.stationary:
+            self._solver.sync_state()
+        self._unsynced = 0
@@ -0,0 +1,107 @@
+"""Module for running R independent replications of a simulation in lockstep."""
+from typing import Tuple
+import numpy as np
+
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.bandit_state import BatchBanditState
+from mab.domain.solver import NO_ACTION_CODE, Solver
+from mab.simulator.trace import TraceWriter
+
+
+class BatchSimulationResults:
+    """Helper class to store the results of a batch simulation."""
+
+    def __init__(self, num_iterations: int, replications: int, num_arms: int):
+        # The mean reward across the replications for each iteration
+        self.rewards = np.zeros(num_iterations)
+        # The mean pseudo-regret across the replications for each iteration
+        self.regrets = np.zeros(num_iterations)
+        # The total reward and pseudo-regret of each replication
+        self.total_rewards = np.zeros(replications)
+        self.total_regrets = np.zeros(replications)
+        # The number of pulls and the estimated mean reward of each arm for each replication
+        self.pull_counts = np.zeros((replications, num_arms), dtype=np.int64)
+        self.cummulatives = np.zeros((replications, num_arms))
+
+    def get_usage_fractions(self) -> np.ndarray:
+        """Returns the mean fraction of times each arm was selected."""
+        totals = np.maximum(1, self.pull_counts.sum(axis=1, keepdims=True))
+        return (self.pull_counts / totals).mean(axis=0)
+
+    def get_total_reward_interval(self, z_score: float = 1.96) -> Tuple[float, float]:
+        """Returns the normal confidence interval of the mean total reward."""
+        return self._confidence_interval(self.total_rewards, z_score)
+
+    def get_total_regret_interval(self, z_score: float = 1.96) -> Tuple[float, float]:
+        """Returns the normal confidence interval of the mean total pseudo-regret."""
+        return self._confidence_interval(self.total_regrets, z_score)
+
+    @staticmethod
+    def _confidence_interval(values: np.ndarray, z_score: float) -> Tuple[float, float]:
+        mean = values.mean()
+        if len(values) < 2:
+            return float(mean), float(mean)
+        half_width = z_score * values.std(ddof=1) / np.sqrt(len(values))
+        return float(mean - half_width), float(mean + half_width)
+
+
+def get_success_probabilities(bandit: Bandit) -> np.ndarray:
+    """
+    Returns the success probability of every arm of a Bernoulli bandit.
+
+    Raises:
+        ValueError: If the bandit has free slots or any arm of the bandit is not a
+            stationary BernoulliArm.
+    """
+    if bandit.get_state().num_free:
+        raise ValueError("Batch simulations require a bandit without free slots, "
+                         "the replications index the arms by slot.")
+    arms = bandit.get_arms()
+    if not all(isinstance(arm, BernoulliArm) and arm.stationary for arm in arms):
+        raise ValueError("Batch simulations require a bandit of stationary BernoulliArm arms.")
+    return np.array([arm.success_probability for arm in arms], dtype=np.float64)
+
+
+def run_batch(bandit: Bandit, solver: Solver, num_iterations: int,
+              replications: int, rng: np.random.Generator,
+              trace: TraceWriter = None) -> BatchSimulationResults:
+    """
+    Runs R independent replications of a solver over a Bernoulli bandit in lockstep.
+
+    The replications start from scratch and never touch the state of the bandit, so
+    the bandit only provides the success probabilities of its arms.
+
+    Args:
+        bandit (Bandit): The Bernoulli bandit to simulate.
+        solver (Solver): The solver, which must implement `select_arms_batch`.
+        num_iterations (int): The number of steps of each replication.
+        replications (int): The number of independent replications (R).
+        rng (np.random.Generator): The random generator used for every draw.
+        trace (TraceWriter): Optional trace writer receiving the R records of every step.
+
+    Returns:
+        The results aggregated over the replications.
+    """
+    probabilities = get_success_probabilities(bandit)
+    best_probability = probabilities.max()
+    state = BatchBanditState(replications, len(probabilities))
+    results = BatchSimulationResults(num_iterations, replications, len(probabilities))
+    replication_indices = np.arange(replications)
+
+    for step in range(num_iterations):
+        selected_arms = solver.select_arms_batch(state, rng)
+        selected_probabilities = probabilities[selected_arms]
+        rewards = rng.random(replications) <= selected_probabilities
+        state.record(selected_arms, rewards)
+        if trace is not None:
+            trace.write_many(replication_indices, step, selected_arms, rewards, NO_ACTION_CODE)
+
+        results.rewards[step] = rewards.mean()
+        results.regrets[step] = best_probability - selected_probabilities.mean()
+        results.total_regrets += best_probability - selected_probabilities
+
+    results.pull_counts = state.pull_counts
+    results.total_rewards = state.reward_sums.sum(axis=1)
+    results.cummulatives = state.means
+    return results
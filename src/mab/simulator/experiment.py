@@ -0,0 +1,136 @@
+"""Module for running grids of simulations in parallel worker processes."""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Type
+import numpy as np
+
+from mab.domain.bandit import Bandit
+from mab.domain.solver import Solver
+from mab.simulator.simulator import SimulationResults, Simulator
+
+
+class SolverConfig:
+    """Helper class describing how to build a solver for a bandit."""
+
+    def __init__(self, solver_class: Type[Solver], **parameters: Any):
+        self.solver_class = solver_class
+        self.parameters = parameters
+
+    @classmethod
+    def sweep(cls, solver_class: Type[Solver], parameter: str,
+              values: List[Any], **parameters: Any) -> List['SolverConfig']:
+        """
+        Creates one configuration for each value of a hyperparameter.
+
+        Args:
+            solver_class (Type[Solver]): The class of the solver.
+            parameter (str): The name of the hyperparameter to sweep.
+            values (List[Any]): The values of the hyperparameter.
+            parameters: The fixed parameters shared by all the configurations.
+        """
+        return [cls(solver_class, **parameters, **{parameter: value}) for value in values]
+
+    def build(self, bandit: Bandit) -> Solver:
+        """Creates a new solver for the given bandit."""
+        return self.solver_class(bandit, **self.parameters)
+
+    def __str__(self) -> str:
+        parameters = ", ".join(f"{name}={value}" for name, value in self.parameters.items())
+        return f"{self.solver_class.__name__}({parameters})"
+
+
+class ExperimentCell(NamedTuple):
+    """A cell of the experiment grid: one bandit config, one solver config and one seed."""
+    bandit_index: int
+    solver_index: int
+    seed: int
+
+
+def get_cell_seed(cell: ExperimentCell) -> int:
+    """
+    Derives the seed of a cell from its coordinates in the grid.
+
+    The seed only depends on the cell, so the results do not depend on the number of
+    workers nor on the order in which the cells are executed.
+    """
+    sequence = np.random.SeedSequence(
+        cell.seed, spawn_key=(cell.bandit_index, cell.solver_index))
+    return int(sequence.generate_state(1)[0])
+
+
+def run_cell(bandit: Bandit, solver_config: SolverConfig,
+             cell_seed: int, num_iterations: int) -> SimulationResults:
+    """
+    Runs the simulation of a single cell on a fresh clone of the bandit.
+
+    Args:
+        bandit (Bandit): The bandit of the cell. It is cloned, so it is never modified.
+        solver_config (SolverConfig): The configuration of the solver of the cell.
+        cell_seed (int): The seed of the random generators of the cell.
+        num_iterations (int): The number of iterations of the simulation.
+
+    Returns:
+        The results of the simulation.
+    """
+    # The solver and the arms get random streams spawned from the seed of the cell, so
+    # the random module of the calling process is left alone
+    cloned_bandit = bandit.__clone__()
+    cloned_bandit.reset()
+    solver = solver_config.build(cloned_bandit)
+    simulator = Simulator(cloned_bandit, [solver], seed=cell_seed)
+    simulator.run(num_iterations)
+    return simulator.get_results(solver)
+
+
+class ExperimentGrid:
+    """
+    Class running every (bandit config x solver config x seed) cell of an experiment.
+
+    The cells are fanned out to a pool of worker processes. Each cell runs on its own
+    clone of the bandit with a seed derived from its coordinates, so the results are
+    deterministic regardless of the number of workers.
+    """
+
+    def __init__(self, bandits: List[Bandit], solver_configs: List[SolverConfig],
+                 seeds: List[int]) -> None:
+        self.bandits = bandits
+        self.solver_configs = solver_configs
+        self.seeds = seeds
+        self.results: Dict[ExperimentCell, SimulationResults] = {}
+
+    def get_cells(self) -> List[ExperimentCell]:
+        """Returns every cell of the grid."""
+        return [ExperimentCell(bandit_index, solver_index, seed)
+                for bandit_index in range(len(self.bandits))
+                for solver_index in range(len(self.solver_configs))
+                for seed in self.seeds]
+
+    def run(self, num_iterations: int, max_workers: int = None) -> None:
+        '''
+        Runs every cell of the grid for the specified number of iterations.
+
+        Args:
+            num_iterations (int): The number of iterations of each simulation.
+            max_workers (int): The number of worker processes. Defaults to the number
+                of CPUs. With a single worker the cells run in the current process.
+        '''
+        cells = self.get_cells()
+        arguments = [(self.bandits[cell.bandit_index],
+                      self.solver_configs[cell.solver_index],
+                      get_cell_seed(cell),
+                      num_iterations) for cell in cells]
+
+        if max_workers == 1:
+            results = [run_cell(*cell_arguments) for cell_arguments in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run_cell, *cell_arguments)
+                           for cell_arguments in arguments]
+                results = [future.result() for future in futures]
+
+        self.results = dict(zip(cells, results))
+
+    def get_results(self, cell: ExperimentCell = None) -> Dict[ExperimentCell, SimulationResults]:
+        '''Returns the results for the specified cell.'''
+        if cell:
+            return self.results.get(cell)
+        return self.results
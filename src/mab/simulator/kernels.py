@@ -0,0 +1,167 @@
+"""
+Module for the fused step kernels of the simulator.
+
+A step kernel runs the whole simulation of a common solver over a bandit of BernoulliArm
+arms in a single loop over plain arrays: the decision, the reward draw and the update of
+the statistics of each step are fused, without going through the bandit, the arms or the
+solver methods. The kernels draw from the same random streams in the same order as the
+generic loop, so they give the same decisions and rewards, only faster.
+
+The kernels are registered for exact solver classes, so subclasses, which may change the
+decisions, and bandits with other arms fall back to the generic loop of the simulator.
+IncrementalUCB1Solver has no kernel: its tournament tree makes each decision O(log K),
+where the O(K) argmax of the UCB1 kernel is slower on large bandits.
+"""
+from math import log
+from typing import Callable, Dict, Optional, Tuple, Type
+import numpy as np
+
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import NO_ACTION_CODE, Solver, SolverAction
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import UCB1Solver
+
+# Runs a number of steps and returns the selected arm, reward and action code of each step
+StepKernel = Callable[[Bandit, Solver, int], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+_KERNELS: Dict[Type[Solver], StepKernel] = {}
+
+
+def register_kernel(*solver_classes: Type[Solver]) -> Callable[[StepKernel], StepKernel]:
+    """
+    Decorator registering a step kernel for the given solver classes.
+
+    Args:
+        solver_classes (Type[Solver]): The exact classes of the solvers the kernel runs.
+    """
+    def decorator(kernel: StepKernel) -> StepKernel:
+        for solver_class in solver_classes:
+            _KERNELS[solver_class] = kernel
+        return kernel
+    return decorator
+
+
+def get_kernel(bandit: Bandit, solver: Solver) -> Optional[StepKernel]:
+    """
+    Returns the step kernel running a solver over a bandit, if there is one.
+
+    Returns:
+        The registered kernel of the exact class of the solver when the bandit allows
+        bulk updates, has no free slot and every arm of the bandit is exactly a
+        BernoulliArm, None otherwise.
+    """
+    kernel = _KERNELS.get(type(solver))
+    arms = bandit.get_arms()
+    # The kernels index the arms by slot
+    if (kernel is None or not bandit.bulk_updates or not arms or bandit.get_state().num_free
+            or any(type(arm) is not BernoulliArm for arm in arms)):
+        return None
+    return kernel
+
+
+def _store_statistics(bandit: Bandit, pull_counts: np.ndarray, reward_sums: np.ndarray) -> None:
+    """Stores the statistics of a kernel in the bandit, as the arms would have."""
+    means = reward_sums / np.maximum(1, pull_counts)
+    # The rewards are 0 or 1, so the squared rewards sum to the rewards
+    bandit.get_state().set_statistics(pull_counts, means, reward_sums, reward_sums)
+
+
+@register_kernel(EpsilonGreedySolver)
+def epsilon_greedy_kernel(bandit: Bandit, solver: EpsilonGreedySolver,
+                          num_steps: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs the epsilon-greedy algorithm over a Bernoulli bandit."""
+    state = bandit.get_state()
+    pull_counts = state.pull_counts.tolist()
+    reward_sums = state.reward_sums.tolist()
+    means = state.cumulative_rewards.copy()
+    probabilities = [arm.success_probability for arm in bandit.get_arms()]
+    arm_randoms = [arm.get_random_stream().random for arm in bandit.get_arms()]
+    stream = solver.get_random_stream()
+    epsilon, num_arms = solver.epsilon, len(probabilities)
+    explore_code, exploit_code = SolverAction.EXPLORE.code, SolverAction.EXPLOIT.code
+
+    arm_indices, rewards, action_codes = [], [], []
+    for _ in range(num_steps):
+        if stream.random() > epsilon:
+            arm_index = int(np.argmax(means))
+            action_codes.append(exploit_code)
+        else:
+            arm_index = stream.randrange(num_arms)
+            action_codes.append(explore_code)
+        reward = 1 if arm_randoms[arm_index]() <= probabilities[arm_index] else 0
+        pull_counts[arm_index] += 1
+        reward_sums[arm_index] += reward
+        means[arm_index] = reward_sums[arm_index] / pull_counts[arm_index]
+        arm_indices.append(arm_index)
+        rewards.append(reward)
+
+    _store_statistics(bandit, np.array(pull_counts), np.array(reward_sums, dtype=np.float64))
+    return np.array(arm_indices), np.array(rewards), np.array(action_codes, dtype=np.int8)
+
+
+@register_kernel(UCB1Solver)
+def ucb1_kernel(bandit: Bandit, solver: UCB1Solver,
+                num_steps: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs the UCB1 algorithm over a Bernoulli bandit."""
+    state = bandit.get_state()
+    pull_counts = state.pull_counts.copy()
+    reward_sums = state.reward_sums.copy()
+    means = state.cumulative_rewards.copy()
+    total_pulls = state.total_pulls
+    probabilities = [arm.success_probability for arm in bandit.get_arms()]
+    arm_randoms = [arm.get_random_stream().random for arm in bandit.get_arms()]
+    exploration_parameter = solver.exploration_parameter
+    explore_code, exploit_code = SolverAction.EXPLORE.code, SolverAction.EXPLOIT.code
+
+    arm_indices, rewards, action_codes = [], [], []
+    for _ in range(num_steps):
+        if total_pulls == 0:
+            arm_index = 0
+            action_codes.append(NO_ACTION_CODE)
+        else:
+            exploration_bonuses = np.sqrt(
+                (2 * log(total_pulls)) / np.maximum(1, pull_counts)) * exploration_parameter
+            arm_index = int(np.argmax(means + exploration_bonuses))
+            action_codes.append(explore_code if exploration_bonuses[arm_index] > 0
+                                else exploit_code)
+        reward = 1 if arm_randoms[arm_index]() <= probabilities[arm_index] else 0
+        pull_counts[arm_index] += 1
+        reward_sums[arm_index] += reward
+        means[arm_index] = reward_sums[arm_index] / pull_counts[arm_index]
+        total_pulls += 1
+        arm_indices.append(arm_index)
+        rewards.append(reward)
+
+    _store_statistics(bandit, pull_counts, reward_sums)
+    return np.array(arm_indices), np.array(rewards), np.array(action_codes, dtype=np.int8)
+
+
+@register_kernel(ThomsonSamplingSolver)
+def thomson_sampling_kernel(bandit: Bandit, solver: ThomsonSamplingSolver,
+                            num_steps: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs the Thomson sampling algorithm over a Bernoulli bandit."""
+    state = bandit.get_state()
+    pull_counts = state.pull_counts.tolist()
+    reward_sums = state.reward_sums.tolist()
+    # The posteriors of the solver are updated in place, as update_state does
+    alpha, beta = solver.get_posteriors()
+    probabilities = [arm.success_probability for arm in bandit.get_arms()]
+    arm_randoms = [arm.get_random_stream().random for arm in bandit.get_arms()]
+    draw_beta = solver.get_random_stream().generator.beta
+
+    arm_indices, rewards = [], []
+    for _ in range(num_steps):
+        arm_index = int(np.argmax(draw_beta(alpha, beta)))
+        reward = 1 if arm_randoms[arm_index]() <= probabilities[arm_index] else 0
+        pull_counts[arm_index] += 1
+        reward_sums[arm_index] += reward
+        alpha[arm_index] += reward
+        beta[arm_index] += 1 - reward
+        arm_indices.append(arm_index)
+        rewards.append(reward)
+
+    _store_statistics(bandit, np.array(pull_counts), np.array(reward_sums, dtype=np.float64))
+    return (np.array(arm_indices), np.array(rewards),
+            np.full(num_steps, NO_ACTION_CODE, dtype=np.int8))
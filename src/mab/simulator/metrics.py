@@ -0,0 +1,136 @@
+"""
+Module for the performance metrics of the simulations.
+
+The functions compute the cumulative metrics of a run from its columnar results with
+single vectorised passes, and `RunningMetrics` maintains the same metrics
+incrementally while a simulation runs.
+"""
+import numpy as np
+
+
+def cumulative_reward(rewards: np.ndarray) -> np.ndarray:
+    """
+    Returns the cumulative reward after each step.
+
+    Args:
+        rewards (np.ndarray): The reward of each step.
+    """
+    return np.cumsum(rewards, dtype=np.float64)
+
+
+def pseudo_regret(arm_indices: np.ndarray, arm_means: np.ndarray) -> np.ndarray:
+    """
+    Returns the cumulative pseudo-regret after each step.
+
+    The pseudo-regret of a step is the gap between the expected reward of the best arm
+    and the expected reward of the selected arm.
+
+    Args:
+        arm_indices (np.ndarray): The index of the selected arm of each step.
+        arm_means (np.ndarray): The expected reward of each arm.
+    """
+    arm_means = np.asarray(arm_means, dtype=np.float64)
+    gaps = arm_means.max() - arm_means
+    return np.cumsum(gaps[arm_indices])
+
+
+def realised_regret(rewards: np.ndarray, best_mean: float) -> np.ndarray:
+    """
+    Returns the cumulative realised regret after each step.
+
+    The realised regret of a step is the gap between the expected reward of the best
+    arm and the reward actually obtained.
+
+    Args:
+        rewards (np.ndarray): The reward of each step.
+        best_mean (float): The expected reward of the best arm.
+    """
+    steps = np.arange(1, len(rewards) + 1, dtype=np.float64)
+    return best_mean * steps - cumulative_reward(rewards)
+
+
+def realised_regret_at(steps: np.ndarray, cumulative_rewards: np.ndarray,
+                       best_mean: float) -> np.ndarray:
+    """
+    Returns the cumulative realised regret after some steps of a run, e.g. the recorded
+    steps when only one step out of every N is recorded.
+
+    Args:
+        steps (np.ndarray): The step numbers, starting at 0.
+        cumulative_rewards (np.ndarray): The sum of the rewards of every step up to each
+            of the steps, included.
+        best_mean (float): The expected reward of the best arm.
+    """
+    return best_mean * (np.asarray(steps, dtype=np.float64) + 1) - cumulative_rewards
+
+
+def selection_fractions(arm_indices: np.ndarray, num_arms: int) -> np.ndarray:
+    """
+    Returns the fraction of steps in which each arm was selected.
+
+    Args:
+        arm_indices (np.ndarray): The index of the selected arm of each step.
+        num_arms (int): The number of arms of the bandit.
+    """
+    counts = np.bincount(arm_indices, minlength=num_arms)
+    return counts / max(1, len(arm_indices))
+
+
+class RunningMetrics:
+    """
+    Class maintaining the metrics of a simulation incrementally, in O(1) per step.
+
+    Attributes:
+        num_steps (int): The number of steps observed.
+        total_reward (float): The cumulative reward.
+        pseudo_regret (float): The cumulative pseudo-regret.
+        realised_regret (float): The cumulative realised regret.
+        pull_counts (np.ndarray): The number of times each arm was selected.
+    """
+
+    def __init__(self, arm_means: np.ndarray) -> None:
+        """
+        Args:
+            arm_means (np.ndarray): The expected reward of each arm.
+        """
+        arm_means = np.asarray(arm_means, dtype=np.float64)
+        self._best_mean = float(arm_means.max())
+        self._gaps = self._best_mean - arm_means
+        self.num_steps = 0
+        self.total_reward = 0.0
+        self.pseudo_regret = 0.0
+        self.realised_regret = 0.0
+        self.pull_counts = np.zeros(len(arm_means), dtype=np.int64)
+
+    def update(self, arm_index: int, reward: float) -> None:
+        """
+        Updates the metrics with one step.
+
+        Args:
+            arm_index (int): The index of the selected arm.
+            reward (float): The reward obtained.
+        """
+        self.num_steps += 1
+        self.total_reward += reward
+        self.pseudo_regret += self._gaps[arm_index]
+        self.realised_regret += self._best_mean - reward
+        self.pull_counts[arm_index] += 1
+
+    def update_many(self, arm_indices: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Updates the metrics with a block of steps in a single vectorised pass.
+
+        Args:
+            arm_indices (np.ndarray): The index of the selected arm of each step.
+            rewards (np.ndarray): The reward of each step.
+        """
+        block_reward = float(np.sum(rewards, dtype=np.float64))
+        self.num_steps += len(arm_indices)
+        self.total_reward += block_reward
+        self.pseudo_regret += float(self._gaps[arm_indices].sum())
+        self.realised_regret += self._best_mean * len(arm_indices) - block_reward
+        self.pull_counts += np.bincount(arm_indices, minlength=len(self.pull_counts))
+
+    def get_selection_fractions(self) -> np.ndarray:
+        """Returns the fraction of steps in which each arm was selected."""
+        return self.pull_counts / max(1, self.num_steps)
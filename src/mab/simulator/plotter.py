@@ -1,6 +1,6 @@
 """Module for helper functions related to plotting the bandit domain problems."""
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -70,6 +70,38 @@ class Plotter:
 
         return figure
 
+    @staticmethod
+    def plot_cumulative_series(
+            series: Dict[str, Tuple[np.ndarray, np.ndarray]],
+            config: PlotConfig = PlotConfig(
+                x_label="# Iterations",
+                y_label="Cummulative reward",
+                title="Comparative of cumulative rewards obtained by each solver",
+            )
+    ) -> plt.Figure:
+        """Plot already accumulated (and possibly downsampled) curves of each solver.
+
+        Use it with `TraceReader.cumulative` to plot traces that do not fit in memory.
+        Args:
+            series (Dict): A dictionary containing the iterations and the cumulative
+                values of each solver.
+            config (PlotConfig): An object containing the plot configuration.
+        Returns:
+            A matplotlib figure with the plot.
+        """
+
+        figure, axes = plt.subplots()
+
+        for solver_name, (iterations, data) in series.items():
+            axes.plot(iterations, data, label=solver_name)
+
+        axes.set_xlabel(config.x_label)
+        axes.set_ylabel(config.y_label)
+        axes.set_title(config.title)
+        axes.legend()
+
+        return figure
+
     @staticmethod
     def plot_arm_selection_fractions(
         arm_fractions: Dict[str, List[float]],
@@ -141,14 +173,14 @@ class Plotter:
             A matplotlib figure with the plot.
         """
 
-        sorted_indices = sorted(range(bandit.get_arms_number(
-        )), key=lambda x: bandit.get_arm(x).success_probability)
+        arms = bandit.get_arms()
+        sorted_indices = sorted(range(len(arms)),
+                                key=lambda x: arms[x].success_probability)
 
         # Plot creation
         fig, axes = plt.subplots()
 
-        true_probabilities = [bandit.get_arm(
-            arm).success_probability for arm in sorted_indices]
+        true_probabilities = [arms[arm].success_probability for arm in sorted_indices]
 
         for solver in solvers_names:
             cumulative_rewards = cummulatives[solver]
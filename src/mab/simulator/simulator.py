@@ -1,56 +1,411 @@
 """Module for running simulations."""
-from typing import List
+from enum import Enum
+from typing import Dict, List
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
 from mab.domain.bandit import Bandit
-from mab.domain.solver import Solver
-from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import NO_ACTION_CODE, Solver, SolverAction
+from mab.simulator.batch import BatchSimulationResults, run_batch
+from mab.simulator.kernels import get_kernel
+from mab.simulator.metrics import RunningMetrics
+from mab.simulator.trace import TraceWriter
+
+
+class RecordingMode(Enum):
+    '''
+    This enum represents how much of each simulation step is recorded.
+    '''
+    FULL = "Full"  # Every step is recorded
+    EVERY_NTH = "EveryNth"  # Only one step out of every N is recorded
+    AGGREGATES = "Aggregates"  # Only the aggregated results are kept
+
+
+class SlateAttribution(Enum):
+    '''
+    This enum represents how the reward of a slate is attributed to its arms.
+    '''
+    # Every arm of the slate is pulled and credited with its own reward, and the reward
+    # of the slate is the sum of the rewards
+    SEMI_BANDIT = "SemiBandit"
+    # The arms are pulled in rank order until the first positive reward, as a user
+    # scanning the slate and clicking the first relevant item, and the arms after it
+    # are not observed. The reward of the slate is the reward of the clicked arm
+    CASCADE = "Cascade"
 
 
 class SimulationResults:
-    """Helper class to store the results of the simulation."""
+    """
+    Helper class to store the results of the simulation.
+
+    The recorded steps are stored in preallocated columnar arrays: the index of the
+    selected arm (int32), the reward (float32), the code of the solver action (int8) and
+    the cumulative reward up to the step (float64), so the cumulative metrics stay exact
+    when only one step out of every N is recorded. The aggregated results are always
+    kept, whatever the recording mode.
+    """
+
+    def __init__(self, mode: RecordingMode = RecordingMode.FULL, every: int = 1):
+        """
+        Args:
+            mode (RecordingMode): How much of each step is recorded.
+            every (int): The recording period of the EVERY_NTH mode.
+        """
+        if every < 1:
+            raise ValueError("The recording period must be a positive integer.")
 
-    def __init__(self):
-        self.rewards = []  # The rewards for each iteration
-        self.actions = []  # The actions for each iteration
+        self.mode = mode
+        self.every = every if mode == RecordingMode.EVERY_NTH else 1
+        self._arm_indices = np.zeros(0, dtype=np.int32)
+        self._rewards = np.zeros(0, dtype=np.float32)
+        self._action_codes = np.zeros(0, dtype=np.int8)
+        self._cumulative_rewards = np.zeros(0, dtype=np.float64)
+        self._size = 0
+
+        self.num_steps = 0  # The number of simulated steps
+        self.total_reward = 0.0  # The sum of the rewards of every step
+        self.action_counts = np.zeros(len(SolverAction), dtype=np.int64)  # Steps per action
         self.usage_fractions = {}  # The fraction of times each arm was selected
         self.cummulatives = []  # The cumulative rewards for each arm
 
-    def get_rewards(self) -> List[float]:
-        """Returns the rewards for each iteration."""
+    @property
+    def rewards(self) -> np.ndarray:
+        """The rewards of the recorded steps."""
+        return self._rewards[:self._size]
+
+    @property
+    def arm_indices(self) -> np.ndarray:
+        """The index of the selected arm of the recorded steps."""
+        return self._arm_indices[:self._size]
+
+    @property
+    def action_codes(self) -> np.ndarray:
+        """The code of the solver action of the recorded steps (see SolverAction.code)."""
+        return self._action_codes[:self._size]
+
+    @property
+    def cumulative_rewards(self) -> np.ndarray:
+        """The sum of the rewards of every step up to each recorded step, included."""
+        return self._cumulative_rewards[:self._size]
+
+    @property
+    def steps(self) -> np.ndarray:
+        """The step number of the recorded steps."""
+        return np.arange(self._size, dtype=np.int64) * self.every
+
+    def reserve(self, num_steps: int) -> None:
+        """Preallocates the arrays to record `num_steps` more steps."""
+        if self.mode == RecordingMode.AGGREGATES:
+            return
+
+        capacity = -(-(self.num_steps + num_steps) // self.every)
+        if capacity > len(self._rewards):
+            self._arm_indices = np.resize(self._arm_indices, capacity)
+            self._rewards = np.resize(self._rewards, capacity)
+            self._action_codes = np.resize(self._action_codes, capacity)
+            self._cumulative_rewards = np.resize(self._cumulative_rewards, capacity)
+
+    def record(self, arm_index: int, reward: float, action: SolverAction = None) -> None:
+        """
+        Records one step of the simulation.
+
+        Args:
+            arm_index (int): The index of the selected arm.
+            reward (float): The reward obtained.
+            action (SolverAction): The action reported by the solver, if any.
+        """
+        if action is not None:
+            self.action_counts[action.code] += 1
+        self.total_reward += reward
+
+        if self.mode != RecordingMode.AGGREGATES and self.num_steps % self.every == 0:
+            if self._size == len(self._rewards):
+                self.reserve(max(1, self._size) * self.every)
+            self._arm_indices[self._size] = arm_index
+            self._rewards[self._size] = reward
+            self._action_codes[self._size] = NO_ACTION_CODE if action is None else action.code
+            self._cumulative_rewards[self._size] = self.total_reward
+            self._size += 1
+        self.num_steps += 1
+
+    def record_many(self, arm_index: int, num_steps: int, reward_sum: float,
+                    action: SolverAction = None, rewards: np.ndarray = None) -> None:
+        """
+        Records a streak of consecutive steps with the same arm and action.
+
+        Args:
+            arm_index (int): The index of the selected arm.
+            num_steps (int): The number of steps of the streak.
+            reward_sum (float): The sum of the rewards of the streak.
+            action (SolverAction): The action reported by the solver, if any.
+            rewards (np.ndarray): The reward of each step. Only needed when steps are
+                recorded, i.e. unless the recording mode is AGGREGATES.
+        """
+        if action is not None:
+            self.action_counts[action.code] += num_steps
+
+        if self.mode != RecordingMode.AGGREGATES:
+            # Offset of the first recorded step of the streak
+            offset = -self.num_steps % self.every
+            recorded_rewards = rewards[offset::self.every]
+            cumulative_rewards = (self.total_reward
+                                  + np.cumsum(rewards, dtype=np.float64)[offset::self.every])
+            end = self._size + len(recorded_rewards)
+            if end > len(self._rewards):
+                self.reserve(num_steps)
+            self._arm_indices[self._size:end] = arm_index
+            self._rewards[self._size:end] = recorded_rewards
+            self._action_codes[self._size:end] = NO_ACTION_CODE if action is None else action.code
+            self._cumulative_rewards[self._size:end] = cumulative_rewards
+            self._size = end
+        self.total_reward += reward_sum
+        self.num_steps += num_steps
+
+    def record_steps(self, arm_indices: np.ndarray, rewards: np.ndarray,
+                     action_codes: np.ndarray) -> None:
+        """
+        Records a block of consecutive steps of the simulation.
+
+        Args:
+            arm_indices (np.ndarray): The index of the selected arm of each step.
+            rewards (np.ndarray): The reward of each step.
+            action_codes (np.ndarray): The code of the solver action of each step (see
+                SolverAction.code), NO_ACTION_CODE when no action was reported.
+        """
+        action_codes = np.asarray(action_codes)
+        self.action_counts += np.bincount(action_codes[action_codes != NO_ACTION_CODE],
+                                          minlength=len(self.action_counts))
+
+        if self.mode != RecordingMode.AGGREGATES:
+            # Offset of the first recorded step of the block
+            offset = -self.num_steps % self.every
+            recorded = slice(offset, None, self.every)
+            cumulative_rewards = self.total_reward + np.cumsum(rewards, dtype=np.float64)
+            end = self._size + len(arm_indices[recorded])
+            if end > len(self._rewards):
+                self.reserve(len(arm_indices))
+            self._arm_indices[self._size:end] = arm_indices[recorded]
+            self._rewards[self._size:end] = rewards[recorded]
+            self._action_codes[self._size:end] = action_codes[recorded]
+            self._cumulative_rewards[self._size:end] = cumulative_rewards[recorded]
+            self._size = end
+        self.total_reward += float(np.sum(rewards))
+        self.num_steps += len(arm_indices)
+
+    def get_rewards(self) -> np.ndarray:
+        """Returns the rewards for each recorded iteration."""
         return self.rewards
 
-    def get_actions(self) -> List[float]:
-        """Returns the actions for each iteration."""
-        return self.actions
+    def get_actions(self) -> np.ndarray:
+        """Returns the index of the selected arm for each recorded iteration."""
+        return self.arm_indices
 
 
 class Simulator:
     '''Class representing a simulator for a multi-armed bandit problem.'''
 
-    def __init__(self, bandit: Bandit, solvers: List[Solver]) -> None:
+    def __init__(self, bandit: Bandit, solvers: List[Solver],
+                 recording_mode: RecordingMode = RecordingMode.FULL,
+                 record_every: int = 1, fast_forward: bool = False, seed: int = None,
+                 use_kernels: bool = True) -> None:
+        """
+        Args:
+            bandit (Bandit): The bandit to simulate.
+            solvers (List[Solver]): The solvers to run over the bandit.
+            recording_mode (RecordingMode): How much of each step is recorded.
+            record_every (int): The recording period of the EVERY_NTH mode.
+            fast_forward (bool): Whether the streaks of steps a solver commits to (see
+                `Solver.select_arm_streak`) are pulled at once. It requires a bandit
+                allowing bulk updates, of stationary BernoulliArm arms.
+            seed (int): When given, every run of every solver gets its own random streams
+                for the solver and each arm, spawned from this seed, so the results only
+                depend on the seed, the run and the solver position.
+            use_kernels (bool): Whether the solvers with a fused step kernel (see
+                mab.simulator.kernels) are run through it instead of the generic loop.
+                The kernels give the same decisions and rewards as the generic loop.
+        """
+        if fast_forward and not (bandit.bulk_updates and all(
+                isinstance(arm, BernoulliArm) and arm.stationary
+                for arm in bandit.get_arms())):
+            raise ValueError(
+                "The fast forward mode requires a bandit of stationary BernoulliArm arms.")
+
         self.bandit = bandit
         self.solvers = solvers
-        self.results = {solver: SimulationResults() for solver in solvers}
+        self.fast_forward = fast_forward
+        self.seed = seed
+        self.use_kernels = use_kernels
+        self._num_runs = 0
+        self.results = {solver: SimulationResults(recording_mode, record_every)
+                        for solver in solvers}
+        self.batch_results = {}
 
-    def run(self, num_iterations: int) -> None:
-        '''Runs the simulation for the specified number of iterations.'''
-        for solver in self.solvers:
-            for _ in range(num_iterations):
-                selected_arm = solver.select_arm()
-                if selected_arm not in self.bandit.get_arms():
-                    raise ValueError(
-                        "Selected arm is not present in the bandit.")
-                reward = self.bandit.pull_arm(selected_arm)
-                solver.update_solver_history(selected_arm, reward)
-                self.results[solver].rewards.append(reward)
-                self.results[solver].actions.append(selected_arm)
-
-                # @TODO:Migrate to solver class
-                if isinstance(solver, ThomsonSamplingSolver):
-                    solver.update_state(selected_arm, reward)
+    def run(self, num_iterations: int, traces: Dict[Solver, TraceWriter] = None,
+            metrics: Dict[Solver, RunningMetrics] = None) -> None:
+        '''
+        Runs the simulation for the specified number of iterations.
+
+        Args:
+            num_iterations (int): The number of iterations of each solver.
+            traces (Dict[Solver, TraceWriter]): Optional trace writers streaming every
+                step of the given solvers to disk.
+            metrics (Dict[Solver, RunningMetrics]): Optional running metrics updated
+                at every step of the given solvers.
+        '''
+        for solver_index, solver in enumerate(self.solvers):
+            if self.seed is not None:
+                self._set_random_streams(solver, solver_index)
+            results = self.results[solver]
+            results.reserve(num_iterations)
+            trace = traces.get(solver) if traces else None
+            running_metrics = metrics.get(solver) if metrics else None
+            solver.pop_last_action()
+            kernel = get_kernel(self.bandit, solver) if self.use_kernels else None
+            if self.fast_forward:
+                self._run_fast_forward(solver, num_iterations, trace, running_metrics)
+            elif kernel is not None:
+                arm_indices, rewards, action_codes = kernel(self.bandit, solver, num_iterations)
+                solver.update_solver_history_many(arm_indices, action_codes)
+                solver.pop_last_action()
+                if trace is not None:
+                    trace.write_many(0, np.arange(results.num_steps,
+                                                  results.num_steps + num_iterations),
+                                     arm_indices, rewards, action_codes)
+                if running_metrics is not None:
+                    running_metrics.update_many(arm_indices, rewards)
+                results.record_steps(arm_indices, rewards, action_codes)
+            else:
+                for _ in range(num_iterations):
+                    arm_index = solver.select_arm_index()
+                    action = solver.pop_last_action()
+                    reward = self.bandit.pull_arm_by_index(arm_index)
+                    if trace is not None:
+                        trace.write(0, results.num_steps, arm_index, reward,
+                                    NO_ACTION_CODE if action is None else action.code)
+                    if running_metrics is not None:
+                        running_metrics.update(arm_index, reward)
+                    results.record(arm_index, reward, action)
+                    solver.update_state(self.bandit.get_arm(arm_index), reward)
 
             self.results[solver].cummulatives = self.bandit.get_cumulative_by_arms()
             self.results[solver].usage_fractions = self.bandit.calculate_arm_fractions()
             self.bandit.reset()
+        self._num_runs += 1
+
+    def run_slates(self, num_iterations: int, slate_size: int,
+                   attribution: SlateAttribution = SlateAttribution.SEMI_BANDIT) -> None:
+        '''
+        Runs the simulation selecting a ranked slate of arms at every iteration.
+
+        Every iteration records the first arm of the slate and the reward of the slate,
+        while the arms observed according to the attribution are pulled and update the
+        solver. The action of each position of the slate is kept in the action counts
+        of the solver, so the iterations are recorded without action. The solvers must
+        implement `select_slate_indices`.
+
+        Args:
+            num_iterations (int): The number of iterations of each solver.
+            slate_size (int): The number of arms of each slate (k).
+            attribution (SlateAttribution): How the reward of a slate is attributed.
+        '''
+        for solver_index, solver in enumerate(self.solvers):
+            if self.seed is not None:
+                self._set_random_streams(solver, solver_index)
+            results = self.results[solver]
+            results.reserve(num_iterations)
+            solver.pop_last_action()
+            for _ in range(num_iterations):
+                slate = solver.select_slate_indices(slate_size).tolist()
+                solver.pop_last_action()
+                slate_reward = 0
+                for arm_index in slate:
+                    reward = self.bandit.pull_arm_by_index(arm_index)
+                    solver.update_state(self.bandit.get_arm(arm_index), reward)
+                    slate_reward += reward
+                    if attribution == SlateAttribution.CASCADE and reward > 0:
+                        break
+                results.record(slate[0], slate_reward)
+
+            results.cummulatives = self.bandit.get_cumulative_by_arms()
+            results.usage_fractions = self.bandit.calculate_arm_fractions()
+            self.bandit.reset()
+        self._num_runs += 1
+
+    def _set_random_streams(self, solver: Solver, solver_index: int) -> None:
+        """Gives the solver and each arm an independent stream for the current run."""
+        sequence = np.random.SeedSequence(self.seed, spawn_key=(self._num_runs, solver_index))
+        streams = RandomStream(sequence).spawn(self.bandit.get_arms_number() + 1)
+        solver.set_random_stream(streams[0])
+        for arm, stream in zip(self.bandit.get_arms(), streams[1:]):
+            arm.set_random_stream(stream)
+
+    def _run_fast_forward(self, solver: Solver, num_iterations: int,
+                          trace: TraceWriter, running_metrics: RunningMetrics) -> None:
+        """Runs a solver pulling every streak of steps it commits to at once."""
+        results = self.results[solver]
+        # The reward of every step is only drawn when some step is recorded
+        needs_rewards = (results.mode != RecordingMode.AGGREGATES or trace is not None
+                         or running_metrics is not None)
+        remaining = num_iterations
+        while remaining > 0:
+            arm_index, streak = solver.select_arm_streak(remaining)
+            action = solver.pop_last_action()
+            arm = self.bandit.get_arm(arm_index)
+
+            if streak == 1:
+                reward = self.bandit.pull_arm_by_index(arm_index)
+                if trace is not None:
+                    trace.write(0, results.num_steps, arm_index, reward,
+                                NO_ACTION_CODE if action is None else action.code)
+                if running_metrics is not None:
+                    running_metrics.update(arm_index, reward)
+                results.record(arm_index, reward, action)
+                solver.update_state(arm, reward)
+            elif needs_rewards:
+                rewards = arm.sample_many(streak)
+                successes = int(rewards.sum())
+                arm.record_pulls(streak, successes)
+                if trace is not None:
+                    trace.write_many(0, np.arange(results.num_steps, results.num_steps + streak),
+                                     arm_index, rewards,
+                                     NO_ACTION_CODE if action is None else action.code)
+                if running_metrics is not None:
+                    running_metrics.update_many(np.full(streak, arm_index), rewards)
+                results.record_many(arm_index, streak, successes, action, rewards)
+            else:
+                results.record_many(arm_index, streak, arm.pull_many(streak), action)
+            remaining -= streak
+
+    def run_batch(self, num_iterations: int, replications: int, seed: int = None,
+                  traces: Dict[Solver, TraceWriter] = None) -> None:
+        '''
+        Runs R independent replications of every solver in lockstep.
+
+        The replications are advanced as (R, K) arrays, so the solvers must implement
+        `select_arms_batch` and the bandit must be made of BernoulliArm arms.
+
+        Args:
+            num_iterations (int): The number of iterations of each replication.
+            replications (int): The number of replications (R).
+            seed (int): The seed of the replications. When it is not given, the run gets
+                its own stream spawned from the seed of the simulator, if any, as `run`.
+            traces (Dict[Solver, TraceWriter]): Optional trace writers streaming every
+                step of the given solvers to disk.
+        '''
+        if seed is None and self.seed is not None:
+            seed = np.random.SeedSequence(self.seed, spawn_key=(self._num_runs,))
+        rng = np.random.default_rng(seed)
+        for solver in self.solvers:
+            self.batch_results[solver] = run_batch(
+                self.bandit, solver, num_iterations, replications, rng,
+                traces.get(solver) if traces else None)
+        self._num_runs += 1
+
+    def get_batch_results(self, solver: Solver = None) -> BatchSimulationResults:
+        '''Returns the batch results for the specified solver.'''
+        if solver:
+            return self.batch_results.get(solver)
+        return self.batch_results
 
     def get_results(self, solver: Solver = None) -> List[float]:
         '''Returns the results for the specified solver.'''
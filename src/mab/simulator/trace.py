@@ -0,0 +1,257 @@
+"""
+Module for the binary trace format of long simulations.
+
+A trace file starts with a fixed prefix (magic, version, header length and number of
+records), followed by a JSON header describing the bandit and the solver, padded to
+a 64 bytes boundary, and the packed per-step records. The records are written and
+read through memory maps, so traces larger than the memory can be produced and
+analysed afterwards without re-simulating.
+"""
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, Tuple
+import numpy as np
+
+from mab.domain.bandit import Bandit
+from mab.domain.solver import Solver
+
+TRACE_MAGIC: bytes = b"MABTRACE"
+TRACE_VERSION: int = 1
+TRACE_DTYPE = np.dtype([
+    ("replication", "<u4"),
+    ("step", "<u8"),
+    ("arm", "<i4"),
+    ("reward", "<f4"),
+    ("action", "<i1"),
+])
+
+# magic, version, header length, number of records
+_PREFIX = struct.Struct("<8sIIQ")
+_ALIGNMENT: int = 64
+
+
+def describe_bandit(bandit: Bandit) -> Dict[str, Any]:
+    """Returns a JSON serialisable description of a bandit and the arm of each slot,
+    with None for the free slots."""
+    return {
+        "class": bandit.__class__.__name__,
+        "arms": [None if arm is None else
+                 {"class": arm.__class__.__name__, **_public_attributes(arm)}
+                 for arm in bandit.get_slots()],
+    }
+
+
+def describe_solver(solver: Solver) -> Dict[str, Any]:
+    """Returns a JSON serialisable description of a solver."""
+    return {"class": solver.__class__.__name__, "name": str(solver),
+            **_public_attributes(solver)}
+
+
+def _public_attributes(instance: Any) -> Dict[str, Any]:
+    return {name: value for name, value in vars(instance).items()
+            if not name.startswith("_") and isinstance(value, (bool, int, float, str))}
+
+
+class TraceWriter:
+    """
+    Class streaming simulation records into a memory-mapped trace file.
+
+    The file grows by chunks of records and is truncated to the written records when
+    the writer is closed. It can be used as a context manager.
+    """
+
+    def __init__(self, path: str, bandit_config: Dict[str, Any] = None,
+                 solver_config: Dict[str, Any] = None, chunk_size: int = 1 << 20) -> None:
+        """
+        Creates the trace file and writes its header.
+
+        Args:
+            path (str): The path of the trace file. An existing file is overwritten.
+            bandit_config (Dict): The description of the bandit (see describe_bandit).
+            solver_config (Dict): The description of the solver (see describe_solver).
+            chunk_size (int): The number of records the file grows by when it is full.
+        """
+        header = json.dumps({"bandit": bandit_config or {},
+                             "solver": solver_config or {},
+                             "dtype": TRACE_DTYPE.descr}).encode()
+        self.path = path
+        self._offset = -(-(_PREFIX.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+        self._chunk_size = chunk_size
+        self._size = 0
+        self._records = None
+
+        with open(path, "wb") as file:
+            file.write(_PREFIX.pack(TRACE_MAGIC, TRACE_VERSION, len(header), 0))
+            file.write(header)
+            file.write(b"\0" * (self._offset - _PREFIX.size - len(header)))
+        self._grow(chunk_size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = max(min_capacity, self._size + self._chunk_size)
+        if self._records is not None:
+            self._records.flush()
+            self._records = None
+        with open(self.path, "r+b") as file:
+            file.truncate(self._offset + capacity * TRACE_DTYPE.itemsize)
+        self._records = np.memmap(self.path, dtype=TRACE_DTYPE, mode="r+",
+                                  offset=self._offset, shape=(capacity,))
+
+    def write(self, replication: int, step: int, arm_index: int,
+              reward: float, action_code: int) -> None:
+        """Appends a single record to the trace."""
+        if self._size == len(self._records):
+            self._grow(self._size + 1)
+        self._records[self._size] = (replication, step, arm_index, reward, action_code)
+        self._size += 1
+
+    def write_many(self, replications: np.ndarray, steps: np.ndarray, arm_indices: np.ndarray,
+                   rewards: np.ndarray, action_codes: np.ndarray) -> None:
+        """Appends a block of records to the trace. Scalars are broadcast to the block."""
+        block_size = len(np.atleast_1d(arm_indices))
+        if self._size + block_size > len(self._records):
+            self._grow(self._size + block_size)
+        block = self._records[self._size:self._size + block_size]
+        block["replication"] = replications
+        block["step"] = steps
+        block["arm"] = arm_indices
+        block["reward"] = rewards
+        block["action"] = action_codes
+        self._size += block_size
+
+    def flush(self) -> None:
+        """Flushes the written records and updates the record count of the header."""
+        self._records.flush()
+        with open(self.path, "r+b") as file:
+            file.seek(_PREFIX.size - 8)
+            file.write(struct.pack("<Q", self._size))
+
+    def close(self) -> None:
+        """Flushes the records and truncates the file to the written records."""
+        if self._records is None:
+            return
+        self.flush()
+        self._records = None
+        with open(self.path, "r+b") as file:
+            file.truncate(self._offset + self._size * TRACE_DTYPE.itemsize)
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Class giving access to the records of a trace file through a read-only memory map.
+
+    Only the pages that are accessed are loaded, and the streaming helpers process
+    the records by chunks so arbitrarily long traces can be analysed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens a trace file and maps its records.
+
+        Raises:
+            ValueError: If the file is not a trace file of a supported version.
+        """
+        with open(path, "rb") as file:
+            magic, version, header_length, num_records = _PREFIX.unpack(
+                file.read(_PREFIX.size))
+            if magic != TRACE_MAGIC or version != TRACE_VERSION:
+                raise ValueError(f"{path} is not a version {TRACE_VERSION} trace file.")
+            self.header: Dict[str, Any] = json.loads(file.read(header_length))
+
+        self.path = path
+        offset = -(-(_PREFIX.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+        available = (os.path.getsize(path) - offset) // TRACE_DTYPE.itemsize
+        num_records = min(num_records, available)
+        self.records = (np.memmap(path, dtype=TRACE_DTYPE, mode="r",
+                                  offset=offset, shape=(num_records,))
+                        if num_records > 0 else np.zeros(0, dtype=TRACE_DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def bandit_config(self) -> Dict[str, Any]:
+        """The description of the bandit of the trace."""
+        return self.header["bandit"]
+
+    @property
+    def solver_config(self) -> Dict[str, Any]:
+        """The description of the solver of the trace."""
+        return self.header["solver"]
+
+    @property
+    def arm_indices(self) -> np.ndarray:
+        """The index of the selected arm of every record (memory-mapped)."""
+        return self.records["arm"]
+
+    @property
+    def rewards(self) -> np.ndarray:
+        """The reward of every record (memory-mapped)."""
+        return self.records["reward"]
+
+    @property
+    def steps(self) -> np.ndarray:
+        """The step of every record (memory-mapped)."""
+        return self.records["step"]
+
+    def iter_chunks(self, chunk_size: int = 1 << 20, replication: int = None) -> Iterator[np.ndarray]:
+        """
+        Iterates over the records by chunks.
+
+        Args:
+            chunk_size (int): The number of records read at once.
+            replication (int): When given, only the records of that replication are yielded.
+        """
+        for start in range(0, len(self.records), chunk_size):
+            chunk = self.records[start:start + chunk_size]
+            if replication is not None:
+                chunk = chunk[chunk["replication"] == replication]
+            yield chunk
+
+    def cumulative(self, values: str = "reward", replication: int = None,
+                   arm_values: np.ndarray = None, points: int = 1000,
+                   chunk_size: int = 1 << 20) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes a downsampled cumulative curve over the records in a streaming pass.
+
+        Args:
+            values (str): The field accumulated, "reward" by default.
+            replication (int): When given, only the records of that replication are used.
+            arm_values (np.ndarray): When given, the value accumulated for each record is
+                `arm_values[arm]` instead of a field (e.g. the gap of each arm to the best
+                arm to obtain the pseudo-regret).
+            points (int): The maximum number of points of the curve.
+            chunk_size (int): The number of records read at once.
+
+        Returns:
+            The record positions and the cumulative values at those positions.
+        """
+        total = sum(len(chunk) for chunk in self.iter_chunks(chunk_size, replication)) \
+            if replication is not None else len(self.records)
+        stride = max(1, -(-total // points))
+
+        positions, cumulatives = [], []
+        running, seen = 0.0, 0
+        for chunk in self.iter_chunks(chunk_size, replication):
+            chunk_values = arm_values[chunk["arm"]] if arm_values is not None else chunk[values]
+            chunk_cumulative = running + np.cumsum(chunk_values, dtype=np.float64)
+            chunk_positions = np.arange(seen, seen + len(chunk))
+            sampled = (chunk_positions + 1) % stride == 0
+            positions.append(chunk_positions[sampled])
+            cumulatives.append(chunk_cumulative[sampled])
+            if len(chunk):
+                running = chunk_cumulative[-1]
+            seen += len(chunk)
+
+        if not positions:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.concatenate(positions), np.concatenate(cumulatives)
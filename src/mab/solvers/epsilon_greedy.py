@@ -1,8 +1,12 @@
 """Module for the EpsilonGreedy Solvers class."""""
-import random
+from math import floor, inf, log
+from typing import Tuple
+import numpy as np
 from mab.domain.bandit import Bandit
 from mab.domain.arm import Arm
-from mab.domain.solver import Solver, SolverAction
+from mab.domain.bandit_state import BanditState, BatchBanditState
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import Solver, SolverAction, top_k
 
 
 class EpsilonGreedySolver(Solver):
@@ -16,6 +20,8 @@ class EpsilonGreedySolver(Solver):
     Args:
         bandit (Bandit): The multi-armed bandit problem to solve.
         epsilon (float): The exploration parameter. Should be a value between 0 and 1.
+        random_stream (RandomStream): The random stream of the decisions. A new stream
+            seeded from the random module is created when it is not given.
 
     Attributes:
         bandit (Bandit): The multi-armed bandit problem to solve.
@@ -23,9 +29,13 @@ class EpsilonGreedySolver(Solver):
 
     """
 
-    def __init__(self, bandit: Bandit, epsilon: float) -> None:
+    def __init__(self, bandit: Bandit, epsilon: float,
+                 random_stream: RandomStream = None) -> None:
         super().__init__(bandit)
         self.epsilon = epsilon
+        self._random_stream = random_stream or RandomStream()
+        # Whether the last streak ended right before an exploration step
+        self._explore_next = False
 
     def select_arm(self) -> Arm:
         """
@@ -34,10 +44,101 @@ class EpsilonGreedySolver(Solver):
         Returns:
             The selected arm.
         """
-        if random.random() > self.epsilon:
-            return self.exploit()
+        return self._bandit.get_arm(self.select_arm_index())
 
-        return self.explore()
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm using the epsilon-greedy algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        if self._random_stream.random() > self.epsilon:
+            return self.exploit_index()
+
+        return self.explore_index()
+
+    def select_arm_streak(self, max_steps: int) -> Tuple[int, int]:
+        """
+        Selects an arm and commits to it for a streak of exploitation steps.
+
+        The number of exploitation steps before the next exploration is drawn at once
+        from its geometric distribution, and the streak is cut where the exploited arm
+        could stop being the best one if it only obtained zero rewards. The remainder of
+        a cut geometric streak is distributed as a new one, and a streak that is not cut
+        is followed by an exploration, so the decisions are distributed as step by step.
+
+        Args:
+            max_steps (int): The maximum length of the streak.
+
+        Returns:
+            The index of the selected arm and the length of the streak.
+        """
+        if self._explore_next:
+            self._explore_next = False
+            return self.explore_index(), 1
+
+        # Consecutive exploitation steps until the next exploration
+        if self.epsilon <= 0:
+            exploits = inf
+        elif self.epsilon >= 1:
+            exploits = 0
+        else:
+            exploits = floor(log(1.0 - self._random_stream.random())
+                             / log(1.0 - self.epsilon))
+        if exploits == 0:
+            return self.explore_index(), 1
+
+        state = self._bandit.get_state()
+        selected_index = int(np.argmax(self._mask_free_slots(state.cumulative_rewards)))
+        streak = int(min(max_steps, exploits,
+                         self._get_safe_streak(state, selected_index, max_steps)))
+        self._explore_next = streak == exploits
+
+        self.update_solver_history_by_index(selected_index, SolverAction.EXPLOIT, streak)
+        return selected_index, streak
+
+    def _get_safe_streak(self, state: BanditState, selected_index: int, max_steps: int) -> int:
+        """
+        Returns the number of steps the arm stays the best one with zero rewards, for
+        rewards in [0, 1] and cumulative rewards equal to the mean rewards.
+        """
+        cumulative_rewards = self._mask_free_slots(state.cumulative_rewards)
+        if len(cumulative_rewards) == 1:
+            return max_steps
+
+        others = np.delete(cumulative_rewards, selected_index)
+        runner_up = others.max()
+        # np.argmax breaks ties in favour of the lowest index
+        runner_up_index = int(np.argmax(others))
+        if runner_up_index >= selected_index:
+            runner_up_index += 1
+        wins_ties = selected_index < runner_up_index
+
+        reward_sum = float(state.reward_sums[selected_index])
+        pull_counts = int(state.pull_counts[selected_index])
+
+        def is_best(pulls: int) -> bool:
+            mean = reward_sum / max(1, pulls)
+            return mean >= runner_up if wins_ties else mean > runner_up
+
+        if runner_up <= 0:
+            return max_steps if is_best(pull_counts + max_steps) else 1
+
+        # The mean after j more failures is reward_sum / (pull_counts + j), and the
+        # decision of step j of the streak is made after j - 1 more pulls
+        streak = max(1, min(max_steps, floor(reward_sum / runner_up) - pull_counts + 1))
+        while streak > 1 and not is_best(pull_counts + streak - 1):
+            streak -= 1
+        return streak
+
+    def get_random_stream(self) -> RandomStream:
+        """Returns the random stream the solver draws its decisions from."""
+        return self._random_stream
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """Sets the random stream the solver draws its decisions from."""
+        self._random_stream = random_stream
 
     def exploit(self) -> Arm:
         """
@@ -46,10 +147,19 @@ class EpsilonGreedySolver(Solver):
         Returns:
             The selected arm for exploitation.
         """
-        arms = self._bandit.get_arms()
-        selected_arm = max(arms, key=lambda arm: arm.get_cumulative_reward())
-        self.update_solver_history(selected_arm, SolverAction.EXPLOIT)
-        return selected_arm
+        return self._bandit.get_arm(self.exploit_index())
+
+    def exploit_index(self) -> int:
+        """
+        Exploits the arm with the highest cumulative reward.
+
+        Returns:
+            The index of the selected arm for exploitation.
+        """
+        cumulative_rewards = self._mask_free_slots(self._bandit.get_state().cumulative_rewards)
+        selected_index = int(np.argmax(cumulative_rewards))
+        self.update_solver_history_by_index(selected_index, SolverAction.EXPLOIT)
+        return selected_index
 
     def explore(self) -> Arm:
         """
@@ -58,10 +168,75 @@ class EpsilonGreedySolver(Solver):
         Returns:
             The randomly selected arm for exploration.
         """
-        arms = self._bandit.get_arms()
-        selected_arm = random.choice(arms)
-        self.update_solver_history(selected_arm, SolverAction.EXPLORE)
-        return selected_arm
+        return self._bandit.get_arm(self.explore_index())
+
+    def explore_index(self) -> int:
+        """
+        Explores a random arm.
+
+        Returns:
+            The index of the randomly selected arm for exploration.
+        """
+        selected_index = self._draw_arm_index()
+        self.update_solver_history_by_index(selected_index, SolverAction.EXPLORE)
+        return selected_index
+
+    def _draw_arm_index(self) -> int:
+        """
+        Draws an arm index uniformly, drawing again the free slots of the bandit, which
+        the recycling of the slots keeps few.
+        """
+        num_arms = self._bandit.get_slots_number()
+        arm_index = self._random_stream.randrange(num_arms)
+        state = self._bandit.get_state()
+        if state.num_free:
+            while not state.active[arm_index]:
+                arm_index = self._random_stream.randrange(num_arms)
+        return arm_index
+
+    def select_slate_indices(self, slate_size: int) -> np.ndarray:
+        """
+        Selects a ranked slate of distinct arms using the epsilon-greedy algorithm.
+
+        The slate starts as the arms with the highest cumulative rewards, and each
+        position is replaced with probability epsilon by a random arm not in the slate.
+
+        Args:
+            slate_size (int): The number of arms of the slate (k).
+
+        Returns:
+            The indices of the selected arms, best ranked first.
+        """
+        slate = top_k(self._mask_free_slots(self._bandit.get_state().cumulative_rewards),
+                      slate_size)
+        selected = set(slate.tolist())
+        for position in range(slate_size):
+            if self._random_stream.random() > self.epsilon:
+                self.update_solver_history_by_index(int(slate[position]), SolverAction.EXPLOIT)
+                continue
+
+            selected.discard(int(slate[position]))
+            arm_index = self._draw_arm_index()
+            while arm_index in selected:
+                arm_index = self._draw_arm_index()
+            selected.add(arm_index)
+            slate[position] = arm_index
+            self.update_solver_history_by_index(arm_index, SolverAction.EXPLORE)
+        return slate
+
+    def select_arms_batch(self, state: BatchBanditState,
+                          rng: np.random.Generator) -> np.ndarray:
+        """
+        Selects an arm for every replication using the epsilon-greedy algorithm.
+
+        Returns:
+            The index of the selected arm for each replication.
+        """
+        selected_arms = np.argmax(state.means, axis=1)
+        explore = rng.random(state.replications) <= self.epsilon
+        selected_arms[explore] = rng.integers(
+            state.num_arms, size=np.count_nonzero(explore))
+        return selected_arms
 
     def __str__(self) -> str:
         return f"EpsilonGreedy(epsilon={self.epsilon})"
@@ -0,0 +1,128 @@
+"""Module for defining the hierarchical solver of the clustered bandits."""
+
+from typing import Callable, Dict
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+from mab.domain.clustered_bandit import ClusteredBandit
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import Solver
+
+# Builds a solver over a bandit, e.g. lambda bandit: UCB1Solver(bandit, 1.0)
+SolverFactory = Callable[[Bandit], Solver]
+
+
+class HierarchicalSolver(Solver):
+    """
+    Solver picking a cluster of a clustered bandit with a cluster solver, then an arm
+    of that cluster with the arm solver of the cluster.
+
+    The cluster solver runs over the bandit of the clusters, whose statistics aggregate
+    the ones of their arms, and each arm solver over the view of its cluster, so a
+    decision costs O(C + cluster size) instead of O(K). The arm solver of a cluster is
+    only built the first time the cluster is selected, so the clusters that are never
+    selected take no solver memory. Each decision is reported with the action of the
+    arm solver.
+
+    Args:
+        bandit (ClusteredBandit): The clustered bandit problem to solve.
+        cluster_solver_factory (SolverFactory): Builds the solver picking the cluster,
+            given the bandit of the clusters.
+        arm_solver_factory (SolverFactory): Builds the solver picking the arm within a
+            cluster, given the view of the cluster.
+    """
+
+    def __init__(self, bandit: ClusteredBandit, cluster_solver_factory: SolverFactory,
+                 arm_solver_factory: SolverFactory) -> None:
+        super().__init__(bandit)
+        self._cluster_solver_factory = cluster_solver_factory
+        self._arm_solver_factory = arm_solver_factory
+        self._random_stream: RandomStream = None
+        self._cluster_bandit: Bandit = None
+        self._cluster_solver: Solver = None
+        self._arm_solvers: Dict[int, Solver] = {}
+        self.sync_state()
+
+    def select_arm(self) -> Arm:
+        """
+        Selects an arm from the bandit, picking its cluster first.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit, picking its cluster first.
+
+        Returns:
+            The index of the selected arm in the bandit.
+        """
+        cluster_index = self._cluster_solver.select_arm_index()
+        self._cluster_solver.pop_last_action()
+        arm_solver = self.get_arm_solver(cluster_index)
+        selected_index = (self._bandit.get_cluster(cluster_index).start
+                          + arm_solver.select_arm_index())
+        action = arm_solver.pop_last_action()
+        if action is not None:
+            self.update_solver_history_by_index(selected_index, action)
+        return selected_index
+
+    def get_cluster_solver(self) -> Solver:
+        """Returns the solver picking the cluster."""
+        return self._cluster_solver
+
+    def get_arm_solver(self, cluster_index: int) -> Solver:
+        """
+        Returns the solver picking the arm within a cluster, building it if needed.
+
+        Args:
+            cluster_index (int): The index of the cluster.
+        """
+        arm_solver = self._arm_solvers.get(cluster_index)
+        if arm_solver is None:
+            arm_solver = self._arm_solver_factory(self._bandit.get_cluster(cluster_index))
+            if self._random_stream is not None:
+                arm_solver.set_random_stream(self._random_stream.spawn(1)[0])
+            # The arms may have been pulled before the cluster was first selected
+            arm_solver.sync_state()
+            self._arm_solvers[cluster_index] = arm_solver
+        return arm_solver
+
+    def update_state(self, arm: Arm, reward: float) -> None:
+        """Updates the solver of the cluster of the pulled arm and the cluster solver."""
+        cluster_index = self._bandit.get_cluster_index(self._bandit.get_arm_index(arm))
+        self._cluster_solver.update_state(self._cluster_bandit.get_arm(cluster_index), reward)
+        arm_solver = self._arm_solvers.get(cluster_index)
+        if arm_solver is not None:
+            arm_solver.update_state(arm, reward)
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """
+        Gives the cluster solver and every arm solver a child stream of the random
+        stream, the arm solvers built later getting the next children.
+        """
+        self._random_stream = random_stream
+        streams = random_stream.spawn(len(self._arm_solvers) + 1)
+        self._cluster_solver.set_random_stream(streams[0])
+        for arm_solver, stream in zip(self._arm_solvers.values(), streams[1:]):
+            arm_solver.set_random_stream(stream)
+
+    def sync_state(self) -> None:
+        """
+        Aggregates the statistics of the clusters again and rebuilds the state of the
+        solvers. The solvers are built again when the clusters were redefined.
+        """
+        self._bandit.sync_clusters()
+        if self._cluster_bandit is not self._bandit.get_cluster_bandit():
+            self._cluster_bandit = self._bandit.get_cluster_bandit()
+            self._cluster_solver = self._cluster_solver_factory(self._cluster_bandit)
+            if self._random_stream is not None:
+                self._cluster_solver.set_random_stream(self._random_stream.spawn(1)[0])
+            self._arm_solvers = {}
+        for solver in [self._cluster_solver, *self._arm_solvers.values()]:
+            solver.sync_state()
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'Hierarchical({self._cluster_solver})'
@@ -0,0 +1,284 @@
+"""Module for defining contextual solvers with a linear model of the rewards."""
+
+from abc import abstractmethod
+from typing import Union
+import numpy as np
+from mab.domain.arm import Arm
+from mab.domain.bandit import Bandit
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import Solver, SolverAction
+from mab.domain.statistics import SolverStatistics
+
+
+class LinearSolver(Solver):
+    """
+    Base class of the contextual solvers modelling the expected reward of each arm as a
+    linear function of the context (a feature vector) of the decision.
+
+    Each arm has its own ridge regression, whose inverse design matrix is updated with
+    the Sherman-Morrison formula in O(d^2) per reward instead of being re-inverted. The
+    upper triangles of the symmetric inverse design matrices are also stacked in a
+    (K, d(d+1)/2) array, with the off-diagonal terms doubled, so x^T A^-1 x is computed
+    for every arm with a single matrix product over half of the matrices, for one
+    context or a batch of them.
+
+    The rewards must be reported with the context of their decision, as they may arrive
+    late or interleaved with other decisions. The models are not derived from the
+    statistics of the bandit, so `sync_state` keeps them, and they cannot be exported
+    or loaded as SolverStatistics.
+
+    Args:
+        bandit (Bandit): The multi-armed bandit problem to solve.
+        num_features (int): The number of features of the contexts (d).
+        regularization (float): The ridge regularization, the initial design matrix of
+            every arm being the identity times this value.
+    """
+
+    def __init__(self, bandit: Bandit, num_features: int, regularization: float = 1.0) -> None:
+        if num_features < 1 or regularization <= 0:
+            raise ValueError("A linear solver needs a positive number of features "
+                             "and a positive regularization.")
+
+        super().__init__(bandit)
+        self.num_features = num_features
+        self.regularization = regularization
+        self._triangle = np.triu_indices(num_features)
+        # Weights doubling the off-diagonal terms of the packed upper triangles
+        self._triangle_weights = np.where(self._triangle[0] == self._triangle[1], 1.0, 2.0)
+        # The inverse design matrix, its packed upper triangle, the reward weighted
+        # contexts and the estimated coefficients of each arm
+        self._inverse_designs = np.zeros((0, num_features, num_features))
+        self._packed_inverse_designs = np.zeros((0, len(self._triangle_weights)))
+        self._reward_vectors = np.zeros((0, num_features))
+        self._coefficients = np.zeros((0, num_features))
+        self.sync_catalogue()
+
+    def select_arm(self, context: np.ndarray = None) -> Arm:
+        """
+        Selects an arm from the bandit for a context.
+
+        Args:
+            context (np.ndarray): The features of the decision.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self.select_arm_index(context))
+
+    def select_arm_index(self, context: np.ndarray = None) -> int:
+        """
+        Selects an arm from the bandit for a context.
+
+        The decision is reported as an exploitation when the selected arm also has the
+        highest estimated reward, as an exploration otherwise.
+
+        Args:
+            context (np.ndarray): The features of the decision.
+
+        Returns:
+            The index of the selected arm.
+
+        Raises:
+            ValueError: If the context is missing or does not have d features.
+        """
+        context = self._check_contexts(context, 1)
+        self.sync_catalogue()
+        means = self._coefficients @ context
+        scores = self._get_scores(means[np.newaxis], self._get_variances(context[np.newaxis]))[0]
+        selected_index = int(np.argmax(self._mask_free_slots(scores)))
+        means = self._mask_free_slots(means)
+        if means[selected_index] >= means.max():
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLOIT)
+        else:
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLORE)
+        return selected_index
+
+    def select_arm_indices(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Selects the arms of a batch of concurrent decisions, one per context.
+
+        Args:
+            contexts (np.ndarray): The (B, d) features of the decisions.
+
+        Returns:
+            An array with the index of the selected arm for each decision.
+        """
+        contexts = self._check_contexts(contexts, 2)
+        self.sync_catalogue()
+        means = contexts @ self._coefficients.T
+        return np.argmax(self._mask_free_slots(
+            self._get_scores(means, self._get_variances(contexts))), axis=1)
+
+    def update_state(self, arm: Arm, reward: float, context: np.ndarray = None) -> None:
+        """
+        Updates the model of the pulled arm with the reward obtained for a context.
+
+        Args:
+            arm (Arm): The arm that was pulled.
+            reward (float): The reward obtained.
+            context (np.ndarray): The features of the decision the reward was obtained
+                for. It is required, it only defaults to None to keep the signature of
+                `Solver.update_state`.
+
+        Raises:
+            ValueError: If the context is missing or does not have d features.
+        """
+        self.update_state_by_index(self._bandit.get_arm_index(arm), reward, context)
+
+    def update_state_by_index(self, arm_index: int, reward: float,
+                              context: np.ndarray) -> None:
+        """
+        Updates the model of the arm at the given index with a Sherman-Morrison update.
+
+        Args:
+            arm_index (int): The index of the pulled arm.
+            reward (float): The reward obtained.
+            context (np.ndarray): The features of the decision the reward was obtained for.
+
+        Raises:
+            ValueError: If the context is missing or does not have d features.
+        """
+        context = self._check_contexts(context, 1)
+        self.sync_catalogue()
+        inverse_design = self._inverse_designs[arm_index]
+        projection = inverse_design @ context
+        inverse_design -= np.outer(projection, projection) / (1.0 + context @ projection)
+        self._packed_inverse_designs[arm_index] = (inverse_design[self._triangle]
+                                                   * self._triangle_weights)
+        self._reward_vectors[arm_index] += reward * context
+        self._coefficients[arm_index] = inverse_design @ self._reward_vectors[arm_index]
+
+    def sync_state(self) -> None:
+        """Keeps the models, which are not derived from the statistics of the bandit."""
+        self.sync_catalogue()
+
+    def get_statistics(self) -> SolverStatistics:
+        """
+        Raises:
+            NotImplementedError: Always, the models are not sufficient statistics.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not learn from the statistics of the bandit.")
+
+    def load_statistics(self, statistics: SolverStatistics) -> None:
+        """
+        Raises:
+            NotImplementedError: Always, the models cannot be rebuilt from statistics.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not learn from the statistics of the bandit.")
+
+    def _get_variances(self, contexts: np.ndarray) -> np.ndarray:
+        """Returns x^T A^-1 x for every (B, d) context and arm, as a (B, K) array."""
+        products = contexts[:, self._triangle[0]] * contexts[:, self._triangle[1]]
+        # The incremental updates may leave tiny negative values from round-off, whose
+        # square root would be NaN
+        return np.maximum(products @ self._packed_inverse_designs.T, 0.0)
+
+    @abstractmethod
+    def _get_scores(self, means: np.ndarray, variances: np.ndarray) -> np.ndarray:
+        """Returns the (B, K) scores of the arms from their estimated means and variances."""
+
+    def _check_contexts(self, contexts: np.ndarray, ndim: int) -> np.ndarray:
+        if contexts is None:
+            raise ValueError("A contextual solver needs the context of each decision.")
+        contexts = np.asarray(contexts, dtype=np.float64)
+        if contexts.ndim != ndim or contexts.shape[-1] != self.num_features:
+            raise ValueError(f"The contexts must have {self.num_features} features.")
+        return contexts
+
+    def sync_catalogue(self) -> None:
+        """
+        Adds a model for the arms added to the bandit since the last update, and resets
+        the models of the slots of removed arms given to new arms.
+        """
+        added_slots = self._get_added_slots()
+        missing = self._bandit.get_slots_number() - len(self._inverse_designs)
+        if missing <= 0 and added_slots is None:
+            return
+
+        inverse_design = np.eye(self.num_features) / self.regularization
+        if missing > 0:
+            self._inverse_designs = np.concatenate(
+                (self._inverse_designs, np.tile(inverse_design, (missing, 1, 1))))
+            self._packed_inverse_designs = np.concatenate((
+                self._packed_inverse_designs,
+                np.tile(inverse_design[self._triangle] * self._triangle_weights, (missing, 1))))
+            self._reward_vectors = np.concatenate(
+                (self._reward_vectors, np.zeros((missing, self.num_features))))
+            self._coefficients = np.concatenate(
+                (self._coefficients, np.zeros((missing, self.num_features))))
+        if added_slots is not None:
+            self._inverse_designs[added_slots] = inverse_design
+            self._packed_inverse_designs[added_slots] = (inverse_design[self._triangle]
+                                                         * self._triangle_weights)
+            self._reward_vectors[added_slots] = 0.0
+            self._coefficients[added_slots] = 0.0
+
+
+class LinUCBSolver(LinearSolver):
+    """
+    Solver implementing the LinUCB algorithm with disjoint linear models.
+
+    The score of each arm is its estimated reward plus alpha times the standard
+    deviation of the estimate, sqrt(x^T A^-1 x).
+
+    Args:
+        bandit (Bandit): The multi-armed bandit problem to solve.
+        num_features (int): The number of features of the contexts (d).
+        alpha (float): The width of the confidence bounds.
+        regularization (float): The ridge regularization of the models.
+    """
+
+    def __init__(self, bandit: Bandit, num_features: int, alpha: float = 1.0,
+                 regularization: float = 1.0) -> None:
+        super().__init__(bandit, num_features, regularization)
+        self.alpha = alpha
+
+    def _get_scores(self, means: np.ndarray, variances: np.ndarray) -> np.ndarray:
+        return means + self.alpha * np.sqrt(variances)
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'LinUCB(alpha={self.alpha})'
+
+
+class LinearThomsonSamplingSolver(LinearSolver):
+    """
+    Solver implementing linear Thomson sampling with disjoint linear models.
+
+    The coefficients of each arm are drawn from N(theta, v^2 A^-1). Only their product
+    with the context matters, which is Gaussian with mean x^T theta and variance
+    v^2 x^T A^-1 x, so it is drawn directly instead of drawing the d coefficients.
+
+    Args:
+        bandit (Bandit): The multi-armed bandit problem to solve.
+        num_features (int): The number of features of the contexts (d).
+        scale (float): The scale (v) of the posteriors.
+        regularization (float): The ridge regularization of the models.
+        seed (Union[int, np.random.SeedSequence]): The seed of the generator used to
+            draw the posteriors. It is drawn from the random module when not given.
+    """
+
+    def __init__(self, bandit: Bandit, num_features: int, scale: float = 1.0,
+                 regularization: float = 1.0,
+                 seed: Union[int, np.random.SeedSequence] = None) -> None:
+        super().__init__(bandit, num_features, regularization)
+        self.scale = scale
+        self._random_stream = RandomStream(seed)
+
+    def get_random_stream(self) -> RandomStream:
+        """Returns the random stream the posteriors are drawn from."""
+        return self._random_stream
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """Sets the random stream the posteriors are drawn from."""
+        self._random_stream = random_stream
+
+    def _get_scores(self, means: np.ndarray, variances: np.ndarray) -> np.ndarray:
+        noise = self._random_stream.generator.standard_normal(means.shape)
+        return means + self.scale * np.sqrt(variances) * noise
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'LinearThomsonSampling(scale={self.scale})'
@@ -1,20 +1,45 @@
 """Module for defining ThomsonSampling based solvers."""
 
-from random import betavariate, choice
+from typing import List, Tuple, Union
+import numpy as np
 from mab.domain.arm import Arm
 from mab.domain.bandit import Bandit
-from mab.domain.solver import Solver
+from mab.domain.bandit_state import BatchBanditState
+from mab.domain.random_stream import RandomStream
+from mab.domain.solver import Solver, top_k
 
 # @TODO: Include the exploration/explotation parameter and SolverAction
 
 
 class ThomsonSamplingSolver(Solver):
-    """Thomson Sampling Solver implementation for multi-armed bandit problems."""
+    """
+    Thomson Sampling Solver implementation for multi-armed bandit problems.
+
+    The Beta posteriors of all the arms are stored as a (2, K) array of the alpha and
+    beta parameters, drawn with a single call to a NumPy generator, optionally for a
+    batch of concurrent decisions. The array is a view of a buffer grown by doubling, and
+    is replaced in a single assignment when arms are added, so lock free decisions
+    always read parameters of the same length.
+
+    The posterior of an arm added to the bandit starts from the prior and the statistics
+    the arm brings with it. With a warm start weight, it also gets that many pseudo
+    pulls at the mean reward of the bandit, so a new arm starts close to the catalogue
+    average instead of at the uniform prior. `set_prior` sets it explicitly, e.g. from
+    a similar arm.
+    """
+
+    # The decisions only read the posteriors, and the draws of a NumPy generator are
+    # serialised by the generator
+    lock_free_select: bool = True
+
+    _INITIAL_CAPACITY: int = 16
 
     def __init__(self, bandit: Bandit,
                  exploration_parameter: float = 0.0,
                  init_a: float = 1,
-                 init_b: float = 1) -> None:
+                 init_b: float = 1,
+                 seed: Union[int, np.random.SeedSequence] = None,
+                 warm_start: float = 0.0) -> None:
         """
         Initialize the ThomsonSamplingSolver.
 
@@ -23,12 +48,23 @@ class ThomsonSamplingSolver(Solver):
                 between exploration and exploitation. A higher value encourages more exploration.
             init_a (float): The initial value of the alpha parameter of the Beta distribution.
             init_b (float): The initial value of the beta parameter of the Beta distribution.
+            seed (Union[int, np.random.SeedSequence]): The seed of the generator used to
+                draw the posteriors. It is drawn from the random module when not given.
+            warm_start (float): The number of pseudo pulls at the mean reward of the
+                bandit added to the prior of the arms added to the bandit later on.
 
         """
         super().__init__(bandit)
         self.exploration_parameter = exploration_parameter
-        self._alpha = [init_a] * bandit.get_arms_number()
-        self._beta = [init_b] * bandit.get_arms_number()
+        self.init_a = init_a
+        self.init_b = init_b
+        self.warm_start = warm_start
+        num_slots = bandit.get_slots_number()
+        self._buffer = np.empty((2, 0), dtype=np.float64)
+        self._posteriors = self._buffer
+        self._posteriors = self._reserve(num_slots)[:, :num_slots]
+        self._random_stream = RandomStream(seed)
+        self._rng = self._random_stream.generator
 
     def select_arm(self) -> Arm:
         """
@@ -38,20 +74,332 @@ class ThomsonSamplingSolver(Solver):
             The selected arm.
 
         """
-        samples = [betavariate(self._alpha[i], self._beta[i])
-                   for i in range(self._bandit.get_arms_number())]
-        max_sample = max(samples)
-        max_indices = [i for i, sample in enumerate(
-            samples) if sample == max_sample]
-        selected_arm_index = choice(max_indices)
-        return self._bandit.get_arm(selected_arm_index)
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit using the Thomson Sampling algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        self.sync_catalogue()
+        return self.select_arm_index_lock_free()
+
+    def select_arm_index_lock_free(self) -> int:
+        """
+        Selects an arm from the posteriors as of the last catalogue update, without
+        writing to the solver.
+
+        Returns:
+            The index of the selected arm.
+        """
+        alpha, beta = self._posteriors
+        return int(np.argmax(self._mask_free_slots(self._rng.beta(alpha, beta))))
+
+    def select_slate_indices(self, slate_size: int) -> np.ndarray:
+        """
+        Selects the slate of arms with the highest draws of their Beta posteriors.
+
+        Args:
+            slate_size (int): The number of arms of the slate (k).
+
+        Returns:
+            The indices of the selected arms, best ranked first.
+        """
+        self.sync_catalogue()
+        alpha, beta = self._posteriors
+        return top_k(self._mask_free_slots(self._rng.beta(alpha, beta)), slate_size)
+
+    def select_arm_indices(self, batch_size: int) -> np.ndarray:
+        """
+        Selects the arms of a batch of concurrent decisions from one draw matrix.
+
+        Each decision gets its own independent draw of the K posteriors, so the batch
+        behaves like `batch_size` calls to `select_arm` with the same state.
+
+        Args:
+            batch_size (int): The number of decisions (B).
+
+        Returns:
+            An array with the index of the selected arm for each decision.
+        """
+        self.sync_catalogue()
+        alpha, beta = self._posteriors
+        samples = self._rng.beta(alpha, beta, size=(batch_size, len(alpha)))
+        return np.argmax(self._mask_free_slots(samples), axis=1)
+
+    def select_arms(self, batch_size: int) -> List[Arm]:
+        """
+        Selects the arms of a batch of concurrent decisions from one draw matrix.
+
+        Args:
+            batch_size (int): The number of decisions (B).
+
+        Returns:
+            The selected arm for each decision.
+        """
+        return [self._bandit.get_arm(index)
+                for index in self.select_arm_indices(batch_size).tolist()]
+
+    def get_random_stream(self) -> RandomStream:
+        """Returns the random stream the posteriors are drawn from."""
+        return self._random_stream
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """Sets the random stream the posteriors are drawn from."""
+        self._random_stream = random_stream
+        self._rng = random_stream.generator
+
+    def get_posteriors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the alpha and beta parameters of the Beta posterior of each arm.
+
+        The arrays are views of the solver, so updating them updates the solver until
+        arms are added to the bandit.
+        """
+        self.sync_catalogue()
+        alpha, beta = self._posteriors
+        return alpha, beta
+
+    def set_prior(self, arm_index: int, alpha: float, beta: float) -> None:
+        """
+        Sets the posterior of an arm, e.g. to warm start a new arm from a similar one.
+
+        Args:
+            arm_index (int): The index of the arm.
+            alpha (float): The alpha parameter of the Beta distribution.
+            beta (float): The beta parameter of the Beta distribution.
+        """
+        self.sync_catalogue()
+        self._posteriors[:, arm_index] = alpha, beta
 
     def update_state(self, arm: Arm, reward: float) -> None:
         """Updates the state of the solver based on the reward obtained from pulling the arm."""
-        arm_index = self._bandit.get_arm_index(arm)
-        self._alpha[arm_index] += reward
-        self._beta[arm_index] += (1 - reward)
+        self.update_state_by_index(self._bandit.get_arm_index(arm), reward)
+
+    def update_state_by_index(self, arm_index: int, reward: float) -> None:
+        """Updates the posterior of the arm at the given index with a reward."""
+        self.sync_catalogue()
+        self._posteriors[0, arm_index] += reward
+        self._posteriors[1, arm_index] += 1 - reward
+
+    def sync_state(self) -> None:
+        """Rebuilds the posteriors from the pull counts and reward sums of the bandit."""
+        state = self._bandit.get_state()
+        num_slots = len(state)
+        buffer = np.empty((2, max(num_slots, self._INITIAL_CAPACITY)), dtype=np.float64)
+        buffer[0, :num_slots] = self.init_a + state.reward_sums
+        buffer[1, :num_slots] = self.init_b + state.pull_counts - state.reward_sums
+        self._buffer = buffer
+        self._posteriors = buffer[:, :num_slots]
+        self._get_added_slots()
+
+    def sync_catalogue(self) -> None:
+        """
+        Makes room for the arms added to the bandit since the last update, starting
+        their posterior from the prior, their own statistics and the warm start.
+        """
+        added_slots = self._get_added_slots()
+        if added_slots is None:
+            return
+
+        # The new posteriors are written before they are published
+        num_slots = self._bandit.get_slots_number()
+        buffer = self._reserve(num_slots)
+        state = self._bandit.get_state()
+        reward_sums = state.reward_sums[added_slots]
+        alpha = self.init_a + reward_sums
+        beta = self.init_b + state.pull_counts[added_slots] - reward_sums
+        if self.warm_start > 0 and state.total_pulls > 0:
+            mean_reward = float(state.reward_sums.sum()) / state.total_pulls
+            alpha += self.warm_start * mean_reward
+            beta += self.warm_start * (1 - mean_reward)
+        buffer[0, added_slots] = alpha
+        buffer[1, added_slots] = beta
+        self._posteriors = buffer[:, :num_slots]
+
+    def _reserve(self, num_slots: int) -> np.ndarray:
+        """
+        Returns the buffer of the posteriors with room for `num_slots` slots, the slots
+        past the published ones starting from the prior. The published posteriors are
+        not modified.
+        """
+        num_published = self._posteriors.shape[1]
+        buffer = self._buffer
+        if num_slots > buffer.shape[1]:
+            buffer = np.empty((2, max(num_slots, self._INITIAL_CAPACITY, 2 * buffer.shape[1])),
+                              dtype=np.float64)
+            buffer[:, :num_published] = self._posteriors
+            self._buffer = buffer
+        buffer[0, num_published:num_slots] = self.init_a
+        buffer[1, num_published:num_slots] = self.init_b
+        return buffer
+
+    def update_state_batch(self, arm_indices: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Updates the posteriors with a stream of rewards in a single vectorised pass.
+
+        Args:
+            arm_indices (np.ndarray): The index of the arm of each reward. Repeated
+                indices are accumulated.
+            rewards (np.ndarray): The rewards obtained.
+        """
+        self.sync_catalogue()
+        rewards = np.asarray(rewards, dtype=np.float64)
+        np.add.at(self._posteriors[0], arm_indices, rewards)
+        np.add.at(self._posteriors[1], arm_indices, 1 - rewards)
+
+    def select_arms_batch(self, state: BatchBanditState,
+                          rng: np.random.Generator) -> np.ndarray:
+        """
+        Selects an arm for every replication drawing all the Beta posteriors at once.
+
+        Returns:
+            The index of the selected arm for each replication.
+        """
+        samples = rng.beta(self.init_a + state.reward_sums,
+                           self.init_b + state.pull_counts - state.reward_sums)
+        return np.argmax(samples, axis=1)
 
     def __str__(self):
         """Returns the name of the solver."""
         return f'Thomson Sampling(c={self.exploration_parameter})'
+
+
+class DiscountedThomsonSamplingSolver(Solver):
+    """
+    Discounted Thomson Sampling Solver for non-stationary bandit problems.
+
+    At every step, the successes and failures of all the arms are multiplied by a
+    discount factor before the new reward is added, so the posteriors forget old
+    rewards and track arms whose reward distribution drifts. Instead of decaying the K
+    arms at every step, the statistics are stored divided by a running scale (the
+    discount raised to the number of updates) and only rescaled when the scale gets
+    too small, so each update is O(1).
+    """
+
+    stationary: bool = False
+
+    # The stored statistics are rescaled once the scale drops below this value
+    _MIN_SCALE: float = 1e-100
+
+    def __init__(self, bandit: Bandit,
+                 discount: float = 0.99,
+                 init_a: float = 1,
+                 init_b: float = 1,
+                 seed: Union[int, np.random.SeedSequence] = None) -> None:
+        """
+        Initialize the DiscountedThomsonSamplingSolver.
+
+        Args:
+            discount (float): The factor the past rewards are multiplied by at every step.
+                1 does not forget anything.
+            init_a (float): The alpha parameter of the prior Beta distribution.
+            init_b (float): The beta parameter of the prior Beta distribution.
+            seed (Union[int, np.random.SeedSequence]): The seed of the generator used to
+                draw the posteriors. It is drawn from the random module when not given.
+
+        Raises:
+            ValueError: If the discount is not in (0, 1].
+        """
+        if not 0 < discount <= 1:
+            raise ValueError("The discount must be in (0, 1].")
+
+        super().__init__(bandit)
+        self.discount = discount
+        self.init_a = init_a
+        self.init_b = init_b
+        self._scale = 1.0
+        self._successes = np.zeros(bandit.get_slots_number(), dtype=np.float64)
+        self._failures = np.zeros(bandit.get_slots_number(), dtype=np.float64)
+        self._random_stream = RandomStream(seed)
+        self._rng = self._random_stream.generator
+
+    def select_arm(self) -> Arm:
+        """
+        Selects an arm from the bandit using the Discounted Thomson Sampling algorithm.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit using the Discounted Thomson Sampling algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        return int(np.argmax(self._mask_free_slots(self._rng.beta(*self.get_posteriors()))))
+
+    def select_arm_indices(self, batch_size: int) -> np.ndarray:
+        """
+        Selects the arms of a batch of concurrent decisions from one draw matrix.
+
+        Args:
+            batch_size (int): The number of decisions (B).
+
+        Returns:
+            An array with the index of the selected arm for each decision.
+        """
+        alpha, beta = self.get_posteriors()
+        return np.argmax(self._mask_free_slots(
+            self._rng.beta(alpha, beta, size=(batch_size, len(alpha)))), axis=1)
+
+    def get_posteriors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the alpha and beta parameters of the discounted Beta posterior of each arm.
+        """
+        self.sync_catalogue()
+        return (self.init_a + self._scale * self._successes,
+                self.init_b + self._scale * self._failures)
+
+    def get_random_stream(self) -> RandomStream:
+        """Returns the random stream the posteriors are drawn from."""
+        return self._random_stream
+
+    def set_random_stream(self, random_stream: RandomStream) -> None:
+        """Sets the random stream the posteriors are drawn from."""
+        self._random_stream = random_stream
+        self._rng = random_stream.generator
+
+    def update_state(self, arm: Arm, reward: float) -> None:
+        """Discounts the past rewards and adds the reward obtained from pulling the arm."""
+        self.update_state_by_index(self._bandit.get_arm_index(arm), reward)
+
+    def update_state_by_index(self, arm_index: int, reward: float) -> None:
+        """Discounts the past rewards and adds the reward of the arm at the given index."""
+        self.sync_catalogue()
+        self._scale *= self.discount
+        if self._scale < self._MIN_SCALE:
+            self._successes *= self._scale
+            self._failures *= self._scale
+            self._scale = 1.0
+        self._successes[arm_index] += reward / self._scale
+        self._failures[arm_index] += (1 - reward) / self._scale
+
+    def sync_state(self) -> None:
+        """Forgets the discounted rewards, which cannot be rebuilt from the lifetime ones."""
+        self._scale = 1.0
+        self._successes = np.zeros(self._bandit.get_slots_number(), dtype=np.float64)
+        self._failures = np.zeros(self._bandit.get_slots_number(), dtype=np.float64)
+
+    def sync_catalogue(self) -> None:
+        """
+        Makes room for the arms added to the bandit since the last update, and forgets
+        the rewards of the removed arms whose slot was given to a new arm.
+        """
+        added_slots = self._get_added_slots()
+        missing = self._bandit.get_slots_number() - len(self._successes)
+        if missing > 0:
+            self._successes = np.concatenate((self._successes, np.zeros(missing)))
+            self._failures = np.concatenate((self._failures, np.zeros(missing)))
+        if added_slots is not None:
+            self._successes[added_slots] = 0.0
+            self._failures[added_slots] = 0.0
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'Discounted Thomson Sampling(discount={self.discount})'
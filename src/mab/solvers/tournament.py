@@ -0,0 +1,140 @@
+"""Module for the kinetic tournament tree used by the incremental UCB solvers."""
+from math import inf, sqrt
+from typing import List
+
+
+class KineticTournament:
+    """
+    Tournament tree returning the arm with the highest upper confidence bound.
+
+    The index of arm i is `mean_i + sqrt(drift / max(1, n_i)) * c`, where the drift
+    (2 * log(t) for UCB1) only grows. Every internal node stores the winner of its
+    subtree and the drift at which its loser may overtake it (the failure time of
+    its certificate). Updating an arm refreshes the O(log K) nodes on its path, and
+    advancing the drift only recomputes the nodes whose certificate has failed.
+
+    Ties are resolved in favour of the lowest arm index, so the winner is always the
+    same arm an argmax over all the indices would return. Arms with a mean of -inf are
+    masked: they only win when every arm of the subtree is masked.
+    """
+
+    # Relative margin used to recheck a certificate slightly before its failure time
+    _MARGIN: float = 1e-6
+    # Index gap under which two indices are considered tied up to rounding
+    _TIE: float = 1e-12
+
+    def __init__(self, means: List[float], pull_counts: List[int],
+                 exploration_parameter: float, drift: float) -> None:
+        """
+        Builds the tree in O(K).
+
+        Args:
+            means (List[float]): The estimated reward of each arm.
+            pull_counts (List[int]): The number of pulls of each arm.
+            exploration_parameter (float): The exploration parameter (c).
+            drift (float): The current drift of the exploration term.
+        """
+        self._num_arms = len(means)
+        self._size = 1
+        while self._size < self._num_arms:
+            self._size *= 2
+
+        self._means = list(means) + [0.0] * (self._size - self._num_arms)
+        self._pull_counts = [max(1, count) for count in pull_counts]
+        self._pull_counts += [1] * (self._size - self._num_arms)
+        self._exploration_parameter = exploration_parameter
+        self._drift = drift
+
+        self._winners = [-1] * (2 * self._size)
+        self._failures = [inf] * (2 * self._size)
+        self._min_failures = [inf] * (2 * self._size)
+        self._winners[self._size:self._size + self._num_arms] = range(self._num_arms)
+        for node in range(self._size - 1, 0, -1):
+            self._recompute(node)
+
+    def index(self, arm_index: int, drift: float) -> float:
+        """Returns the upper confidence bound of an arm for the given drift."""
+        exploration_term = sqrt(drift / self._pull_counts[arm_index])
+        return self._means[arm_index] + exploration_term * self._exploration_parameter
+
+    def update(self, arm_index: int, mean: float, pull_counts: int) -> None:
+        """
+        Updates the statistics of an arm and the nodes on its path to the root.
+
+        Args:
+            arm_index (int): The index of the arm.
+            mean (float): The new estimated reward of the arm.
+            pull_counts (int): The new number of pulls of the arm.
+        """
+        self._means[arm_index] = mean
+        self._pull_counts[arm_index] = max(1, pull_counts)
+        node = (self._size + arm_index) // 2
+        while node >= 1:
+            self._recompute(node)
+            node //= 2
+
+    def winner(self, drift: float) -> int:
+        """
+        Returns the arm with the highest index once the drift has been advanced.
+
+        Args:
+            drift (float): The current drift. It must not decrease between calls.
+        """
+        self._drift = drift
+        self._advance(1)
+        return self._winners[1]
+
+    def _advance(self, node: int) -> None:
+        if self._min_failures[node] > self._drift or node >= self._size:
+            return
+        self._advance(2 * node)
+        self._advance(2 * node + 1)
+        self._recompute(node)
+
+    def _recompute(self, node: int) -> None:
+        left, right = self._winners[2 * node], self._winners[2 * node + 1]
+        if right == -1 or left == -1:
+            winner, failure = max(left, right), inf
+        else:
+            left_index = self.index(left, self._drift)
+            right_index = self.index(right, self._drift)
+            if left_index >= right_index:
+                winner, failure = left, self._failure_time(left, right, left_index, right_index)
+            else:
+                winner, failure = right, self._failure_time(right, left, right_index, left_index)
+
+        self._winners[node] = winner
+        self._failures[node] = failure
+        self._min_failures[node] = min(failure,
+                                       self._min_failures[2 * node],
+                                       self._min_failures[2 * node + 1])
+
+    def _failure_time(self, winner: int, loser: int,
+                      winner_index: float, loser_index: float) -> float:
+        """Returns the drift at which the loser may overtake the winner."""
+        if self._means[loser] == -inf:
+            # Masked slots (mean -inf, e.g. free slots) never overtake, and the gap
+            # between two of them is NaN
+            return inf
+
+        mean_gap = self._means[winner] - self._means[loser]
+        if mean_gap == 0 and self._pull_counts[winner] == self._pull_counts[loser]:
+            # Both indices are computed from the same values, they never diverge
+            return inf
+
+        if winner_index - loser_index <= self._TIE * (abs(winner_index) + 1):
+            # Rounding may flip the comparison, recheck on every advance
+            return self._drift
+
+        winner_slope = self._exploration_parameter / sqrt(self._pull_counts[winner])
+        loser_slope = self._exploration_parameter / sqrt(self._pull_counts[loser])
+        slope_gap = loser_slope - winner_slope
+        if slope_gap <= 0:
+            return inf
+
+        if slope_gap <= self._MARGIN * abs(winner_slope) or mean_gap <= 0:
+            # Numerically too close to predict, recheck on every advance
+            return self._drift
+
+        crossing = (mean_gap / slope_gap) ** 2
+        return max(self._drift, crossing * (1 - self._MARGIN))
@@ -1,9 +1,13 @@
 """Module for defining Upper confidence bound based solvers."""
 
+from collections import deque
 from math import log, sqrt
+import numpy as np
 from mab.domain.arm import Arm
 from mab.domain.bandit import Bandit
-from mab.domain.solver import Solver, SolverAction
+from mab.domain.bandit_state import BatchBanditState
+from mab.domain.solver import Solver, SolverAction, top_k
+from mab.solvers.tournament import KineticTournament
 
 
 class UCB1Solver(Solver):
@@ -33,30 +37,286 @@ class UCB1Solver(Solver):
         Returns:
             The selected arm.
         """
-        arms = self._bandit.get_arms()
-        total_pulls = sum(arm.get_pull_counts() for arm in arms)
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit to pull using the UCB1 algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        state = self._bandit.get_state()
+        total_pulls = state.total_pulls
 
         if total_pulls == 0:
-            return arms[0]  # Select the first arm if no pulls have been made
+            # Select the first arm if no pulls have been made
+            return int(np.argmax(state.active))
 
-        ucb_values = []
-        for arm in arms:
-            exploration_term = sqrt(
-                (2 * log(total_pulls)) / max(1, arm.get_pull_counts()))
-            exploration_bonus = exploration_term * self.exploration_parameter
-            ucb_value = arm.get_cumulative_reward() + exploration_bonus
-            ucb_values.append(ucb_value)
+        exploration_terms = np.sqrt(
+            (2 * log(total_pulls)) / np.maximum(1, state.pull_counts))
+        exploration_bonuses = exploration_terms * self.exploration_parameter
+        ucb_values = self._mask_free_slots(state.cumulative_rewards + exploration_bonuses)
 
-        max_ucb_index = ucb_values.index(max(ucb_values))
-        selected_arm = arms[max_ucb_index]
+        max_ucb_index = int(np.argmax(ucb_values))
 
-        if exploration_bonus > 0:
-            self.update_solver_history(selected_arm, SolverAction.EXPLORE)
+        if exploration_bonuses[max_ucb_index] > 0:
+            self.update_solver_history_by_index(max_ucb_index, SolverAction.EXPLORE)
         else:
-            self.update_solver_history(selected_arm, SolverAction.EXPLOIT)
+            self.update_solver_history_by_index(max_ucb_index, SolverAction.EXPLOIT)
+
+        return max_ucb_index
+
+    def select_slate_indices(self, slate_size: int) -> np.ndarray:
+        """
+        Selects the slate of arms with the highest upper confidence bounds.
+
+        Args:
+            slate_size (int): The number of arms of the slate (k).
+
+        Returns:
+            The indices of the selected arms, best ranked first.
+        """
+        state = self._bandit.get_state()
+        if state.total_pulls == 0:
+            # Select the first arms if no pulls have been made
+            return top_k(self._mask_free_slots(-np.arange(len(state), dtype=np.float64)),
+                         slate_size)
+
+        exploration_bonuses = self.exploration_parameter * np.sqrt(
+            (2 * log(state.total_pulls)) / np.maximum(1, state.pull_counts))
+        slate = top_k(self._mask_free_slots(state.cumulative_rewards + exploration_bonuses),
+                      slate_size)
+        for arm_index in slate.tolist():
+            if exploration_bonuses[arm_index] > 0:
+                self.update_solver_history_by_index(arm_index, SolverAction.EXPLORE)
+            else:
+                self.update_solver_history_by_index(arm_index, SolverAction.EXPLOIT)
+        return slate
 
-        return selected_arm
+    def select_arms_batch(self, state: BatchBanditState,
+                          rng: np.random.Generator) -> np.ndarray:
+        """
+        Selects an arm for every replication using the UCB1 algorithm.
+
+        Returns:
+            The index of the selected arm for each replication.
+        """
+        if state.total_pulls == 0:
+            return np.zeros(state.replications, dtype=np.int64)
+
+        exploration_terms = np.sqrt(
+            (2 * log(state.total_pulls)) / np.maximum(1, state.pull_counts))
+        ucb_values = state.means + exploration_terms * self.exploration_parameter
+        return np.argmax(ucb_values, axis=1)
 
     def __str__(self):
         """Returns the name of the solver."""
         return f'UCB1(c={self.exploration_parameter})'
+
+
+class IncrementalUCB1Solver(UCB1Solver):
+    """
+    Solver implementing the UCB1 algorithm with O(log K) decisions.
+
+    Keeps the total number of pulls as a running counter and the arms in a kinetic
+    tournament tree, so each decision only refreshes the pulled arm and the nodes
+    whose ranking may have changed with the growth of log(t). The selected arms are
+    the same ones the UCB1Solver selects.
+
+    Args:
+        bandit (Bandit): The multi-armed bandit problem to solve.
+        exploration_parameter (float): The exploration parameter (c) for UCB1.
+    """
+
+    def __init__(self, bandit: Bandit, exploration_parameter: float) -> None:
+        super().__init__(bandit, exploration_parameter)
+        self._total_pulls = 0
+        self._tournament = None
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit to pull using the UCB1 algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        state = self._bandit.get_state()
+        self.sync_catalogue()
+        if self._tournament is None or self._total_pulls != state.total_pulls:
+            # The bandit was reset, pulled behind the back of the solver or its arms changed
+            self._rebuild()
+
+        if self._total_pulls == 0:
+            # Select the first arm if no pulls have been made
+            return int(np.argmax(state.active))
+
+        drift = 2 * log(self._total_pulls)
+        selected_index = self._tournament.winner(drift)
+
+        exploration_term = sqrt(drift / max(1, state.pull_counts[selected_index]))
+        if exploration_term * self.exploration_parameter > 0:
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLORE)
+        else:
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLOIT)
+
+        return selected_index
+
+    def update_state(self, arm: Arm, reward: float) -> None:
+        """Refreshes the index of the pulled arm in the tournament tree."""
+        self.sync_catalogue()
+        if self._tournament is None:
+            return
+
+        self._total_pulls += 1
+        self._tournament.update(self._bandit.get_arm_index(arm),
+                                arm.get_cumulative_reward(), arm.get_pull_counts())
+
+    def sync_state(self) -> None:
+        """Discards the tournament tree, which is rebuilt by the next decision."""
+        self._tournament = None
+
+    def sync_catalogue(self) -> None:
+        """Discards the tournament tree when the arms of the bandit changed."""
+        if self._get_added_slots() is not None:
+            self._tournament = None
+
+    def _rebuild(self) -> None:
+        state = self._bandit.get_state()
+        self._total_pulls = state.total_pulls
+        self._catalogue_version = state.version
+        drift = 2 * log(self._total_pulls) if self._total_pulls > 0 else 0.0
+        # The free slots never win, whatever their exploration term
+        self._tournament = KineticTournament(
+            self._mask_free_slots(state.cumulative_rewards).tolist(),
+            state.pull_counts.tolist(), self.exploration_parameter, drift)
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'IncrementalUCB1(c={self.exploration_parameter})'
+
+
+class SlidingWindowUCBSolver(Solver):
+    """
+    Solver implementing the Sliding-Window UCB algorithm for non-stationary bandits.
+
+    The upper confidence bounds are computed from the last `window` rewards only, so the
+    solver tracks arms whose reward distribution drifts. The rewards of the window are
+    kept in a ring buffer along with the windowed pull counts and reward sums of each
+    arm: each update adds the new reward and subtracts the one leaving the window, in
+    constant time. Arms without pulls in the window are selected first.
+
+    Args:
+        bandit (Bandit): The multi-armed bandit problem to solve.
+        exploration_parameter (float): The exploration parameter (c).
+        window (int): The number of most recent rewards the statistics are computed from.
+
+    Raises:
+        ValueError: If the window is not a positive integer.
+    """
+
+    stationary: bool = False
+
+    def __init__(self, bandit: Bandit, exploration_parameter: float, window: int) -> None:
+        if window < 1:
+            raise ValueError("The window must be a positive integer.")
+
+        super().__init__(bandit)
+        self.exploration_parameter = exploration_parameter
+        self.window = window
+        self._num_updates = 0
+        # The (arm index, reward) of the rewards in the window, oldest first
+        self._window = deque(maxlen=window)
+        self._pull_counts = np.zeros(bandit.get_slots_number(), dtype=np.int64)
+        self._reward_sums = np.zeros(bandit.get_slots_number(), dtype=np.float64)
+
+    def select_arm(self) -> Arm:
+        """
+        Selects an arm from the bandit to pull using the Sliding-Window UCB algorithm.
+
+        Returns:
+            The selected arm.
+        """
+        return self._bandit.get_arm(self.select_arm_index())
+
+    def select_arm_index(self) -> int:
+        """
+        Selects an arm from the bandit to pull using the Sliding-Window UCB algorithm.
+
+        Returns:
+            The index of the selected arm.
+        """
+        self.sync_catalogue()
+        unpulled = self._pull_counts == 0
+        state = self._bandit.get_state()
+        if state.num_free:
+            unpulled &= state.active
+        unpulled = np.flatnonzero(unpulled)
+        if len(unpulled) > 0:
+            selected_index = int(unpulled[0])
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLORE)
+            return selected_index
+
+        # Only the free slots may have no pulls in the window here
+        pull_counts = np.maximum(1, self._pull_counts)
+        exploration_bonuses = self.exploration_parameter * np.sqrt(
+            (2 * log(min(self._num_updates, self.window))) / pull_counts)
+        ucb_values = self._reward_sums / pull_counts + exploration_bonuses
+        selected_index = int(np.argmax(self._mask_free_slots(ucb_values)))
+
+        if exploration_bonuses[selected_index] > 0:
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLORE)
+        else:
+            self.update_solver_history_by_index(selected_index, SolverAction.EXPLOIT)
+
+        return selected_index
+
+    def update_state(self, arm: Arm, reward: float) -> None:
+        """Adds the reward to the window, dropping the oldest one when it is full."""
+        self.update_state_by_index(self._bandit.get_arm_index(arm), reward)
+
+    def update_state_by_index(self, arm_index: int, reward: float) -> None:
+        """Adds the reward of the arm at the given index to the window."""
+        self.sync_catalogue()
+        if len(self._window) == self.window:
+            old_index, old_reward = self._window.popleft()
+            self._pull_counts[old_index] -= 1
+            self._reward_sums[old_index] -= old_reward
+            if self._pull_counts[old_index] == 0:
+                # Do not carry rounding errors over to the next rewards of the arm
+                self._reward_sums[old_index] = 0.0
+        self._window.append((arm_index, reward))
+        self._pull_counts[arm_index] += 1
+        self._reward_sums[arm_index] += reward
+        self._num_updates += 1
+
+    def sync_state(self) -> None:
+        """Empties the window, which cannot be rebuilt from the lifetime statistics."""
+        self._num_updates = 0
+        self._window.clear()
+        self._pull_counts = np.zeros(self._bandit.get_slots_number(), dtype=np.int64)
+        self._reward_sums = np.zeros(self._bandit.get_slots_number(), dtype=np.float64)
+        self._get_added_slots()
+
+    def sync_catalogue(self) -> None:
+        """
+        Makes room for the arms added to the bandit since the last update, and drops
+        from the window the rewards of the removed arms whose slot was given to a new arm.
+        """
+        added_slots = self._get_added_slots()
+        num_arms = self._bandit.get_slots_number()
+        if num_arms > len(self._pull_counts):
+            self._pull_counts = np.concatenate(
+                (self._pull_counts, np.zeros(num_arms - len(self._pull_counts), np.int64)))
+            self._reward_sums = np.concatenate(
+                (self._reward_sums, np.zeros(num_arms - len(self._reward_sums))))
+        if added_slots is not None and self._pull_counts[added_slots].any():
+            recycled_slots = set(added_slots.tolist())
+            self._window = deque(((arm_index, reward) for arm_index, reward in self._window
+                                  if arm_index not in recycled_slots), maxlen=self.window)
+            self._pull_counts[added_slots] = 0
+            self._reward_sums[added_slots] = 0.0
+
+    def __str__(self):
+        """Returns the name of the solver."""
+        return f'SlidingWindowUCB(c={self.exploration_parameter}, window={self.window})'
@@ -0,0 +1,53 @@
+"""
+Test cases for the benchmark suite.
+"""
+import random
+import unittest
+from benchmarks.suite import find_regressions, make_bandit, measure, run_suite
+
+# Constants for the tests
+BASELINE = {"fast": {"seconds_per_op": 1.0}, "slow": {"seconds_per_op": 1.0}}
+
+
+class SuiteTestCase(unittest.TestCase):
+    """Test cases for the benchmark suite."""
+
+    def test_measure(self):
+        """Test that a benchmark reports consistent measures."""
+        result = measure(lambda: [0] * 1000, number=10, repeat=2)
+        self.assertGreater(result.seconds_per_op, 0)
+        self.assertAlmostEqual(result.ops_per_second * result.seconds_per_op, 1)
+        self.assertGreater(result.peak_bytes, 0)
+
+    def test_run_suite(self):
+        """Test that the suite benchmarks every operation."""
+        results = run_suite([5], number=2, num_iterations=5)
+        self.assertIn("select_arm/UCB1/K=5", results)
+        self.assertIn("pull_arm/K=5", results)
+        self.assertIn("simulator/ThomsonSampling/K=5/T=5", results)
+
+    def test_make_bandit(self):
+        """Test that the bandits are seeded without touching the random module."""
+        random.seed(0)
+        expected = random.random()
+        random.seed(0)
+        bandit = make_bandit(5, seed=1)
+        self.assertEqual(random.random(), expected)
+
+        probabilities = [arm.success_probability for arm in bandit.get_arms()]
+        self.assertEqual(probabilities,
+                         [arm.success_probability for arm in make_bandit(5, seed=1).get_arms()])
+        self.assertNotEqual(probabilities,
+                            [arm.success_probability for arm in make_bandit(5, seed=2).get_arms()])
+
+    def test_find_regressions(self):
+        """Test that only the benchmarks slower than the threshold are reported."""
+        results = {"fast": {"seconds_per_op": 1.1}, "slow": {"seconds_per_op": 1.5},
+                   "new": {"seconds_per_op": 9.0}}
+        regressions = find_regressions(results, BASELINE, threshold=0.2)
+        self.assertEqual([name for name, _ in regressions], ["slow"])
+        self.assertAlmostEqual(regressions[0][1], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
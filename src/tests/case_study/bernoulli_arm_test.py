@@ -0,0 +1,59 @@
+"""
+Test cases for the BernoulliArm class.
+"""
+import random
+import unittest
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+
+# Constants for the tests
+SUCCESS_PROBABILITY: float = 0.3
+PULLS: int = 1000
+
+
+class BernoulliArmTestCase(unittest.TestCase):
+
+    '''Test cases for the BernoulliArm class.'''
+
+    def setUp(self):
+        random.seed(0)
+        self.arm = BernoulliArm(SUCCESS_PROBABILITY)
+        self.bandit = Bandit([self.arm])
+
+    def test_exact_mean(self):
+        '''Test that the mean is derived from the exact number of successes.'''
+        rewards = [self.bandit.pull_arm(self.arm) for _ in range(PULLS)]
+
+        self.assertEqual(self.arm.get_reward_sum(), sum(rewards))
+        self.assertEqual(self.arm.get_cumulative_reward(), sum(rewards) / PULLS)
+        self.assertEqual(self.arm.get_mean(), sum(rewards) / PULLS)
+
+    def test_long_horizon(self):
+        '''Test that the mean does not drift after a huge number of pulls.'''
+        self.arm.set_pull_counts(10**12)
+        self.arm.set_reward_sum(3 * 10**11)
+        self.bandit.record_reward_by_index(0, 1)
+
+        self.assertEqual(self.arm.get_cumulative_reward(), (3 * 10**11 + 1) / (10**12 + 1))
+
+    def test_pull_many(self):
+        '''Test that bulk pulls update the statistics at once.'''
+        successes = self.arm.pull_many(PULLS)
+
+        self.assertEqual(self.arm.get_pull_counts(), PULLS)
+        self.assertEqual(self.arm.get_reward_sum(), successes)
+        self.assertEqual(self.arm.get_squared_reward_sum(), successes)
+        self.assertEqual(self.arm.get_cumulative_reward(), successes / PULLS)
+        self.assertEqual(self.bandit.get_state().total_pulls, PULLS)
+        self.assertAlmostEqual(successes / PULLS, SUCCESS_PROBABILITY, delta=0.06)
+
+    def test_pull_many_reproducible(self):
+        '''Test that bulk pulls are reproducible with the seed of the random module.'''
+        random.seed(1)
+        first = BernoulliArm(SUCCESS_PROBABILITY).pull_many(PULLS)
+        random.seed(1)
+        self.assertEqual(BernoulliArm(SUCCESS_PROBABILITY).pull_many(PULLS), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Test cases for the drifting Bernoulli arms.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.case_study.drifting_arms import PiecewiseStationaryArm, RandomWalkArm
+from mab.domain.bandit import Bandit
+from mab.domain.random_stream import RandomStream
+from mab.simulator.simulator import Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+
+# Constants for the tests
+CHANGE_EVERY: int = 50
+PULLS: int = 1000
+SEED: int = 5
+
+
+class PiecewiseStationaryArmTestCase(unittest.TestCase):
+
+    '''Test cases for the PiecewiseStationaryArm class.'''
+
+    def test_periods(self):
+        '''Test that the success probability follows the steps of the bandit.'''
+        arm = PiecewiseStationaryArm([1.0, 0.0], CHANGE_EVERY, RandomStream(SEED))
+        other_arm = BernoulliArm(0.5, RandomStream(SEED))
+        bandit = Bandit([arm, other_arm])
+
+        rewards = []
+        for step in range(4 * CHANGE_EVERY):
+            # Every other step pulls the other arm, which also advances the time
+            if step % 2 == 0:
+                rewards.append((step, bandit.pull_arm(arm)))
+            else:
+                bandit.pull_arm(other_arm)
+        self.assertTrue(all(reward == (1 if (step // CHANGE_EVERY) % 2 == 0 else 0)
+                            for step, reward in rewards))
+
+        bandit.reset()
+        self.assertEqual(bandit.pull_arm(arm), 1)
+        self.assertFalse(arm.stationary)
+
+        # Removing an arm does not move the schedule back
+        for _ in range(CHANGE_EVERY):
+            bandit.pull_arm(other_arm)
+        bandit.remove_arm(other_arm)
+        self.assertEqual(bandit.pull_arm(arm), 0)
+        with self.assertRaises(ValueError):
+            PiecewiseStationaryArm([], CHANGE_EVERY)
+
+
+class RandomWalkArmTestCase(unittest.TestCase):
+
+    '''Test cases for the RandomWalkArm class.'''
+
+    def test_walk(self):
+        '''Test that the success probability walks inside [0, 1] and restarts on reset.'''
+        arm = RandomWalkArm(0.5, step_size=0.2, random_stream=RandomStream(SEED))
+        bandit = Bandit([arm, BernoulliArm(0.5, RandomStream(SEED))])
+
+        probabilities = []
+        for step in range(PULLS):
+            bandit.pull_arm_by_index(step % 3 // 2)
+            probabilities.append(arm.success_probability)
+        self.assertTrue(all(0 <= probability <= 1 for probability in probabilities))
+        self.assertGreater(len(set(probabilities)), 1)
+
+        bandit.reset()
+        self.assertEqual(arm.success_probability, 0.5)
+        self.assertEqual(arm.get_pull_counts(), 0)
+
+    def test_remove_arm(self):
+        '''Test that removing an arm does not restart the walk of the other arms.'''
+        probabilities = []
+        for remove in (False, True):
+            arm = RandomWalkArm(0.5, step_size=0.2, random_stream=RandomStream(SEED))
+            other_arm = BernoulliArm(0.5, RandomStream(SEED))
+            bandit = Bandit([arm, other_arm])
+            for _ in range(PULLS):
+                bandit.pull_arm(other_arm)
+            bandit.pull_arm(arm)
+            if remove:
+                bandit.remove_arm(other_arm)
+            bandit.pull_arm(arm)
+            probabilities.append(arm.success_probability)
+        self.assertEqual(probabilities[0], probabilities[1])
+
+    def test_fold(self):
+        '''Test that the free walk is reflected at 0 and 1.'''
+        positions = np.array([0.3, 1.2, -0.3, 2.3, -1.8])
+        expected = [0.3, 0.8, 0.3, 0.3, 0.2]
+        np.testing.assert_allclose([RandomWalkArm._fold(p) for p in positions], expected)
+
+    def test_fast_forward(self):
+        '''Test that the drifting arms are not fast forwarded.'''
+        bandit = Bandit([RandomWalkArm(0.5), BernoulliArm(0.2)])
+        with self.assertRaises(ValueError):
+            Simulator(bandit, [EpsilonGreedySolver(bandit, 0.1)], fast_forward=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Test cases for the ActionHistory class.
+"""
+import unittest
+import numpy as np
+from mab.domain.action_history import ActionHistory
+
+# Constants for the tests
+CAPACITY: int = 5
+DECISIONS: int = 23
+
+
+class ActionHistoryTestCase(unittest.TestCase):
+
+    '''Test cases for the ActionHistory class.'''
+
+    def test_unbounded(self):
+        '''Test that an unbounded history keeps every decision in order.'''
+        history = ActionHistory()
+        for decision in range(DECISIONS):
+            history.append(decision, decision % 2)
+        history.extend(np.array([7, 8]), np.array([1, 0]))
+
+        self.assertEqual(len(history), DECISIONS + 2)
+        np.testing.assert_array_equal(history.arm_indices, list(range(DECISIONS)) + [7, 8])
+        np.testing.assert_array_equal(history.action_codes[-3:], [0, 1, 0])
+        self.assertEqual(history.arm_indices.dtype, np.int32)
+        self.assertEqual(history.action_codes.dtype, np.int8)
+
+    def test_ring_buffer(self):
+        '''Test that a bounded history only keeps the most recent decisions.'''
+        history = ActionHistory(CAPACITY)
+        expected = []
+        for decision in range(DECISIONS):
+            if decision % 4 == 0:
+                history.extend(np.array([decision, decision]), np.array([1, 1]))
+                expected += [decision, decision]
+            else:
+                history.append(decision, 0, repeats=decision % 3)
+                expected += [decision] * (decision % 3)
+            np.testing.assert_array_equal(history.arm_indices, expected[-CAPACITY:])
+
+        history.extend(np.arange(2 * CAPACITY), np.zeros(2 * CAPACITY))
+        np.testing.assert_array_equal(history.arm_indices, np.arange(CAPACITY, 2 * CAPACITY))
+        self.assertEqual(len(history), CAPACITY)
+
+    def test_disabled(self):
+        '''Test that a history with no capacity keeps nothing.'''
+        history = ActionHistory(0)
+        history.append(1, 0)
+        history.extend(np.array([1, 2]), np.array([0, 1]))
+        self.assertEqual(len(history), 0)
+        with self.assertRaises(ValueError):
+            ActionHistory(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
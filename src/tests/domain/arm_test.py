@@ -12,9 +12,8 @@ PULLS: int = 3
 class MockArm(Arm):
     ''' Mock implementation of the Arm class for testing purposes.'''
 
-    def pull(self):
-        '''pull method that returns a mock reward value of 5'''
-        super().pull()
+    def sample(self):
+        '''sample method that returns a mock reward value of 5'''
         return MOCK_REWARD
 
     def update_cumulative_reward(self, reward):
@@ -0,0 +1,105 @@
+"""
+Test cases for the BanditState class.
+"""
+import unittest
+from mab.domain.bandit import Bandit
+from mab.domain.bandit_state import BanditState
+from tests.domain.arm_test import MockArm, PULLS, MOCK_REWARD
+
+
+class BanditStateTestCase(unittest.TestCase):
+
+    '''Test cases for the BanditState class.'''
+
+    def setUp(self):
+        self.state = BanditState(2)
+
+    def tearDown(self):
+        self.state = None
+
+    def test_add_slot(self):
+        '''Test that the state grows beyond its initial capacity.'''
+        for _ in range(20):
+            slot = self.state.add_slot()
+            self.state.set_pull_counts(slot, slot)
+
+        self.assertEqual(len(self.state), 22)
+        self.assertEqual(self.state.pull_counts.tolist(), [0, 0] + list(range(2, 22)))
+        self.assertEqual(self.state.total_pulls, sum(range(2, 22)))
+
+    def test_free_slot(self):
+        '''Test that freeing a slot keeps the other slots and recycles it.'''
+        self.state.set_pull_counts(0, 1)
+        self.state.set_pull_counts(1, 2)
+        self.state.free_slot(0)
+
+        self.assertEqual(self.state.pull_counts.tolist(), [0, 2])
+        self.assertEqual(self.state.total_pulls, 2)
+        self.assertEqual(self.state.steps, 3)
+        self.assertEqual(self.state.num_free, 1)
+        with self.assertRaises(IndexError):
+            self.state.free_slot(0)
+        with self.assertRaises(IndexError):
+            self.state.free_slot(2)
+
+        self.assertEqual(self.state.add_slot(), 0)
+        self.assertEqual(self.state.add_slot(), 2)
+        self.assertEqual(self.state.get_added_slots(0).tolist(), [0, 2])
+        self.assertEqual(self.state.active.tolist(), [True, True, True])
+
+    def test_reset(self):
+        '''Test the reset method.'''
+        self.state.set_pull_counts(0, PULLS)
+        self.state.set_cumulative_reward(1, MOCK_REWARD)
+        self.state.free_slot(0)
+        self.state.reset()
+
+        self.assertEqual(self.state.total_pulls, 0)
+        self.assertEqual(self.state.steps, 0)
+        self.assertEqual(self.state.pull_counts.tolist(), [0, 0])
+        self.assertEqual(self.state.cumulative_rewards.tolist(), [0, 0])
+
+    def test_set_statistics(self):
+        '''Test that the statistics are replaced at once with a consistent total.'''
+        self.state.set_statistics([3, 1], [0.5, 1.0], [1.5, 1.0])
+
+        self.assertEqual(self.state.total_pulls, 4)
+        self.assertEqual(self.state.cumulative_rewards.tolist(), [0.5, 1.0])
+        self.assertEqual(self.state.reward_sums.tolist(), [1.5, 1.0])
+
+    def test_arm_views(self):
+        '''Test that arms read and write the statistics stored in the bandit state.'''
+        arm1, arm2 = MockArm(), MockArm()
+        arm1.pull()
+        bandit = Bandit([arm1, arm2])
+        state = bandit.get_state()
+
+        # The statistics of the arm are copied into the bandit state
+        self.assertEqual(state.pull_counts.tolist(), [1, 0])
+
+        for _ in range(PULLS):
+            bandit.pull_arm(arm2)
+
+        self.assertEqual(state.pull_counts.tolist(), [1, PULLS])
+        self.assertEqual(state.cumulative_rewards.tolist(), [0, MOCK_REWARD * PULLS])
+        self.assertEqual(state.reward_sums.tolist(), [0, MOCK_REWARD * PULLS])
+        self.assertEqual(state.total_pulls, PULLS + 1)
+
+        # Removing an arm frees its slot and keeps the remaining arms in their slots
+        bandit.remove_arm(arm1)
+        self.assertEqual(state.pull_counts.tolist(), [0, PULLS])
+        self.assertEqual(state.active.tolist(), [False, True])
+        self.assertEqual(state.total_pulls, PULLS)
+        self.assertEqual(arm2.get_pull_counts(), PULLS)
+        self.assertEqual(arm1.get_pull_counts(), 1)
+
+        # The next added arm recycles the free slot, with the statistics it brings
+        version = state.version
+        self.assertEqual(bandit.add_arm(arm1), 0)
+        self.assertEqual(state.pull_counts.tolist(), [1, PULLS])
+        self.assertEqual(state.get_added_slots(version).tolist(), [0])
+        self.assertEqual(state.num_free, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
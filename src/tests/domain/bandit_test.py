@@ -64,6 +64,58 @@ class BanditTestCase(unittest.TestCase):
         # Assert that the removed arm is not in the bandit
         self.assertNotIn(self.arm1, self.bandit.get_arms())
 
+    def test_remove_arm_keeps_indices(self):
+        '''Test that the remaining arms keep their index and the slot is recycled.'''
+        new_arm = MockArm()
+        self.bandit.add_arm(new_arm)
+
+        self.bandit.remove_arm(self.arm1)
+
+        self.assertEqual(self.bandit.get_arm_index(self.arm2), 1)
+        self.assertEqual(self.bandit.get_arm_index(new_arm), 2)
+        self.assertIsNone(self.bandit.get_arm(0))
+        # The arms accessors skip the free slot, the slots accessors keep it
+        self.assertEqual(self.bandit.get_arms(), [self.arm2, new_arm])
+        self.assertEqual(self.bandit.get_arms_number(), 2)
+        self.assertEqual(self.bandit.get_slots(), [None, self.arm2, new_arm])
+        self.assertEqual(self.bandit.get_slots_number(), 3)
+        self.assertEqual(len(self.bandit.get_cumulative_by_arms()), 2)
+        self.assertFalse(self.bandit.has_arm(self.arm1))
+        with self.assertRaises(ValueError):
+            self.bandit.pull_arm_by_index(0)
+        with self.assertRaises(ValueError):
+            self.bandit.get_arm_index(self.arm1)
+        with self.assertRaises(ValueError):
+            self.bandit.remove_arm(self.arm1)
+
+    def test_add_arm_twice(self):
+        '''Test that the same arm cannot be added twice.'''
+        with self.assertRaises(ValueError):
+            self.bandit.add_arm(self.arm1)
+        with self.assertRaises(ValueError):
+            self.bandit.set_arms([self.arm1, self.arm1])
+
+    def test_pull_arm_by_index(self):
+        '''Test the pull_arm_by_index method.'''
+        reward = self.bandit.pull_arm_by_index(1)
+
+        self.assertEqual(reward, MOCK_REWARD)
+        self.assertEqual(self.arm2.get_pull_counts(), 1)
+        self.assertEqual(self.arm1.get_pull_counts(), 0)
+
+        with self.assertRaises(ValueError):
+            self.bandit.pull_arm_by_index(2)
+
+    def test_record_reward_by_index(self):
+        '''Test the record_reward_by_index method.'''
+        self.bandit.record_reward_by_index(0, 3)
+
+        self.assertEqual(self.arm1.get_pull_counts(), 1)
+        self.assertEqual(self.arm1.get_reward_sum(), 3)
+        self.assertEqual(self.bandit.get_state().total_pulls, 1)
+
+        with self.assertRaises(ValueError):
+            self.bandit.record_reward_by_index(2, 1)
 
     def test_get_cumulative_reward(self):
         '''Test the get_cumulative_reward method.'''
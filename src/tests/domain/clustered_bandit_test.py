@@ -0,0 +1,90 @@
+"""
+Test cases for the ClusteredBandit class.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.clustered_bandit import ClusteredBandit
+from tests.domain.arm_test import MockArm
+
+# Constants for the tests
+CLUSTER_SIZES = [2, 3, 1]
+PULLS: int = 60
+
+
+class ClusteredBanditTestCase(unittest.TestCase):
+
+    '''Test cases for the ClusteredBandit class.'''
+
+    def setUp(self):
+        self.arms = [BernoulliArm(0.1 * (index + 1)) for index in range(sum(CLUSTER_SIZES))]
+        self.bandit = ClusteredBandit(self.arms, CLUSTER_SIZES)
+
+    def tearDown(self):
+        self.bandit = None
+        self.arms = None
+
+    def assert_clusters_aggregate_arms(self):
+        '''Checks the statistics of each cluster are the sums over its arms.'''
+        cluster_state = self.bandit.get_cluster_bandit().get_state()
+        for cluster_index in range(self.bandit.get_clusters_number()):
+            arm_state = self.bandit.get_cluster(cluster_index).get_state()
+            self.assertEqual(cluster_state.pull_counts[cluster_index],
+                             arm_state.pull_counts.sum())
+            self.assertEqual(arm_state.total_pulls, arm_state.pull_counts.sum())
+            self.assertAlmostEqual(cluster_state.reward_sums[cluster_index],
+                                   arm_state.reward_sums.sum())
+        self.assertEqual(cluster_state.total_pulls, self.bandit.get_state().total_pulls)
+
+    def test_clusters(self):
+        '''Test the grouping of the arms and the views of the clusters.'''
+        self.assertEqual(self.bandit.get_clusters_number(), len(CLUSTER_SIZES))
+        self.assertEqual(self.bandit.get_cluster_sizes(), CLUSTER_SIZES)
+        self.assertEqual([self.bandit.get_cluster_index(index) for index in range(6)],
+                         [0, 0, 1, 1, 1, 2])
+
+        cluster = self.bandit.get_cluster(1)
+        self.assertEqual(cluster.get_arms_number(), 3)
+        self.assertEqual(cluster.get_arms(), self.arms[2:5])
+        self.assertIs(cluster.get_arm(0), self.arms[2])
+        self.assertEqual(cluster.get_arm_index(self.arms[4]), 2)
+        self.assertFalse(cluster.has_arm(self.arms[0]))
+        with self.assertRaises(ValueError):
+            cluster.get_arm_index(self.arms[0])
+
+        with self.assertRaises(ValueError):
+            self.bandit.set_clusters([2, 2, 1])
+        with self.assertRaises(ValueError):
+            self.bandit.add_arm(MockArm())
+
+    def test_pull_updates_clusters(self):
+        '''Test that pulls and recorded rewards update the statistics of the clusters.'''
+        for step in range(PULLS):
+            self.bandit.pull_arm_by_index(step % len(self.arms))
+        self.bandit.get_cluster(1).pull_arm_by_index(0)
+        self.bandit.record_reward_by_index(5, 1)
+        self.assert_clusters_aggregate_arms()
+
+        cluster_arm = self.bandit.get_cluster_bandit().get_arm(2)
+        self.assertAlmostEqual(cluster_arm.get_cumulative_reward(),
+                               self.arms[5].get_cumulative_reward())
+
+        self.bandit.reset()
+        self.assertEqual(self.bandit.get_cluster_bandit().get_state().total_pulls, 0)
+
+    def test_sync_clusters(self):
+        '''Test that statistics replaced at once are aggregated again.'''
+        state = self.bandit.get_state()
+        pull_counts = np.arange(1, len(self.arms) + 1)
+        state.set_statistics(pull_counts, np.full(len(self.arms), 0.5), pull_counts / 2)
+        self.bandit.sync_clusters()
+        self.assert_clusters_aggregate_arms()
+
+        cloned_bandit = self.bandit.__clone__()
+        self.assertEqual(cloned_bandit.get_cluster_sizes(), CLUSTER_SIZES)
+        self.assertEqual(cloned_bandit.get_cluster_bandit().get_state().total_pulls,
+                         state.total_pulls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Test cases for the RandomStream class.
+"""
+import random
+import unittest
+import numpy as np
+from mab.domain.random_stream import RandomStream
+
+# Constants for the tests
+SEED: int = 42
+DRAWS: int = 1000
+
+
+class RandomStreamTestCase(unittest.TestCase):
+
+    '''Test cases for the RandomStream class.'''
+
+    def test_reproducible(self):
+        '''Test that streams with the same seed give the same draws.'''
+        first, second = RandomStream(SEED), RandomStream(SEED)
+        self.assertEqual([first.random() for _ in range(DRAWS)],
+                         [second.random() for _ in range(DRAWS)])
+
+    def test_buffered_uniforms(self):
+        '''Test that the buffered uniforms are the uniforms of the generator.'''
+        stream = RandomStream(SEED, max_buffer_size=64)
+        uniforms = [stream.random() for _ in range(DRAWS)]
+        generator = np.random.Generator(np.random.PCG64(np.random.SeedSequence(SEED)))
+
+        expected = []
+        buffer_size = 16
+        while len(expected) < DRAWS:
+            expected += generator.random(buffer_size).tolist()
+            buffer_size = min(64, 2 * buffer_size)
+        self.assertEqual(uniforms, expected[:DRAWS])
+
+    def test_buffered_integers(self):
+        '''Test that the integers are buffered for the last bound only.'''
+        stream = RandomStream(SEED)
+        fives = [stream.randrange(5) for _ in range(DRAWS)]
+        threes = [stream.randrange(3) for _ in range(DRAWS)]
+
+        self.assertEqual(set(fives), set(range(5)))
+        self.assertEqual(set(threes), set(range(3)))
+        other = RandomStream(SEED)
+        self.assertEqual(fives, [other.randrange(5) for _ in range(DRAWS)])
+
+        # A new bound starts a small buffer in place of the previous one
+        for stop in range(1, DRAWS):
+            self.assertLess(stream.randrange(stop), stop)
+        self.assertEqual(len(stream._integers), 16)
+
+    def test_spawn(self):
+        '''Test that the child streams are reproducible and independent.'''
+        children = RandomStream(SEED).spawn(3)
+        same_children = RandomStream(SEED).spawn(3)
+        draws = [[child.random() for _ in range(10)] for child in children]
+
+        self.assertEqual(draws[1], [same_children[1].random() for _ in range(10)])
+        self.assertNotEqual(draws[0], draws[1])
+        self.assertNotEqual(draws[1], draws[2])
+
+    def test_default_seed(self):
+        '''Test that the default seed is drawn from the random module.'''
+        random.seed(SEED)
+        first = RandomStream().random()
+        random.seed(SEED)
+        self.assertEqual(RandomStream().random(), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
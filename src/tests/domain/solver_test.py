@@ -1,9 +1,13 @@
 """Test module for the Solver class."""""
 import unittest
-from unittest.mock import MagicMock
-from mab.domain.arm import Arm
+import numpy as np
 from mab.domain.bandit import Bandit
-from mab.domain.solver import Solver, SolverAction
+from mab.domain.solver import Solver, SolverAction, top_k
+from tests.domain.arm_test import MockArm
+
+# Constants for the tests
+CAPACITY: int = 3
+SLATE_SIZE: int = 10
 
 class SolverMock(Solver):
     """Solver mock implementation for testing purposes."""
@@ -13,12 +17,12 @@ class SolverMock(Solver):
 class SolverTestCase(unittest.TestCase):
     """Test cases for the Solver class."""
     def setUp(self):
-        self.bandit = MagicMock(spec=Bandit)
+        self.bandit = Bandit([MockArm(), MockArm()])
         self.solver = SolverMock(self.bandit)
 
     def test_update_solver_history(self):
         """Test the update_solver_history method."""
-        arm = MagicMock(spec=Arm)
+        arm = self.bandit.get_arm(1)
         self.solver.update_solver_history(arm, SolverAction.EXPLORE)
         history = self.solver.get_action_history()
         self.assertEqual(len(history), 1)
@@ -26,8 +30,7 @@ class SolverTestCase(unittest.TestCase):
 
     def test_get_action_history(self):
         """Test the get_action_history method."""
-        arm1 = MagicMock(spec=Arm)
-        arm2 = MagicMock(spec=Arm)
+        arm1, arm2 = self.bandit.get_arms()
         self.solver.update_solver_history(arm1, SolverAction.EXPLORE)
         self.solver.update_solver_history(arm2, SolverAction.EXPLOIT)
         history = self.solver.get_action_history()
@@ -35,5 +38,61 @@ class SolverTestCase(unittest.TestCase):
         self.assertEqual(history[0], (arm1, SolverAction.EXPLORE))
         self.assertEqual(history[1], (arm2, SolverAction.EXPLOIT))
 
+    def test_history_of_removed_arms(self):
+        """Test that the decisions of a removed arm are not given to the next arm."""
+        arm1, arm2 = self.bandit.get_arms()
+        self.solver.update_solver_history(arm1, SolverAction.EXPLORE)
+        self.solver.update_solver_history_many(np.array([0, 1]), np.array([1, 1]))
+        self.bandit.remove_arm(arm1)
+        self.assertEqual(self.solver.get_action_history(),
+                         [(None, SolverAction.EXPLORE), (None, SolverAction.EXPLOIT),
+                          (arm2, SolverAction.EXPLOIT)])
+
+        new_arm = MockArm()
+        self.assertEqual(self.bandit.add_arm(new_arm), 0)
+        self.solver.update_solver_history(new_arm, SolverAction.EXPLOIT)
+        self.solver.set_history_capacity(CAPACITY)
+        self.assertEqual(self.solver.get_action_history(),
+                         [(None, SolverAction.EXPLOIT), (arm2, SolverAction.EXPLOIT),
+                          (new_arm, SolverAction.EXPLOIT)])
+        self.assertEqual(self.solver.get_encoded_action_history().generations.tolist(),
+                         [0, 0, 1])
+
+    def test_history_capacity(self):
+        """Test that a bounded history keeps the most recent decisions and every count."""
+        arm1, arm2 = self.bandit.get_arms()
+        self.solver.update_solver_history(arm1, SolverAction.EXPLORE)
+        self.solver.set_history_capacity(CAPACITY)
+        self.solver.update_solver_history_by_index(1, SolverAction.EXPLOIT, 2)
+        self.solver.update_solver_history_by_index(0, SolverAction.EXPLOIT)
+
+        self.assertEqual(self.solver.get_action_history(),
+                         [(arm2, SolverAction.EXPLOIT), (arm2, SolverAction.EXPLOIT),
+                          (arm1, SolverAction.EXPLOIT)])
+        counts = self.solver.get_action_counts()
+        self.assertEqual(counts[SolverAction.EXPLORE.code], 1)
+        self.assertEqual(counts[SolverAction.EXPLOIT.code], 3)
+
+        self.solver.set_history_capacity(0)
+        self.solver.update_solver_history_many(np.array([0, 1]), np.array([0, 1]))
+        self.assertEqual(self.solver.get_action_history(), [])
+        self.assertEqual(self.solver.get_action_counts().sum(), 6)
+
+    def test_top_k(self):
+        """Test that top_k returns the indices of the highest scores, highest first."""
+        rng = np.random.default_rng(0)
+        for num_scores in (SLATE_SIZE, 100, 50_000):
+            scores = rng.random(num_scores)
+            np.testing.assert_array_equal(top_k(scores, SLATE_SIZE),
+                                          np.argsort(-scores, kind="stable")[:SLATE_SIZE])
+
+        ties = np.array([0.5, 0.9, 0.5, 0.9, 0.1])
+        np.testing.assert_array_equal(top_k(ties, 3)[:2], [1, 3])
+        with self.assertRaises(ValueError):
+            top_k(ties, 6)
+        with self.assertRaises(NotImplementedError):
+            self.solver.select_slate(1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test cases for the SolverStatistics class.
+"""
+import json
+import random
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.statistics import SolverStatistics
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+
+# Constants for the tests
+PROBABILITIES = [0.2, 0.5, 0.8]
+
+
+def make_bandit() -> Bandit:
+    '''Creates a Bernoulli bandit with the test probabilities.'''
+    return Bandit([BernoulliArm(probability) for probability in PROBABILITIES])
+
+
+class SolverStatisticsTestCase(unittest.TestCase):
+
+    '''Test cases for the SolverStatistics class.'''
+
+    def setUp(self):
+        self.first = SolverStatistics([1, 2, 0], [1, 0.5, 0], [1, 0.25, 0])
+        self.second = SolverStatistics([3, 0, 1], [2, 0, 1], [2, 0, 1])
+        self.third = SolverStatistics([0, 4, 2], [0, 4, 1.5], [0, 4, 1.25])
+
+    def test_merge(self):
+        '''Test that merging is associative and commutative.'''
+        merged = self.first.merge(self.second)
+        self.assertEqual(merged.pull_counts.tolist(), [4, 2, 1])
+        self.assertEqual(merged.reward_sums.tolist(), [3, 0.5, 1])
+
+        self.assertEqual(merged.merge(self.third), self.first.merge(self.second.merge(self.third)))
+        self.assertEqual(merged, self.second.merge(self.first))
+        self.assertEqual(SolverStatistics.merge_all([self.first, self.second, self.third]),
+                         merged.merge(self.third))
+
+        with self.assertRaises(ValueError):
+            self.first.merge(SolverStatistics.zeros(2))
+
+    def test_derived_statistics(self):
+        '''Test the means, variances and Beta posteriors.'''
+        np.testing.assert_allclose(self.third.means, [0, 1, 0.75])
+        np.testing.assert_allclose(self.third.variances, [0, 0, 0.0625])
+        alpha, beta = self.third.get_beta_parameters(1, 2)
+        np.testing.assert_allclose(alpha, [1, 5, 2.5])
+        np.testing.assert_allclose(beta, [2, 2, 2.5])
+
+    def test_serialisation(self):
+        '''Test that the statistics survive a JSON round trip.'''
+        data = json.loads(json.dumps(self.first.to_dict()))
+        self.assertEqual(SolverStatistics.from_dict(data), self.first)
+
+    def test_sharded_learning(self):
+        '''Test that merging the statistics of shards equals learning from all the rewards.'''
+        random.seed(0)
+        full_bandit, shards = make_bandit(), [make_bandit(), make_bandit()]
+        for step in range(200):
+            arm_index = step % len(PROBABILITIES)
+            reward = full_bandit.pull_arm_by_index(arm_index)
+            shards[step % 2].record_reward_by_index(arm_index, reward)
+
+        solvers = [ThomsonSamplingSolver(shard) for shard in shards]
+        merged = SolverStatistics.merge_all(solver.get_statistics() for solver in solvers)
+        self.assertEqual(merged, SolverStatistics.from_state(full_bandit.get_state()))
+
+        solver = ThomsonSamplingSolver(make_bandit())
+        solver.load_statistics(merged)
+        np.testing.assert_allclose(solver.get_posteriors()[0], 1 + full_bandit.get_state().reward_sums)
+        np.testing.assert_allclose(solver._bandit.get_state().cumulative_rewards,
+                                   full_bandit.get_state().cumulative_rewards)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Test cases for the ConcurrentSolver class.
+"""
+import threading
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.serving.concurrent_solver import ConcurrentSolver
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import IncrementalUCB1Solver
+
+# Constants for the tests
+PROBABILITIES = [0.2, 0.5, 0.8]
+THREADS: int = 8
+DECISIONS: int = 500
+ADDED_ARMS: int = 3000
+
+
+def serve(solver: ConcurrentSolver, bandit: Bandit) -> None:
+    '''Makes decisions and reports a reward equal to the arm index parity.'''
+    for _ in range(DECISIONS):
+        arm_index = solver.select_arm_index()
+        solver.report_reward(bandit.get_arm(arm_index), arm_index % 2)
+
+
+class ConcurrentSolverTestCase(unittest.TestCase):
+    """Test cases for the ConcurrentSolver class."""
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(probability) for probability in PROBABILITIES])
+
+    def run_threads(self, solver: ConcurrentSolver) -> None:
+        '''Runs the serving function in several threads and flushes the rewards.'''
+        threads = [threading.Thread(target=serve, args=(solver, self.bandit)) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        solver.flush()
+
+    def test_no_lost_updates(self):
+        """Test that every reward reported from several threads is merged."""
+        solver = ThomsonSamplingSolver(self.bandit, seed=0)
+        concurrent_solver = ConcurrentSolver(solver, self.bandit, merge_every=7)
+        self.run_threads(concurrent_solver)
+
+        state = self.bandit.get_state()
+        self.assertEqual(state.total_pulls, THREADS * DECISIONS)
+        self.assertEqual(state.pull_counts.sum(), THREADS * DECISIONS)
+        self.assertEqual(concurrent_solver.get_pending_count(), 0)
+        np.testing.assert_array_equal(sum(solver.get_posteriors()) - 2, state.pull_counts)
+        np.testing.assert_array_equal(solver.get_posteriors()[0] - 1, state.reward_sums)
+
+    def test_locked_select(self):
+        """Test that solvers modifying their state when selecting are serialised."""
+        solver = IncrementalUCB1Solver(self.bandit, exploration_parameter=1.0)
+        concurrent_solver = ConcurrentSolver(solver, self.bandit, merge_every=1)
+        self.run_threads(concurrent_solver)
+
+        self.assertEqual(self.bandit.get_state().total_pulls, THREADS * DECISIONS)
+        self.assertEqual(solver.select_arm_index(),
+                         int(np.argmax(self.bandit.get_state().cumulative_rewards
+                                       + np.sqrt(2 * np.log(THREADS * DECISIONS)
+                                                 / self.bandit.get_state().pull_counts))))
+
+    def test_recorded_actions(self):
+        """Test that the actions recorded by concurrent decisions are not lost."""
+        solver = EpsilonGreedySolver(self.bandit, epsilon=0.5)
+        concurrent_solver = ConcurrentSolver(solver, self.bandit)
+        self.run_threads(concurrent_solver)
+
+        self.assertEqual(len(solver.get_encoded_action_history()), THREADS * DECISIONS)
+        self.assertEqual(solver.get_action_counts().sum(), THREADS * DECISIONS)
+
+    def test_pending_until_merged(self):
+        """Test that the rewards stay in the accumulator until it is full."""
+        concurrent_solver = ConcurrentSolver(ThomsonSamplingSolver(self.bandit), self.bandit,
+                                             merge_every=3)
+        concurrent_solver.report_reward(self.bandit.get_arm(0), 1)
+        concurrent_solver.report_reward(self.bandit.get_arm(1), 1)
+        self.assertEqual(concurrent_solver.get_pending_count(), 2)
+        self.assertEqual(self.bandit.get_state().total_pulls, 0)
+
+        concurrent_solver.report_reward(self.bandit.get_arm(2), 1)
+        self.assertEqual(concurrent_solver.get_pending_count(), 0)
+        self.assertEqual(self.bandit.get_state().total_pulls, 3)
+
+    def test_stale_reward_of_removed_arm(self):
+        """Test that a late reward of a removed arm is not given to the arm taking its slot."""
+        solver = ThomsonSamplingSolver(self.bandit, seed=0)
+        concurrent_solver = ConcurrentSolver(solver, self.bandit, merge_every=1)
+        removed_arm = self.bandit.get_arm(1)
+        concurrent_solver.remove_arm(removed_arm)
+        new_arm = BernoulliArm(0.5)
+        self.assertEqual(concurrent_solver.add_arm(new_arm), 1)
+
+        concurrent_solver.report_reward(removed_arm, 1)
+        self.assertEqual(self.bandit.get_state().total_pulls, 0)
+        self.assertEqual(solver.get_posteriors()[0].tolist(), [1, 1, 1])
+
+        concurrent_solver.report_reward(new_arm, 1)
+        self.assertEqual(self.bandit.get_state().pull_counts.tolist(), [0, 1, 0])
+
+    def test_select_while_adding_arms(self):
+        """Test that lock free decisions keep working while arms are added."""
+        solver = ThomsonSamplingSolver(self.bandit, seed=0)
+        concurrent_solver = ConcurrentSolver(solver, self.bandit)
+        adding = threading.Event()
+        adding.set()
+        errors = []
+
+        def decide():
+            try:
+                while adding.is_set():
+                    arm_index = concurrent_solver.select_arm_index()
+                    self.assertIsNotNone(self.bandit.get_arm(arm_index))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=decide) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(ADDED_ARMS):
+            concurrent_solver.add_arm(BernoulliArm(0.5))
+        adding.clear()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        alpha, beta = solver.get_posteriors()
+        self.assertEqual(len(alpha), len(PROBABILITIES) + ADDED_ARMS)
+        self.assertEqual(len(beta), len(PROBABILITIES) + ADDED_ARMS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test cases for the DecisionService class.
+"""
+import asyncio
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.serving.decision_service import DecisionService
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+
+# Constants for the tests
+PROBABILITIES = [0.1, 0.9]
+
+
+class DecisionServiceTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the DecisionService class."""
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(probability) for probability in PROBABILITIES])
+        self.solver = ThomsonSamplingSolver(self.bandit, seed=0)
+
+    def test_delayed_rewards(self):
+        """Test that rewards reported out of order are applied to the right arms."""
+        service = DecisionService(self.solver, self.bandit)
+        decisions = [service.decide() for _ in range(10)]
+        self.assertEqual(service.get_pending_count(), 10)
+
+        for decision in reversed(decisions):
+            service.report_reward(decision.decision_id, decision.arm_index)
+        self.assertEqual(service.apply_rewards(), 10)
+
+        pulls = np.bincount([decision.arm_index for decision in decisions], minlength=2)
+        np.testing.assert_array_equal(self.bandit.get_state().pull_counts, pulls)
+        self.assertEqual(self.bandit.get_arm(1).get_reward_sum(), pulls[1])
+        self.assertEqual(service.get_pending_count(), 0)
+
+    def test_unknown_and_duplicate_rewards(self):
+        """Test that rewards of unknown or already rewarded decisions are ignored."""
+        service = DecisionService(self.solver, self.bandit)
+        decision = service.decide()
+        service.report_reward(decision.decision_id, 1)
+        service.report_reward(decision.decision_id, 1)
+        service.report_reward(1000, 1)
+        service.apply_rewards()
+
+        self.assertEqual(service.num_applied, 1)
+        self.assertEqual(service.num_unknown, 2)
+        self.assertEqual(self.bandit.get_state().total_pulls, 1)
+
+    def test_removed_arm(self):
+        """Test that the rewards of a removed arm are not given to the arm taking its slot."""
+        service = DecisionService(self.solver, self.bandit)
+        decisions = [service.decide() for _ in range(20)]
+        removed_arm = self.bandit.get_arm(1)
+        self.bandit.remove_arm(removed_arm)
+        self.assertEqual(self.bandit.add_arm(BernoulliArm(0.5)), 1)
+        for decision in decisions:
+            service.report_reward(decision.decision_id, 1)
+        service.apply_rewards()
+
+        self.assertEqual(self.bandit.get_arm(1).get_pull_counts(), 0)
+        self.assertEqual(removed_arm.get_pull_counts(), 0)
+        self.assertEqual(service.num_applied + service.num_unknown, len(decisions))
+        self.assertIn(service.decide().arm_index, (0, 1))
+
+    def test_bounded_pending(self):
+        """Test that the oldest pending decisions expire when the limit is reached."""
+        service = DecisionService(self.solver, self.bandit, max_pending=5)
+        decisions = [service.decide() for _ in range(8)]
+
+        self.assertEqual(service.get_pending_count(), 5)
+        self.assertEqual(service.num_expired, 3)
+        service.report_reward(decisions[0].decision_id, 1)
+        service.report_reward(decisions[-1].decision_id, 1)
+        service.apply_rewards()
+        self.assertEqual(service.num_applied, 1)
+        self.assertEqual(service.num_unknown, 1)
+
+    async def test_background_batches(self):
+        """Test that the background task applies the rewards while running."""
+        async with DecisionService(self.solver, self.bandit, batch_size=4,
+                                   flush_interval=10) as service:
+            self.assertTrue(service.is_running())
+            for _ in range(4):
+                service.report_reward(service.decide().decision_id, 1)
+            await asyncio.sleep(0.01)
+            self.assertEqual(service.num_applied, 4)
+
+            service.report_reward(service.decide().decision_id, 1)
+        self.assertFalse(service.is_running())
+        self.assertEqual(service.num_applied, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
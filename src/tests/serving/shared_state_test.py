@@ -0,0 +1,119 @@
+"""
+Test cases for the SharedBanditState and SharedSolverWorker classes.
+"""
+import multiprocessing
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.serving.shared_state import SharedBanditState, SharedSolverWorker
+from mab.solvers.thomson_sampling import (DiscountedThomsonSamplingSolver,
+                                          ThomsonSamplingSolver)
+
+# Constants for the tests
+PROBABILITIES = [0.2, 0.5, 0.8]
+WORKERS: int = 3
+REWARDS: int = 250
+
+
+def make_worker(shared_state: SharedBanditState, worker: int,
+                sync_every: int = 10) -> SharedSolverWorker:
+    '''Creates a worker with its own bandit and Thompson sampling solver.'''
+    bandit = Bandit([BernoulliArm(probability) for probability in PROBABILITIES])
+    solver = ThomsonSamplingSolver(bandit, seed=worker)
+    return SharedSolverWorker(bandit, solver, shared_state, worker, sync_every)
+
+
+def serve(name: str, worker: int) -> None:
+    '''Attaches to the shared state and reports rewards from a worker process.'''
+    with SharedBanditState(name=name) as shared_state:
+        solver_worker = make_worker(shared_state, worker)
+        for _ in range(REWARDS):
+            solver_worker.report_reward(solver_worker.select_arm(), 1)
+        solver_worker.sync()
+
+
+class SharedStateTestCase(unittest.TestCase):
+    """Test cases for the SharedBanditState and SharedSolverWorker classes."""
+
+    def setUp(self):
+        self.shared_state = SharedBanditState(len(PROBABILITIES), WORKERS)
+
+    def tearDown(self):
+        self.shared_state.close()
+        self.shared_state.unlink()
+
+    def test_attach(self):
+        """Test that an attached state sees the publications of the creator."""
+        with SharedBanditState(name=self.shared_state.name) as attached_state:
+            self.assertEqual(attached_state.num_workers, WORKERS)
+            self.assertEqual(attached_state.num_arms, len(PROBABILITIES))
+            self.shared_state.publish(1, np.array([1, 2, 3]), np.array([0, 1, 2]),
+                                      np.array([0, 1, 4]))
+            pull_counts, reward_sums, squared_reward_sums = attached_state.get_totals()
+            self.assertEqual(pull_counts.tolist(), [1, 2, 3])
+            self.assertEqual(reward_sums.tolist(), [0, 1, 2])
+            self.assertEqual(squared_reward_sums.tolist(), [0, 1, 4])
+
+    def test_sync(self):
+        """Test that a worker learns the rewards of another worker when it syncs."""
+        first, second = make_worker(self.shared_state, 0), make_worker(self.shared_state, 1)
+        for _ in range(9):
+            first.report_reward(first._bandit.get_arm(2), 1)
+        second.sync()
+        self.assertEqual(second._bandit.get_state().total_pulls, 0)
+
+        first.report_reward(first._bandit.get_arm(2), 1)
+        second.sync()
+        state = second._bandit.get_state()
+        self.assertEqual(state.pull_counts.tolist(), [0, 0, 10])
+        self.assertEqual(state.cumulative_rewards.tolist(), [0, 0, 1])
+        self.assertEqual(state.squared_reward_sums.tolist(), [0, 0, 10])
+        self.assertEqual(second._solver.get_posteriors()[0].tolist(), [1, 1, 11])
+
+    def test_sync_non_stationary(self):
+        """Test that the sync keeps the state of a non-stationary solver."""
+        bandit = Bandit([BernoulliArm(probability) for probability in PROBABILITIES])
+        solver = DiscountedThomsonSamplingSolver(bandit, discount=0.9, seed=0)
+        solver_worker = SharedSolverWorker(bandit, solver, self.shared_state, 0, sync_every=2)
+        solver_worker.report_reward(bandit.get_arm(1), 1)
+        solver_worker.report_reward(bandit.get_arm(1), 1)
+
+        self.assertEqual(bandit.get_state().pull_counts.tolist(), [0, 2, 0])
+        self.assertAlmostEqual(solver.get_posteriors()[0][1], 1 + 0.9 + 1)
+
+    def test_stale_reward_of_removed_arm(self):
+        """Test that a late reward of a removed arm is not given to the arm taking its slot."""
+        solver_worker = make_worker(self.shared_state, 0)
+        bandit = solver_worker._bandit
+        removed_arm = bandit.get_arm(1)
+        bandit.remove_arm(removed_arm)
+        new_arm = BernoulliArm(0.5)
+        self.assertEqual(bandit.add_arm(new_arm), 1)
+
+        solver_worker.report_reward(removed_arm, 1)
+        self.assertEqual(bandit.get_state().total_pulls, 0)
+        solver_worker.report_reward(new_arm, 1)
+        self.assertEqual(bandit.get_state().pull_counts.tolist(), [0, 1, 0])
+
+    def test_worker_processes(self):
+        """Test that the rewards of every worker process are aggregated."""
+        processes = [multiprocessing.Process(target=serve, args=(self.shared_state.name, worker))
+                     for worker in range(WORKERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        pull_counts, reward_sums, _ = self.shared_state.get_totals()
+        self.assertEqual(pull_counts.sum(), WORKERS * REWARDS)
+        self.assertEqual(reward_sums.sum(), WORKERS * REWARDS)
+
+    def test_invalid_worker(self):
+        """Test that a worker outside of the shared state is rejected."""
+        with self.assertRaises(ValueError):
+            make_worker(self.shared_state, WORKERS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Test cases for the batch simulation engine.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.simulator.simulator import Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import UCB1Solver
+from tests.domain.arm_test import MockArm
+
+# Constants for the tests
+ITERATIONS: int = 200
+REPLICATIONS: int = 50
+SEED: int = 42
+
+
+class BatchSimulationTestCase(unittest.TestCase):
+
+    '''Test cases for the batch simulation engine.'''
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(0.1), BernoulliArm(0.5), BernoulliArm(0.9)])
+        self.solvers = [EpsilonGreedySolver(self.bandit, epsilon=0.1),
+                        UCB1Solver(self.bandit, exploration_parameter=1.0),
+                        ThomsonSamplingSolver(self.bandit)]
+        self.simulator = Simulator(self.bandit, self.solvers)
+
+    def tearDown(self):
+        self.bandit = None
+        self.solvers = None
+        self.simulator = None
+
+    def test_run_batch(self):
+        '''Test the shape and consistency of the batch results.'''
+        self.simulator.run_batch(ITERATIONS, REPLICATIONS, seed=SEED)
+
+        for solver in self.solvers:
+            results = self.simulator.get_batch_results(solver)
+            self.assertEqual(results.rewards.shape, (ITERATIONS,))
+            self.assertEqual(results.pull_counts.shape, (REPLICATIONS, 3))
+            self.assertTrue(np.all(results.pull_counts.sum(axis=1) == ITERATIONS))
+            self.assertAlmostEqual(results.get_usage_fractions().sum(), 1.0)
+            self.assertAlmostEqual(results.total_rewards.mean(), results.rewards.sum())
+            self.assertTrue(np.all(results.regrets >= 0))
+
+            lower, upper = results.get_total_regret_interval()
+            self.assertLessEqual(lower, results.total_regrets.mean())
+            self.assertGreaterEqual(upper, results.total_regrets.mean())
+
+        # The bandit state is not modified by the batch engine
+        self.assertEqual(self.bandit.get_state().total_pulls, 0)
+
+    def test_run_batch_is_reproducible(self):
+        '''Test that the same seed gives the same results.'''
+        self.simulator.run_batch(ITERATIONS, REPLICATIONS, seed=SEED)
+        first = {solver: self.simulator.get_batch_results(solver).pull_counts
+                 for solver in self.solvers}
+        self.simulator.run_batch(ITERATIONS, REPLICATIONS, seed=SEED)
+
+        for solver in self.solvers:
+            np.testing.assert_array_equal(
+                first[solver], self.simulator.get_batch_results(solver).pull_counts)
+
+    def test_run_batch_simulator_seed(self):
+        '''Test that the seed of the simulator makes the batch runs reproducible.'''
+        pull_counts = []
+        for _ in range(2):
+            simulator = Simulator(self.bandit, self.solvers[:1], seed=SEED)
+            simulator.run_batch(ITERATIONS, REPLICATIONS)
+            pull_counts.append(simulator.get_batch_results(self.solvers[0]).pull_counts)
+            simulator.run_batch(ITERATIONS, REPLICATIONS)
+            pull_counts.append(simulator.get_batch_results(self.solvers[0]).pull_counts)
+
+        np.testing.assert_array_equal(pull_counts[0], pull_counts[2])
+        np.testing.assert_array_equal(pull_counts[1], pull_counts[3])
+        self.assertFalse(np.array_equal(pull_counts[0], pull_counts[1]))
+
+    def test_run_batch_requires_bernoulli_arms(self):
+        '''Test that batch simulations reject non Bernoulli arms.'''
+        bandit = Bandit([MockArm()])
+        simulator = Simulator(bandit, [UCB1Solver(bandit, exploration_parameter=1.0)])
+        with self.assertRaises(ValueError):
+            simulator.run_batch(ITERATIONS, REPLICATIONS)
+
+        # The replications index the arms by slot, so free slots are rejected
+        self.bandit.remove_arm(self.bandit.get_arm(0))
+        with self.assertRaisesRegex(ValueError, "free slots"):
+            self.simulator.run_batch(ITERATIONS, REPLICATIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Test cases for the ExperimentGrid class.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.simulator.experiment import ExperimentCell, ExperimentGrid, SolverConfig
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.ucb import UCB1Solver
+
+# Constants for the tests
+ITERATIONS: int = 100
+SEEDS = [1, 2]
+
+
+class ExperimentGridTestCase(unittest.TestCase):
+
+    '''Test cases for the ExperimentGrid class.'''
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(0.2), BernoulliArm(0.8)])
+        self.solver_configs = (
+            SolverConfig.sweep(EpsilonGreedySolver, "epsilon", [0.01, 0.1])
+            + [SolverConfig(UCB1Solver, exploration_parameter=1.0)])
+        self.grid = ExperimentGrid([self.bandit], self.solver_configs, SEEDS)
+
+    def tearDown(self):
+        self.bandit = None
+        self.solver_configs = None
+        self.grid = None
+
+    def test_solver_config(self):
+        '''Test the sweep and build methods.'''
+        self.assertEqual(str(self.solver_configs[1]), "EpsilonGreedySolver(epsilon=0.1)")
+        solver = self.solver_configs[1].build(self.bandit)
+        self.assertIsInstance(solver, EpsilonGreedySolver)
+        self.assertEqual(solver.epsilon, 0.1)
+
+    def test_run(self):
+        '''Test that every cell is run on a clone of the bandit.'''
+        self.grid.run(ITERATIONS, max_workers=1)
+
+        results = self.grid.get_results()
+        self.assertEqual(len(results), len(self.solver_configs) * len(SEEDS))
+        for cell_results in results.values():
+            self.assertEqual(len(cell_results.rewards), ITERATIONS)
+
+        # The original bandit is never pulled
+        self.assertEqual(self.bandit.get_state().total_pulls, 0)
+
+    def test_run_is_independent_of_workers(self):
+        '''Test that the results do not depend on the number of workers.'''
+        self.grid.run(ITERATIONS, max_workers=1)
+        serial = {cell: results.rewards for cell, results in self.grid.get_results().items()}
+
+        self.grid.run(ITERATIONS, max_workers=2)
+        parallel = self.grid.get_results()
+
+        self.assertEqual(serial.keys(), parallel.keys())
+        for cell, rewards in serial.items():
+            np.testing.assert_array_equal(rewards, parallel[cell].rewards)
+        self.assertEqual(
+            len(self.grid.get_results(ExperimentCell(0, 2, SEEDS[0])).rewards), ITERATIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
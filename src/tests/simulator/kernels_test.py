@@ -0,0 +1,84 @@
+"""
+Test cases for the fused step kernels of the simulator.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.simulator.kernels import (epsilon_greedy_kernel, get_kernel,
+                                   thomson_sampling_kernel, ucb1_kernel)
+from mab.simulator.simulator import RecordingMode, Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import IncrementalUCB1Solver, UCB1Solver
+from tests.domain.arm_test import MockArm
+
+# Constants for the tests
+PROBABILITIES = [0.2, 0.5, 0.7, 0.4]
+ITERATIONS: int = 500
+SEED: int = 7
+
+
+class CustomEpsilonGreedySolver(EpsilonGreedySolver):
+    '''Subclass that may change the decisions of the epsilon-greedy algorithm.'''
+
+
+class KernelsTestCase(unittest.TestCase):
+
+    '''Test cases for the fused step kernels.'''
+
+    def _run(self, solver_factory, use_kernels, mode=RecordingMode.FULL):
+        bandit = Bandit([BernoulliArm(p) for p in PROBABILITIES])
+        solver = solver_factory(bandit)
+        simulator = Simulator(bandit, [solver], mode, record_every=3, seed=SEED,
+                              use_kernels=use_kernels)
+        simulator.run(ITERATIONS)
+        simulator.run(ITERATIONS)
+        return simulator.get_results(solver), solver
+
+    def test_same_as_generic_loop(self):
+        '''Test that the kernels give the same decisions and rewards as the generic loop.'''
+        factories = [lambda bandit: EpsilonGreedySolver(bandit, 0.1),
+                     lambda bandit: UCB1Solver(bandit, 1.0),
+                     lambda bandit: IncrementalUCB1Solver(bandit, 1.0),
+                     lambda bandit: ThomsonSamplingSolver(bandit)]
+        for factory in factories:
+            for mode in RecordingMode:
+                expected, expected_solver = self._run(factory, use_kernels=False, mode=mode)
+                results, solver = self._run(factory, use_kernels=True, mode=mode)
+
+                np.testing.assert_array_equal(results.arm_indices, expected.arm_indices)
+                np.testing.assert_array_equal(results.rewards, expected.rewards)
+                np.testing.assert_array_equal(results.action_codes, expected.action_codes)
+                np.testing.assert_array_equal(results.action_counts, expected.action_counts)
+                self.assertEqual(results.total_reward, expected.total_reward)
+                self.assertEqual(results.num_steps, expected.num_steps)
+                self.assertEqual(results.cummulatives, expected.cummulatives)
+                self.assertEqual(list(results.usage_fractions.values()),
+                                 list(expected.usage_fractions.values()))
+                self.assertEqual(len(solver.get_action_history()),
+                                 len(expected_solver.get_action_history()))
+
+    def test_get_kernel(self):
+        '''Test that subclasses and other arms fall back to the generic loop.'''
+        bandit = Bandit([BernoulliArm(p) for p in PROBABILITIES])
+        self.assertIsNotNone(get_kernel(bandit, EpsilonGreedySolver(bandit, 0.1)))
+        self.assertIsNone(get_kernel(bandit, CustomEpsilonGreedySolver(bandit, 0.1)))
+
+        mock_bandit = Bandit([MockArm(), MockArm()])
+        self.assertIsNone(get_kernel(mock_bandit, EpsilonGreedySolver(mock_bandit, 0.1)))
+        self.assertIsNone(get_kernel(Bandit(), ThomsonSamplingSolver(Bandit())))
+
+    def test_kernel_of_each_solver(self):
+        '''Test which kernel each solver gets, the incremental UCB1 keeping its tree.'''
+        bandit = Bandit([BernoulliArm(p) for p in PROBABILITIES])
+        self.assertIs(get_kernel(bandit, EpsilonGreedySolver(bandit, 0.1)),
+                      epsilon_greedy_kernel)
+        self.assertIs(get_kernel(bandit, UCB1Solver(bandit, 1.0)), ucb1_kernel)
+        self.assertIs(get_kernel(bandit, ThomsonSamplingSolver(bandit)),
+                      thomson_sampling_kernel)
+        self.assertIsNone(get_kernel(bandit, IncrementalUCB1Solver(bandit, 1.0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test cases for the metrics module.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.simulator import metrics
+from mab.simulator.metrics import RunningMetrics
+from mab.simulator.simulator import Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+
+# Constants for the tests
+ARM_MEANS = np.array([0.2, 0.5, 0.9])
+ARM_INDICES = np.array([0, 1, 2, 2, 1])
+REWARDS = np.array([0, 1, 1, 0, 1], dtype=np.float32)
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    '''Test cases for the metrics functions and the RunningMetrics class.'''
+
+    def test_cumulative_metrics(self):
+        '''Test the vectorised cumulative metrics against their definition.'''
+        np.testing.assert_allclose(metrics.cumulative_reward(REWARDS), [0, 1, 2, 2, 3])
+        np.testing.assert_allclose(metrics.pseudo_regret(ARM_INDICES, ARM_MEANS),
+                                   np.cumsum([0.7, 0.4, 0, 0, 0.4]))
+        np.testing.assert_allclose(metrics.realised_regret(REWARDS, 0.9),
+                                   np.cumsum(0.9 - REWARDS.astype(np.float64)))
+        steps = np.array([1, 4])
+        np.testing.assert_allclose(
+            metrics.realised_regret_at(steps, metrics.cumulative_reward(REWARDS)[steps], 0.9),
+            metrics.realised_regret(REWARDS, 0.9)[steps])
+        np.testing.assert_allclose(metrics.selection_fractions(ARM_INDICES, 3),
+                                   [0.2, 0.4, 0.4])
+
+    def test_running_metrics(self):
+        '''Test that the step and block updates match the vectorised metrics.'''
+        step_metrics = RunningMetrics(ARM_MEANS)
+        block_metrics = RunningMetrics(ARM_MEANS)
+        for arm_index, reward in zip(ARM_INDICES, REWARDS):
+            step_metrics.update(arm_index, reward)
+        block_metrics.update_many(ARM_INDICES[:2], REWARDS[:2])
+        block_metrics.update_many(ARM_INDICES[2:], REWARDS[2:])
+
+        for running in (step_metrics, block_metrics):
+            self.assertEqual(running.num_steps, len(REWARDS))
+            self.assertAlmostEqual(running.total_reward, 3)
+            self.assertAlmostEqual(running.pseudo_regret,
+                                   metrics.pseudo_regret(ARM_INDICES, ARM_MEANS)[-1])
+            self.assertAlmostEqual(running.realised_regret,
+                                   metrics.realised_regret(REWARDS, 0.9)[-1])
+            np.testing.assert_allclose(running.get_selection_fractions(), [0.2, 0.4, 0.4])
+
+    def test_simulator_metrics(self):
+        '''Test that the simulator updates the running metrics while it runs.'''
+        bandit = Bandit([BernoulliArm(mean) for mean in ARM_MEANS])
+        solver = EpsilonGreedySolver(bandit, epsilon=0.1)
+        simulator = Simulator(bandit, [solver])
+        running = RunningMetrics(ARM_MEANS)
+        simulator.run(200, metrics={solver: running})
+
+        results = simulator.get_results(solver)
+        self.assertAlmostEqual(running.total_reward, results.total_reward)
+        self.assertAlmostEqual(running.pseudo_regret,
+                               metrics.pseudo_regret(results.arm_indices, ARM_MEANS)[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Test cases for the Simulator and SimulationResults classes.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import NO_ACTION_CODE, SolverAction
+from mab.simulator.simulator import (RecordingMode, SimulationResults, Simulator,
+                                     SlateAttribution)
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from tests.domain.arm_test import MockArm
+
+# Constants for the tests
+ITERATIONS: int = 100
+EVERY: int = 7
+
+
+class SimulationResultsTestCase(unittest.TestCase):
+
+    '''Test cases for the SimulationResults class.'''
+
+    def test_full(self):
+        '''Test that every step is recorded in the columnar arrays.'''
+        results = SimulationResults()
+        results.reserve(2)
+        results.record(1, 1, SolverAction.EXPLORE)
+        results.record(0, 0)
+        results.record(2, 1, SolverAction.EXPLOIT)
+
+        np.testing.assert_array_equal(results.arm_indices, [1, 0, 2])
+        np.testing.assert_array_equal(results.rewards, [1, 0, 1])
+        np.testing.assert_array_equal(
+            results.action_codes,
+            [SolverAction.EXPLORE.code, NO_ACTION_CODE, SolverAction.EXPLOIT.code])
+        self.assertEqual(results.rewards.dtype, np.float32)
+        self.assertEqual(results.total_reward, 2)
+        self.assertEqual(SolverAction.from_code(results.action_codes[2]), SolverAction.EXPLOIT)
+
+    def test_every_nth(self):
+        '''Test that only one step out of every N is recorded.'''
+        results = SimulationResults(RecordingMode.EVERY_NTH, EVERY)
+        results.reserve(ITERATIONS)
+        for step in range(ITERATIONS):
+            results.record(step % 3, 1)
+
+        np.testing.assert_array_equal(results.steps, np.arange(0, ITERATIONS, EVERY))
+        np.testing.assert_array_equal(results.arm_indices, results.steps % 3)
+        self.assertEqual(results.num_steps, ITERATIONS)
+        self.assertEqual(results.total_reward, ITERATIONS)
+
+    def test_aggregates(self):
+        '''Test that only the aggregates are kept.'''
+        results = SimulationResults(RecordingMode.AGGREGATES)
+        for _ in range(ITERATIONS):
+            results.record(0, 1, SolverAction.EXPLOIT)
+
+        self.assertEqual(len(results.rewards), 0)
+        self.assertEqual(results.num_steps, ITERATIONS)
+        self.assertEqual(results.action_counts[SolverAction.EXPLOIT.code], ITERATIONS)
+
+        with self.assertRaises(ValueError):
+            SimulationResults(RecordingMode.EVERY_NTH, 0)
+
+    def test_record_many(self):
+        '''Test that a streak is recorded as the same number of single steps.'''
+        results = SimulationResults(RecordingMode.EVERY_NTH, 3)
+        streak_results = SimulationResults(RecordingMode.EVERY_NTH, 3)
+        rewards = np.array([1, 0, 1, 1, 0, 1, 1])
+        results.record(2, 0)
+        streak_results.record(2, 0)
+        for reward in rewards:
+            results.record(1, reward, SolverAction.EXPLOIT)
+        streak_results.record_many(1, len(rewards), rewards.sum(), SolverAction.EXPLOIT, rewards)
+
+        np.testing.assert_array_equal(streak_results.arm_indices, results.arm_indices)
+        np.testing.assert_array_equal(streak_results.rewards, results.rewards)
+        np.testing.assert_array_equal(streak_results.action_codes, results.action_codes)
+        np.testing.assert_array_equal(streak_results.action_counts, results.action_counts)
+        np.testing.assert_array_equal(streak_results.cumulative_rewards,
+                                      results.cumulative_rewards)
+        self.assertEqual(streak_results.total_reward, results.total_reward)
+        self.assertEqual(streak_results.num_steps, results.num_steps)
+
+
+class SimulatorTestCase(unittest.TestCase):
+
+    '''Test cases for the Simulator class.'''
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(0.2), BernoulliArm(0.8)])
+        self.solvers = [EpsilonGreedySolver(self.bandit, epsilon=0.1),
+                        ThomsonSamplingSolver(self.bandit)]
+
+    def tearDown(self):
+        self.bandit = None
+        self.solvers = None
+
+    def test_run(self):
+        '''Test that the simulator records the steps of every solver.'''
+        simulator = Simulator(self.bandit, self.solvers)
+        simulator.run(ITERATIONS)
+
+        epsilon_results = simulator.get_results(self.solvers[0])
+        self.assertEqual(len(epsilon_results.rewards), ITERATIONS)
+        self.assertEqual(epsilon_results.action_counts.sum(), ITERATIONS)
+        self.assertAlmostEqual(epsilon_results.rewards.sum(), epsilon_results.total_reward)
+
+        # Thompson sampling does not report solver actions
+        thomson_results = simulator.get_results(self.solvers[1])
+        self.assertTrue(np.all(thomson_results.action_codes == NO_ACTION_CODE))
+        self.assertAlmostEqual(sum(thomson_results.usage_fractions.values()), 1.0)
+
+    def test_run_every_nth(self):
+        '''Test the downsampled recording mode of the simulator.'''
+        simulator = Simulator(self.bandit, self.solvers, RecordingMode.EVERY_NTH, EVERY)
+        simulator.run(ITERATIONS)
+        simulator.run(ITERATIONS)
+
+        results = simulator.get_results(self.solvers[0])
+        self.assertEqual(results.num_steps, 2 * ITERATIONS)
+        np.testing.assert_array_equal(results.steps, np.arange(0, 2 * ITERATIONS, EVERY))
+
+        # The cumulative rewards count the steps that are not recorded
+        full_simulator = Simulator(self.bandit, self.solvers[:1], seed=5)
+        simulator = Simulator(self.bandit, self.solvers[:1], RecordingMode.EVERY_NTH,
+                              EVERY, seed=5)
+        for each_simulator in [full_simulator, simulator]:
+            each_simulator.run(ITERATIONS)
+        full_results = full_simulator.get_results(self.solvers[0])
+        results = simulator.get_results(self.solvers[0])
+        np.testing.assert_allclose(results.cumulative_rewards,
+                                   np.cumsum(full_results.rewards)[results.steps])
+
+    def test_run_seed(self):
+        '''Test that seeded simulations are reproducible and do not repeat their runs.'''
+        rewards = []
+        for _ in range(2):
+            bandit = Bandit([BernoulliArm(0.2), BernoulliArm(0.8)])
+            solvers = [EpsilonGreedySolver(bandit, epsilon=0.5), ThomsonSamplingSolver(bandit)]
+            simulator = Simulator(bandit, solvers, seed=3)
+            simulator.run(ITERATIONS)
+            simulator.run(ITERATIONS)
+            rewards.append([simulator.get_results(solver).rewards for solver in solvers])
+
+        for first, second in zip(*rewards):
+            np.testing.assert_array_equal(first, second)
+        self.assertFalse(np.array_equal(rewards[0][0][:ITERATIONS], rewards[0][0][ITERATIONS:]))
+
+    def test_run_fast_forward(self):
+        '''Test that the fast forward mode simulates and records every step.'''
+        solver = EpsilonGreedySolver(self.bandit, epsilon=0.01)
+        for mode in (RecordingMode.FULL, RecordingMode.AGGREGATES):
+            simulator = Simulator(self.bandit, [solver], mode, fast_forward=True)
+            simulator.run(10 * ITERATIONS)
+
+            results = simulator.get_results(solver)
+            self.assertEqual(results.num_steps, 10 * ITERATIONS)
+            self.assertEqual(results.action_counts.sum(), 10 * ITERATIONS)
+            if mode == RecordingMode.FULL:
+                self.assertEqual(results.rewards.sum(), results.total_reward)
+                self.assertEqual(len(results.arm_indices), 10 * ITERATIONS)
+
+        with self.assertRaises(ValueError):
+            Simulator(Bandit([MockArm()]), [solver], fast_forward=True)
+
+    def test_run_slates(self):
+        '''Test the attribution of the rewards of the slates.'''
+        bandit = Bandit([BernoulliArm(0.0), BernoulliArm(1.0), BernoulliArm(0.5)])
+        solver = EpsilonGreedySolver(bandit, epsilon=0.0)
+        simulator = Simulator(bandit, [solver], seed=0)
+
+        simulator.run_slates(ITERATIONS, 3)
+        results = simulator.get_results(solver)
+        self.assertEqual(len(results.rewards), ITERATIONS)
+        self.assertEqual(solver.get_action_counts().sum(), 3 * ITERATIONS)
+        self.assertAlmostEqual(results.usage_fractions[bandit.get_arm(1)], 1 / 3)
+        self.assertTrue(np.all(results.rewards >= 1))
+
+        # The arm always rewarding ends up first, so the cascade stops at it
+        simulator.run_slates(ITERATIONS, 3, SlateAttribution.CASCADE)
+        self.assertTrue(np.all(results.rewards[-ITERATIONS // 2:] == 1))
+        self.assertTrue(np.all(results.arm_indices[-ITERATIONS // 2:] == 1))
+        self.assertGreater(results.usage_fractions[bandit.get_arm(1)], 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
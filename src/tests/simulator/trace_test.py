@@ -0,0 +1,82 @@
+"""
+Test cases for the trace writer and reader.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.simulator.simulator import Simulator
+from mab.simulator.trace import TraceReader, TraceWriter, describe_bandit, describe_solver
+from mab.solvers.ucb import UCB1Solver
+
+# Constants for the tests
+ITERATIONS: int = 500
+REPLICATIONS: int = 4
+CHUNK_SIZE: int = 64
+
+
+class TraceTestCase(unittest.TestCase):
+
+    '''Test cases for the TraceWriter and TraceReader classes.'''
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "simulation.trace")
+        self.bandit = Bandit([BernoulliArm(0.2), BernoulliArm(0.8)])
+        self.solver = UCB1Solver(self.bandit, exploration_parameter=1.0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_simulation_trace(self):
+        '''Test that a simulation trace matches the recorded results.'''
+        simulator = Simulator(self.bandit, [self.solver])
+        with TraceWriter(self.path, describe_bandit(self.bandit),
+                         describe_solver(self.solver), chunk_size=CHUNK_SIZE) as trace:
+            simulator.run(ITERATIONS, traces={self.solver: trace})
+
+        reader = TraceReader(self.path)
+        results = simulator.get_results(self.solver)
+        self.assertEqual(len(reader), ITERATIONS)
+        np.testing.assert_array_equal(reader.arm_indices, results.arm_indices)
+        np.testing.assert_array_equal(reader.rewards, results.rewards)
+        np.testing.assert_array_equal(reader.steps, np.arange(ITERATIONS))
+        np.testing.assert_array_equal(reader.records["action"], results.action_codes)
+        self.assertEqual(reader.solver_config["exploration_parameter"], 1.0)
+        self.assertEqual(reader.bandit_config["arms"][1]["success_probability"], 0.8)
+
+        # The streaming cumulative curve matches the in-memory one
+        positions, cumulative = reader.cumulative(points=50, chunk_size=CHUNK_SIZE)
+        self.assertLessEqual(len(positions), 50)
+        np.testing.assert_allclose(cumulative, np.cumsum(results.rewards)[positions])
+
+        gaps = np.array([0.6, 0.0])
+        _, regret = reader.cumulative(arm_values=gaps, points=ITERATIONS)
+        np.testing.assert_allclose(regret, np.cumsum(gaps[results.arm_indices]))
+
+    def test_batch_trace(self):
+        '''Test that a batch simulation writes one record per replication and step.'''
+        simulator = Simulator(self.bandit, [self.solver])
+        with TraceWriter(self.path, chunk_size=CHUNK_SIZE) as trace:
+            simulator.run_batch(ITERATIONS, REPLICATIONS, seed=1, traces={self.solver: trace})
+
+        reader = TraceReader(self.path)
+        results = simulator.get_batch_results(self.solver)
+        self.assertEqual(len(reader), ITERATIONS * REPLICATIONS)
+        for replication in range(REPLICATIONS):
+            _, cumulative = reader.cumulative(replication=replication, points=1,
+                                              chunk_size=CHUNK_SIZE)
+            self.assertEqual(cumulative[-1], results.total_rewards[replication])
+
+    def test_invalid_file(self):
+        '''Test that files which are not traces are rejected.'''
+        with open(self.path, "wb") as file:
+            file.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            TraceReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
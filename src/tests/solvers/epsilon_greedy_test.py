@@ -0,0 +1,77 @@
+"""
+Test cases for the EpsilonGreedySolver class.
+"""
+import random
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.domain.solver import SolverAction
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+
+# Constants for the tests
+MAX_STEPS: int = 10_000
+
+
+class EpsilonGreedySolverTestCase(unittest.TestCase):
+
+    '''Test cases for the EpsilonGreedySolver class.'''
+
+    def setUp(self):
+        random.seed(0)
+        self.bandit = Bandit([BernoulliArm(0.5), BernoulliArm(0.9), BernoulliArm(0.5)])
+        # Means 0.5, 0.9 and 0.5 after 10 pulls of each arm
+        for index, successes in enumerate([5, 9, 5]):
+            self.bandit.get_arm(index).record_pulls(10, successes)
+
+    def tearDown(self):
+        self.bandit = None
+
+    def test_safe_streak(self):
+        '''Test that the exploited arm stays the best one during the whole streak.'''
+        solver = EpsilonGreedySolver(self.bandit, epsilon=0)
+        arm_index, streak = solver.select_arm_streak(MAX_STEPS)
+
+        # 9 / (10 + j) >= 0.5 until j = 8, and arm 1 loses the ties against arm 0
+        self.assertEqual(arm_index, 1)
+        self.assertEqual(streak, 8)
+        arm = self.bandit.get_arm(arm_index)
+        for _ in range(streak - 1):
+            arm.record_pulls(1, 0)
+            self.assertEqual(int(np.argmax(self.bandit.get_state().cumulative_rewards)), 1)
+        arm.record_pulls(1, 0)
+        self.assertNotEqual(int(np.argmax(self.bandit.get_state().cumulative_rewards)), 1)
+
+        self.assertEqual(len(solver.get_action_history()), streak)
+        self.assertEqual(solver.pop_last_action(), SolverAction.EXPLOIT)
+
+    def test_streak_ends_with_exploration(self):
+        '''Test that a streak that is not cut is followed by an exploration.'''
+        solver = EpsilonGreedySolver(self.bandit, epsilon=0.5)
+        actions = []
+        for _ in range(200):
+            _, streak = solver.select_arm_streak(MAX_STEPS)
+            actions.append((solver.pop_last_action(), streak))
+
+        explorations = sum(streak for action, streak in actions if action == SolverAction.EXPLORE)
+        total = sum(streak for _, streak in actions)
+        self.assertAlmostEqual(explorations / total, 0.5, delta=0.1)
+
+    def test_select_slate(self):
+        '''Test that the slate ranks the best arms and explores distinct arms.'''
+        bandit = Bandit([BernoulliArm(p / 10) for p in range(10)])
+        for arm_index in range(10):
+            bandit.record_reward_by_index(arm_index, arm_index / 10)
+
+        greedy_slate = EpsilonGreedySolver(bandit, 0.0).select_slate(3)
+        self.assertEqual(greedy_slate, [bandit.get_arm(9), bandit.get_arm(8), bandit.get_arm(7)])
+
+        solver = EpsilonGreedySolver(bandit, 1.0)
+        for _ in range(100):
+            slate = solver.select_slate_indices(9).tolist()
+            self.assertEqual(len(set(slate)), 9)
+        self.assertEqual(solver.get_action_counts()[SolverAction.EXPLORE.code], 900)
+
+
+if __name__ == '__main__':
+    unittest.main()
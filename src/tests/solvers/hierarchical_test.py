@@ -0,0 +1,76 @@
+"""
+Test cases for the hierarchical solver.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.clustered_bandit import ClusteredBandit
+from mab.domain.solver import SolverAction
+from mab.simulator.kernels import get_kernel
+from mab.simulator.simulator import RecordingMode, Simulator
+from mab.solvers.epsilon_greedy import EpsilonGreedySolver
+from mab.solvers.hierarchical import HierarchicalSolver
+from mab.solvers.thomson_sampling import ThomsonSamplingSolver
+from mab.solvers.ucb import IncrementalUCB1Solver
+
+# Constants for the tests
+CLUSTERS: int = 20
+CLUSTER_SIZE: int = 20
+BEST_ARM: int = 237
+ITERATIONS: int = 3000
+SEED: int = 7
+
+
+class HierarchicalSolverTestCase(unittest.TestCase):
+
+    '''Test cases for the HierarchicalSolver class.'''
+
+    def setUp(self):
+        probabilities = np.full(CLUSTERS * CLUSTER_SIZE, 0.1)
+        probabilities[BEST_ARM] = 0.9
+        self.bandit = ClusteredBandit([BernoulliArm(p) for p in probabilities],
+                                      [CLUSTER_SIZE] * CLUSTERS)
+        self.solver = HierarchicalSolver(
+            self.bandit, ThomsonSamplingSolver,
+            lambda cluster: IncrementalUCB1Solver(cluster, 0.5))
+
+    def tearDown(self):
+        self.bandit = None
+        self.solver = None
+
+    def test_finds_best_arm(self):
+        '''Test that the solver converges to the best arm through its cluster.'''
+        simulator = Simulator(self.bandit, [self.solver], RecordingMode.FULL, seed=SEED)
+        self.assertIsNone(get_kernel(self.bandit, EpsilonGreedySolver(self.bandit, 0.1)))
+        simulator.run(ITERATIONS)
+
+        arm_indices = simulator.get_results(self.solver).arm_indices
+        self.assertGreater(np.mean(arm_indices[-ITERATIONS // 3:] == BEST_ARM), 0.8)
+        # The first pull of each cluster is made without an action
+        action_counts = self.solver.get_action_counts()
+        self.assertEqual(len(self.solver.get_encoded_action_history()),
+                         action_counts[SolverAction.EXPLORE.code]
+                         + action_counts[SolverAction.EXPLOIT.code])
+        self.assertGreaterEqual(action_counts.sum(), ITERATIONS - CLUSTERS)
+
+    def test_sync_state(self):
+        '''Test that the solvers are rebuilt from the statistics of the bandit.'''
+        for _ in range(CLUSTER_SIZE):
+            self.bandit.pull_arm_by_index(BEST_ARM)
+        self.solver.sync_state()
+        cluster_index = self.bandit.get_cluster_index(BEST_ARM)
+        alpha, beta = self.solver.get_cluster_solver().get_posteriors()
+        self.assertEqual(alpha[cluster_index] + beta[cluster_index] - 2, CLUSTER_SIZE)
+
+        arm_solver = self.solver.get_arm_solver(cluster_index)
+        self.assertIs(self.solver.get_arm_solver(cluster_index), arm_solver)
+        self.assertEqual(self.bandit.get_cluster(cluster_index).get_state().total_pulls,
+                         CLUSTER_SIZE)
+
+        self.bandit.set_clusters([CLUSTER_SIZE * CLUSTERS // 2] * 2)
+        self.solver.sync_state()
+        self.assertEqual(self.solver.get_cluster_solver().get_posteriors()[0].shape, (2,))
+
+
+if __name__ == '__main__':
+    unittest.main()
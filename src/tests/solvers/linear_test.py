@@ -0,0 +1,93 @@
+"""
+Test cases for the contextual linear solvers.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.solvers.linear import LinearThomsonSamplingSolver, LinUCBSolver
+
+# Constants for the tests
+ARMS: int = 4
+FEATURES: int = 5
+UPDATES: int = 300
+SEED: int = 11
+
+
+class LinearSolverTestCase(unittest.TestCase):
+
+    '''Test cases for the LinUCBSolver and LinearThomsonSamplingSolver classes.'''
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(0.5) for _ in range(ARMS)])
+        self.rng = np.random.default_rng(SEED)
+        # The true coefficients of each arm
+        self.coefficients = self.rng.normal(size=(ARMS, FEATURES))
+
+    def tearDown(self):
+        self.bandit = None
+
+    def test_sherman_morrison(self):
+        '''Test that the incremental updates match the ridge regression of each arm.'''
+        solver = LinUCBSolver(self.bandit, FEATURES, regularization=2.0)
+        contexts = self.rng.normal(size=(UPDATES, FEATURES))
+        arm_indices = self.rng.integers(ARMS, size=UPDATES)
+        rewards = self.rng.random(UPDATES)
+        for context, arm_index, reward in zip(contexts, arm_indices, rewards):
+            solver.update_state(self.bandit.get_arm(int(arm_index)), reward, context)
+
+        for arm_index in range(ARMS):
+            arm_contexts = contexts[arm_indices == arm_index]
+            design = 2.0 * np.eye(FEATURES) + arm_contexts.T @ arm_contexts
+            np.testing.assert_allclose(solver._inverse_designs[arm_index],
+                                       np.linalg.inv(design), atol=1e-10)
+            np.testing.assert_allclose(
+                solver._coefficients[arm_index],
+                np.linalg.solve(design, arm_contexts.T @ rewards[arm_indices == arm_index]))
+
+        variances = solver._get_variances(contexts[:3])
+        expected = np.einsum("bi,kij,bj->bk", contexts[:3], solver._inverse_designs,
+                             contexts[:3])
+        np.testing.assert_allclose(variances, expected)
+
+        # sync_state keeps the models, which cannot be loaded from statistics
+        solver.sync_state()
+        np.testing.assert_allclose(solver._get_variances(contexts[:3]), variances)
+        with self.assertRaises(NotImplementedError):
+            solver.get_statistics()
+
+    def test_learns_best_arm(self):
+        '''Test that both solvers learn to select the best arm for each context.'''
+        for solver in (LinUCBSolver(self.bandit, FEATURES, alpha=0.5),
+                       LinearThomsonSamplingSolver(self.bandit, FEATURES, 0.2, seed=SEED)):
+            for _ in range(10 * UPDATES):
+                context = self.rng.normal(size=FEATURES)
+                arm_index = solver.select_arm_index(context)
+                reward = self.coefficients[arm_index] @ context + self.rng.normal(scale=0.1)
+                solver.update_state_by_index(arm_index, reward, context)
+
+            contexts = self.rng.normal(size=(UPDATES, FEATURES))
+            best_arms = np.argmax(contexts @ self.coefficients.T, axis=1)
+            self.assertGreater(np.mean(solver.select_arm_indices(contexts) == best_arms), 0.9)
+
+    def test_contexts(self):
+        '''Test that the decisions require contexts with d features.'''
+        solver = LinUCBSolver(self.bandit, FEATURES)
+        with self.assertRaises(ValueError):
+            solver.select_arm_index()
+        with self.assertRaises(ValueError):
+            solver.select_arm_index(np.ones(FEATURES + 1))
+        with self.assertRaises(ValueError):
+            LinUCBSolver(self.bandit, 0)
+        # The rewards are reported with the context of their decision
+        solver.select_arm_index(np.ones(FEATURES))
+        with self.assertRaises(ValueError):
+            solver.update_state_by_index(0, 1.0, None)
+
+        self.bandit.add_arm(BernoulliArm(0.5))
+        self.assertLess(solver.select_arm_index(np.ones(FEATURES)), ARMS + 1)
+        self.assertEqual(len(solver._inverse_designs), ARMS + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Test cases for the ThomsonSamplingSolver class.
+"""
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.domain.bandit import Bandit
+from mab.solvers.thomson_sampling import DiscountedThomsonSamplingSolver, ThomsonSamplingSolver
+
+# Constants for the tests
+BATCH_SIZE: int = 64
+SEED: int = 3
+DISCOUNT: float = 0.9
+UPDATES: int = 500
+WARM_START: float = 10.0
+
+
+class ThomsonSamplingSolverTestCase(unittest.TestCase):
+
+    '''Test cases for the ThomsonSamplingSolver class.'''
+
+    def setUp(self):
+        self.bandit = Bandit([BernoulliArm(0.1), BernoulliArm(0.5), BernoulliArm(0.9)])
+        self.solver = ThomsonSamplingSolver(self.bandit, seed=SEED)
+
+    def tearDown(self):
+        self.bandit = None
+        self.solver = None
+
+    def test_select_arm_is_reproducible(self):
+        '''Test that the same seed selects the same arms.'''
+        other_solver = ThomsonSamplingSolver(self.bandit, seed=SEED)
+        for _ in range(20):
+            self.assertIs(self.solver.select_arm(), other_solver.select_arm())
+
+    def test_update_state(self):
+        '''Test that rewards update the Beta posterior of the pulled arm.'''
+        arm = self.bandit.get_arm(2)
+        self.solver.update_state(arm, 1)
+        self.solver.update_state(arm, 0)
+        self.solver.update_state(arm, 1)
+
+        alpha, beta = self.solver.get_posteriors()
+        np.testing.assert_array_equal(alpha, [1, 1, 3])
+        np.testing.assert_array_equal(beta, [1, 1, 2])
+
+    def test_update_state_batch(self):
+        '''Test that a stream of rewards matches the one-by-one updates.'''
+        arm_indices = np.array([0, 2, 2, 1, 2])
+        rewards = np.array([0, 1, 1, 0, 0])
+        other_solver = ThomsonSamplingSolver(self.bandit, seed=SEED)
+
+        self.solver.update_state_batch(arm_indices, rewards)
+        for arm_index, reward in zip(arm_indices, rewards):
+            other_solver.update_state_by_index(arm_index, reward)
+
+        np.testing.assert_array_equal(self.solver.get_posteriors(),
+                                      other_solver.get_posteriors())
+
+    def test_select_arms(self):
+        '''Test that a batch of decisions concentrates on the best posterior.'''
+        self.solver.update_state_batch(np.repeat([0, 1, 2], 100),
+                                       np.repeat([0, 0, 1], 100))
+
+        arm_indices = self.solver.select_arm_indices(BATCH_SIZE)
+        self.assertEqual(arm_indices.shape, (BATCH_SIZE,))
+        self.assertTrue(np.all(arm_indices == 2))
+
+        arms = self.solver.select_arms(BATCH_SIZE)
+        self.assertEqual(len(arms), BATCH_SIZE)
+        self.assertTrue(all(arm is self.bandit.get_arm(2) for arm in arms))
+
+    def test_select_slate(self):
+        '''Test that the slates have distinct arms and are reproducible.'''
+        other_solver = ThomsonSamplingSolver(self.bandit, seed=SEED)
+        for _ in range(20):
+            slate = self.solver.select_slate(2)
+            self.assertEqual(len(set(slate)), 2)
+            self.assertEqual(slate, other_solver.select_slate(2))
+
+    def test_dynamic_catalogue(self):
+        '''Test that added arms are warm started and removed arms are never selected.'''
+        solver = ThomsonSamplingSolver(self.bandit, seed=SEED, warm_start=WARM_START)
+        for _ in range(UPDATES):
+            arm_index = solver.select_arm_index()
+            solver.update_state(self.bandit.get_arm(arm_index),
+                                self.bandit.pull_arm_by_index(arm_index))
+        self.bandit.remove_arm(self.bandit.get_arm(2))
+        self.assertNotIn(2, solver.select_arm_indices(BATCH_SIZE).tolist())
+        state = self.bandit.get_state()
+        mean_reward = state.reward_sums.sum() / state.total_pulls
+
+        # The new arm takes the free slot, then a slot is appended
+        self.assertEqual(self.bandit.add_arm(BernoulliArm(0.9)), 2)
+        self.assertEqual(self.bandit.add_arm(BernoulliArm(0.9)), 3)
+        alpha, beta = solver.get_posteriors()
+        np.testing.assert_allclose(alpha[2:], 1 + WARM_START * mean_reward)
+        np.testing.assert_allclose(beta[2:], 1 + WARM_START * (1 - mean_reward))
+
+        solver.set_prior(3, 50, 1)
+        self.assertEqual(solver.select_slate_indices(1).tolist(), [3])
+
+
+class DiscountedThomsonSamplingSolverTestCase(unittest.TestCase):
+
+    '''Test cases for the DiscountedThomsonSamplingSolver class.'''
+
+    def test_posteriors(self):
+        '''Test that the scaled statistics match decaying every arm at every step.'''
+        bandit = Bandit([BernoulliArm(0.1), BernoulliArm(0.5), BernoulliArm(0.9)])
+        solver = DiscountedThomsonSamplingSolver(bandit, DISCOUNT, seed=SEED)
+        # Force several rescalings of the stored statistics
+        solver._MIN_SCALE = 1e-5
+        rng = np.random.default_rng(SEED)
+        successes, failures = np.zeros(3), np.zeros(3)
+        for _ in range(UPDATES):
+            arm_index, reward = int(rng.integers(3)), int(rng.integers(2))
+            solver.update_state(bandit.get_arm(arm_index), reward)
+            successes *= DISCOUNT
+            failures *= DISCOUNT
+            successes[arm_index] += reward
+            failures[arm_index] += 1 - reward
+
+        alpha, beta = solver.get_posteriors()
+        np.testing.assert_allclose(alpha, 1 + successes)
+        np.testing.assert_allclose(beta, 1 + failures)
+        self.assertEqual(len(solver.select_arm_indices(BATCH_SIZE)), BATCH_SIZE)
+        with self.assertRaises(ValueError):
+            DiscountedThomsonSamplingSolver(bandit, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Test cases for the UCB solvers.
+"""
+import random
+import unittest
+import numpy as np
+from mab.case_study.bernoulli_arm import BernoulliArm
+from mab.case_study.drifting_arms import PiecewiseStationaryArm
+from mab.domain.bandit import Bandit
+from mab.solvers.tournament import KineticTournament
+from mab.solvers.ucb import IncrementalUCB1Solver, SlidingWindowUCBSolver, UCB1Solver
+
+# Constants for the tests
+ARMS: int = 30
+ITERATIONS: int = 3000
+SEED: int = 7
+WINDOW: int = 200
+
+
+class IncrementalUCB1SolverTestCase(unittest.TestCase):
+
+    '''Test cases for the IncrementalUCB1Solver class.'''
+
+    def setUp(self):
+        random.seed(SEED)
+        self.bandit = Bandit([BernoulliArm() for _ in range(ARMS)])
+
+    def tearDown(self):
+        self.bandit = None
+
+    def assert_same_selections(self, exploration_parameter):
+        '''Pulls the arms selected by UCB1 and checks the incremental solver agrees.'''
+        solver = UCB1Solver(self.bandit, exploration_parameter)
+        incremental_solver = IncrementalUCB1Solver(self.bandit, exploration_parameter)
+
+        for _ in range(ITERATIONS):
+            selected_arm = solver.select_arm()
+            self.assertIs(incremental_solver.select_arm(), selected_arm)
+            reward = self.bandit.pull_arm(selected_arm)
+            solver.update_state(selected_arm, reward)
+            incremental_solver.update_state(selected_arm, reward)
+
+        self.assertEqual(solver.get_action_history(), incremental_solver.get_action_history())
+
+    def test_same_selections_as_ucb1(self):
+        '''Test that the incremental solver selects the same arms as UCB1.'''
+        self.assert_same_selections(1.0)
+
+    def test_same_selections_with_small_exploration(self):
+        '''Test that ties and crossings are resolved like UCB1.'''
+        self.assert_same_selections(0.1)
+
+    def test_reset(self):
+        '''Test that the solver recovers when the bandit is reset or pulled externally.'''
+        solver = IncrementalUCB1Solver(self.bandit, 1.0)
+        for _ in range(ARMS):
+            selected_arm = solver.select_arm()
+            solver.update_state(selected_arm, self.bandit.pull_arm(selected_arm))
+
+        self.bandit.reset()
+        self.assertIs(solver.select_arm(), self.bandit.get_arm(0))
+
+        self.bandit.pull_arm(self.bandit.get_arm(0))
+        self.assertIs(solver.select_arm(), UCB1Solver(self.bandit, 1.0).select_arm())
+
+    def test_masked_slots(self):
+        '''Test that pairs of masked slots are never rechecked when the drift advances.'''
+        means = [-np.inf, -np.inf, 0.5, 0.2, -np.inf, -np.inf, -np.inf, 0.1]
+        pull_counts = [1, 5, 3, 2, 4, 1, 2, 1]
+        tournament = KineticTournament(means, pull_counts, 1.0, 1.0)
+
+        # Only the node comparing the two unmasked arms 2 and 3 may fail
+        self.assertEqual(tournament._failures[4], np.inf)
+        self.assertEqual(tournament._failures[6], np.inf)
+        self.assertEqual(tournament.winner(2.0), 7)
+        self.assertEqual(tournament.winner(100.0), 7)
+
+    def test_dynamic_catalogue(self):
+        '''Test that the solvers agree and skip the free slots while arms come and go.'''
+        solver = UCB1Solver(self.bandit, 1.0)
+        incremental_solver = IncrementalUCB1Solver(self.bandit, 1.0)
+        for step in range(ITERATIONS // 3):
+            if step % 10 == 0:
+                self.bandit.remove_arm(self.bandit.get_arm(solver.select_arm_index()))
+            if step % 10 == 5:
+                self.bandit.add_arm(BernoulliArm())
+
+            selected_index = solver.select_arm_index()
+            self.assertIsNotNone(self.bandit.get_arm(selected_index))
+            self.assertEqual(incremental_solver.select_arm_index(), selected_index)
+            reward = self.bandit.pull_arm_by_index(selected_index)
+            incremental_solver.update_state(self.bandit.get_arm(selected_index), reward)
+
+    def test_select_slate(self):
+        '''Test that the first arm of the slate is the arm UCB1 selects.'''
+        solver = UCB1Solver(self.bandit, 1.0)
+        self.assertEqual(solver.select_slate_indices(3).tolist(), [0, 1, 2])
+        for _ in range(ITERATIONS // 10):
+            slate = solver.select_slate_indices(5)
+            self.assertEqual(slate[0], solver.select_arm_index())
+            self.assertEqual(len(set(slate.tolist())), 5)
+            self.bandit.pull_arm_by_index(int(slate[0]))
+
+
+class SlidingWindowUCBSolverTestCase(unittest.TestCase):
+
+    '''Test cases for the SlidingWindowUCBSolver class.'''
+
+    def test_window_statistics(self):
+        '''Test that the windowed statistics only count the last rewards.'''
+        bandit = Bandit([BernoulliArm(0.5) for _ in range(3)])
+        solver = SlidingWindowUCBSolver(bandit, 1.0, WINDOW)
+        rng = np.random.default_rng(SEED)
+        arm_indices = rng.integers(3, size=ITERATIONS)
+        rewards = rng.random(ITERATIONS)
+        for arm_index, reward in zip(arm_indices, rewards):
+            solver.update_state(bandit.get_arm(int(arm_index)), reward)
+
+        window = slice(ITERATIONS - WINDOW, None)
+        np.testing.assert_array_equal(solver._pull_counts,
+                                      np.bincount(arm_indices[window], minlength=3))
+        np.testing.assert_allclose(solver._reward_sums, np.bincount(
+            arm_indices[window], rewards[window], minlength=3))
+        with self.assertRaises(ValueError):
+            SlidingWindowUCBSolver(bandit, 1.0, 0)
+
+    def test_tracks_change(self):
+        '''Test that the solver switches to the new best arm after a change.'''
+        random.seed(SEED)
+        arms = [PiecewiseStationaryArm([0.9, 0.1], ITERATIONS),
+                PiecewiseStationaryArm([0.1, 0.9], ITERATIONS)]
+        bandit = Bandit(arms)
+        solver = SlidingWindowUCBSolver(bandit, 0.5, WINDOW)
+
+        selections = []
+        for _ in range(2 * ITERATIONS):
+            arm_index = solver.select_arm_index()
+            solver.update_state(bandit.get_arm(arm_index), bandit.pull_arm_by_index(arm_index))
+            selections.append(arm_index)
+
+        self.assertLess(np.mean(selections[ITERATIONS - WINDOW:ITERATIONS]), 0.2)
+        self.assertGreater(np.mean(selections[-WINDOW:]), 0.8)
+
+if __name__ == '__main__':
+    unittest.main()